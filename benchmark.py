@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+基准测试套件
+在确定性的合成语料（scripts/synthetic.py）上测量热点路径的耗时：
+分类、会议提取、保存/合并、加载、HTML 生成。
+
+每项测试先预热，再重复运行取中位数；结果写成 JSON，并可与保存的基线比较，
+中位数变慢超过阈值时以非零状态退出，用于判断对热点路径的修改是否真的有效。
+
+用法：
+    python benchmark.py                                # 1k、10k 两种规模
+    python benchmark.py --sizes 1k,10k,100k,1m         # 1m 需要数 GB 内存
+    python benchmark.py --only classify,venue --repeat 10
+    python benchmark.py --output results.json --baseline benchmarks/baseline.json
+    python benchmark.py --update-baseline              # 在当前机器上重新记录基线
+
+基线只在记录它的机器上有意义（CPU、磁盘和 Python 版本都会影响耗时），换机器或 CI 环境后
+需要先用 --update-baseline 重新记录；环境与基线不同时比较结果会给出提示。
+"""
+
+import argparse
+import gc
+import json
+import logging
+import math
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from scripts.fetch_papers import PaperFetcher
+from scripts.generate_html import HTMLGenerator
+from scripts.storage import open_store
+from scripts.synthetic import SyntheticCorpus
+from scripts.utils import load_papers
+
+BENCHMARK_VERSION = 1
+DEFAULT_BASELINE = Path("benchmarks/baseline.json")
+# 语料中所有论文的“当前时间”固定，发表日期和 ID 不随运行日期变化
+CORPUS_NOW = datetime(2025, 6, 1, tzinfo=timezone.utc)
+# 合并测试中新增论文的比例（模拟一次日常抓取）
+MERGE_FRACTION = 0.01
+
+
+def parse_size(text: str) -> int:
+    """'10k' -> 10000，'1m' -> 1000000"""
+    text = text.strip().lower()
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(text[-1:], 1)
+    return int(float(text.rstrip('km')) * multiplier)
+
+
+def format_size(size: int) -> str:
+    if size >= 1_000_000 and size % 1_000_000 == 0:
+        return f"{size // 1_000_000}m"
+    if size >= 1_000 and size % 1_000 == 0:
+        return f"{size // 1_000}k"
+    return str(size)
+
+
+def measure(run: Callable[[], None], setup: Optional[Callable[[], None]] = None,
+            warmup: int = 1, repeat: int = 5) -> List[float]:
+    """预热 warmup 次后计时 repeat 次；setup 在每次运行前执行，不计入耗时"""
+    timings = []
+    for i in range(warmup + repeat):
+        if setup is not None:
+            setup()
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        if i >= warmup:
+            timings.append(elapsed)
+    return timings
+
+
+def summarize(timings: List[float], items: int) -> Dict:
+    median = statistics.median(timings)
+    return {
+        'items': items,
+        'repeat': len(timings),
+        'min': min(timings),
+        'median': median,
+        'mean': statistics.fmean(timings),
+        'stdev': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        'us_per_item': median / items * 1e6 if items else 0.0,
+    }
+
+
+class BenchmarkSuite:
+    """一种语料规模上的全部基准测试"""
+
+    BENCHMARKS = ('classify', 'venue', 'save', 'merge', 'load', 'generate_html')
+
+    def __init__(self, size: int, workdir: Path, warmup: int = 1, repeat: int = 5):
+        self.size = size
+        self.workdir = workdir
+        self.warmup = warmup
+        self.repeat = repeat
+        self.fetcher = PaperFetcher()
+        self._papers = None
+
+    @property
+    def papers(self) -> List[Dict]:
+        """已提取会议和分类的语料（与 PaperFetcher 保存的记录一致），首次使用时生成"""
+        if self._papers is None:
+            corpus = SyntheticCorpus(self.size, now=CORPUS_NOW)
+            self._papers = []
+            for paper in corpus.papers():
+                self.fetcher.enrich_paper(paper)
+                self._papers.append(paper)
+        return self._papers
+
+    def run(self, name: str) -> Dict:
+        items, timings = getattr(self, f"bench_{name}")()
+        return summarize(timings, items)
+
+    def _measure(self, run, setup=None) -> List[float]:
+        return measure(run, setup, self.warmup, self.repeat)
+
+    def bench_classify(self):
+        papers = self.papers
+        classify = self.fetcher.classify_paper
+
+        def run():
+            for paper in papers:
+                classify(paper)
+        return len(papers), self._measure(run)
+
+    def bench_venue(self):
+        comments = [paper.get('comment') for paper in self.papers]
+        extract = self.fetcher.extract_venue_from_comment
+
+        def run():
+            for comment in comments:
+                extract(comment)
+        return len(comments), self._measure(run)
+
+    def bench_save(self):
+        """把全部论文写入空的分片存储"""
+        root = self.workdir / "save"
+
+        def setup():
+            shutil.rmtree(root, ignore_errors=True)
+
+        def run():
+            open_store(str(root / "papers")).merge(self.papers)
+        return len(self.papers), self._measure(run, setup)
+
+    def bench_merge(self):
+        """在已有存储上合并一次日常抓取：最新的 1% 是新论文，另有同样数量的重复论文"""
+        batch = max(1, int(self.size * MERGE_FRACTION))
+        existing, incoming = self.papers[batch:], self.papers[:2 * batch]
+        template = self.workdir / "merge-template"
+        root = self.workdir / "merge"
+        shutil.rmtree(template, ignore_errors=True)
+        open_store(str(template / "papers")).merge(existing)
+
+        def setup():
+            shutil.rmtree(root, ignore_errors=True)
+            shutil.copytree(template, root)
+
+        def run():
+            open_store(str(root / "papers")).merge(incoming)
+        return len(incoming), self._measure(run, setup)
+
+    def bench_load(self):
+        root = self.workdir / "load" / "papers"
+        if not root.exists():
+            open_store(str(root)).merge(self.papers)
+        return len(self.papers), self._measure(lambda: load_papers(str(root)))
+
+    def bench_generate_html(self):
+        """完整生成网页（不使用增量构建，串行渲染），不含加载数据"""
+        output = self.workdir / "docs"
+        papers = self.papers
+
+        def setup():
+            shutil.rmtree(output, ignore_errors=True)
+
+        def run():
+            generator = HTMLGenerator(data_path=str(self.workdir / "none"), output_dir=str(output),
+                                      workers=1, incremental=False)
+            generator.load_papers = lambda: setattr(generator, 'papers', papers)
+            generator.run()
+        return len(papers), self._measure(run, setup)
+
+
+def environment() -> Dict:
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+    }
+
+
+def compare(results: Dict, baseline: Dict, threshold: float, min_delta: float, noise_sigma: float) -> List[str]:
+    """返回回归的测试项：中位数比基线慢 threshold 以上，且差值同时超过 min_delta 秒
+    和 noise_sigma 倍的合并标准差（基线与本次的 σ 取平方和的平方根），
+    耗时只有几毫秒的测试项的抖动不会被判为回归"""
+    regressions = []
+    for key, current in results['results'].items():
+        base = baseline.get('results', {}).get(key)
+        if base is None:
+            continue
+        delta = current['median'] - base['median']
+        ratio = current['median'] / base['median'] if base['median'] else float('inf')
+        noise = max(min_delta, noise_sigma * math.hypot(base.get('stdev', 0.0), current['stdev']))
+        status = '  '
+        if ratio > 1 + threshold and delta > noise:
+            status = '❌'
+            regressions.append(key)
+        elif ratio < 1 - threshold and -delta > noise:
+            status = '✅'
+        print(f"  {status} {key:<22} {base['median']:9.4f}s -> {current['median']:9.4f}s  ({ratio - 1:+.1%}，"
+              f"噪声 ±{noise:.4f}s)")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="在合成语料上运行基准测试")
+    parser.add_argument('--sizes', default='1k,10k', help="语料规模，逗号分隔（例如 1k,10k,100k,1m）")
+    parser.add_argument('--only', help="只运行这些测试，逗号分隔（" + ','.join(BenchmarkSuite.BENCHMARKS) + "）")
+    parser.add_argument('--warmup', type=int, default=1, help="每项测试的预热次数")
+    parser.add_argument('--repeat', type=int, default=5, help="每项测试的计时次数")
+    parser.add_argument('--output', help="结果 JSON 的保存路径")
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help="用于比较的基线 JSON")
+    parser.add_argument('--threshold', type=float, default=0.25, help="中位数变慢超过该比例视为回归")
+    parser.add_argument('--min-delta', type=float, default=0.02, help="绝对差小于该秒数时不视为回归（计时噪声）")
+    parser.add_argument('--noise-sigma', type=float, default=3.0,
+                        help="绝对差小于合并标准差的该倍数时不视为回归")
+    parser.add_argument('--update-baseline', action='store_true', help="把本次结果合并写入基线")
+    args = parser.parse_args(argv)
+
+    names = args.only.split(',') if args.only else list(BenchmarkSuite.BENCHMARKS)
+    unknown = set(names) - set(BenchmarkSuite.BENCHMARKS)
+    if unknown:
+        parser.error(f"未知的测试: {', '.join(sorted(unknown))}")
+    sizes = [parse_size(s) for s in args.sizes.split(',')]
+
+    # 生成网页、保存等步骤的日志会干扰结果输出
+    logging.disable(logging.INFO)
+    results = {
+        'version': BENCHMARK_VERSION,
+        'created': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'environment': environment(),
+        'warmup': args.warmup,
+        'repeat': args.repeat,
+        'results': {},
+    }
+    with tempfile.TemporaryDirectory(prefix="dailypaper-bench-") as tmp:
+        for size in sizes:
+            print(f"\n📊 {format_size(size)} 篇论文")
+            suite = BenchmarkSuite(size, Path(tmp) / format_size(size), args.warmup, args.repeat)
+            for name in names:
+                result = suite.run(name)
+                results['results'][f"{name}/{format_size(size)}"] = result
+                print(f"  {name:<14} 中位数 {result['median']:9.4f}s  "
+                      f"(最小 {result['min']:.4f}s，σ {result['stdev']:.4f}s，{result['us_per_item']:.1f} µs/篇)")
+            shutil.rmtree(suite.workdir, ignore_errors=True)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding='utf-8')
+        print(f"\n结果已保存到 {args.output}")
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        baseline = json.loads(baseline_path.read_text(encoding='utf-8')) if baseline_path.exists() else {}
+        merged = dict(results, results={**baseline.get('results', {}), **results['results']})
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(merged, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+        print(f"基线已更新: {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"\n未找到基线 {baseline_path}，跳过比较（--update-baseline 可以记录基线）")
+        return 0
+    baseline = json.loads(baseline_path.read_text(encoding='utf-8'))
+    print(f"\n与基线比较（{baseline_path}，记录于 {baseline.get('created')}，"
+          f"Python {baseline.get('environment', {}).get('python')}）：")
+    if baseline.get('environment') != results['environment']:
+        print("⚠️  基线记录于不同的环境，结果只能粗略比较；请在本机用 --update-baseline 重新记录基线")
+    regressions = compare(results, baseline, args.threshold, args.min_delta, args.noise_sigma)
+    if regressions:
+        print(f"\n❌ {len(regressions)} 项性能回归: {', '.join(regressions)}")
+        return 1
+    print("\n✨ 没有性能回归")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,21 +3,30 @@ document.addEventListener('DOMContentLoaded', function() {
     const statusBtns = document.querySelectorAll('.status-btn');
     const categoryBtns = document.querySelectorAll('.category-btn');
     const searchInput = document.getElementById('searchInput');
+    const container = document.getElementById('papers-container');
+    const summary = document.getElementById('search-summary');
     const papers = document.querySelectorAll('.paper-card');
     
+    // 当前页在全部论文中的位置（用于把搜索结果对应到页面）
+    const pageOffset = parseInt(container.dataset.offset || '0', 10);
+    const perPage = parseInt(container.dataset.perPage || '0', 10);
+    const currentPage = parseInt(container.dataset.page || '0', 10);
+    
     let currentStatus = 'all';
     let currentCategory = 'all';
     let searchTerm = '';
+    let searchRequest = 0;
     
     // Cache paper data for better performance
     const paperCache = [];
     papers.forEach(paper => {
         paperCache.push({
             element: paper,
+            ordinal: parseInt(paper.dataset.ordinal, 10),
             tags: paper.dataset.tags.split(','),
             status: paper.dataset.status,
-            // Cache lowercase text content once instead of recalculating
-            textContent: paper.textContent.toLowerCase()
+            // 只有搜索索引不可用时才需要，首次用到时再缓存
+            textContent: null
         });
     });
     
@@ -34,6 +43,493 @@ document.addEventListener('DOMContentLoaded', function() {
         };
     }
     
+    // ---- 搜索索引（由 generate_html.py 生成在 search/ 目录下）----
+    const ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_';
+    const DECODE = {};
+    for (let i = 0; i < ALPHABET.length; i++) {
+        DECODE[ALPHABET[i]] = i;
+    }
+    const EMPTY_SHARD = { terms: [], postings: [] };
+    const searchIndex = {
+        available: true,
+        meta: null,
+        facets: null,
+        shards: new Map()
+    };
+    
+    function fetchJSON(url) {
+        return fetch(url).then(response => {
+            if (!response.ok) {
+                throw new Error(url + ': ' + response.status);
+            }
+            return response.json();
+        });
+    }
+    
+    function loadMeta() {
+        if (!searchIndex.meta) {
+            searchIndex.meta = fetchJSON('search/meta.json').then(meta => {
+                searchIndex.count = meta.count;
+                return meta;
+            });
+        }
+        return searchIndex.meta;
+    }
+    
+    function loadFacets() {
+        if (!searchIndex.facets) {
+            searchIndex.facets = fetchJSON('search/facets.json');
+        }
+        return searchIndex.facets;
+    }
+    
+    function loadShard(meta, name) {
+        if (!meta.shards.includes(name)) {
+            return Promise.resolve(EMPTY_SHARD);
+        }
+        if (!searchIndex.shards.has(name)) {
+            searchIndex.shards.set(name, fetchJSON('search/' + name + '.json').then(shard => {
+                shard.decoded = new Array(shard.terms.length);
+                return shard;
+            }));
+        }
+        return searchIndex.shards.get(name);
+    }
+    
+    // 倒排表：差分后的变长编码（每个字符 5 位数据 + 1 位续位）
+    function decodePostings(encoded) {
+        const ordinals = [];
+        let previous = -1;
+        let gap = 0;
+        let shift = 0;
+        for (let i = 0; i < encoded.length; i++) {
+            const digit = DECODE[encoded[i]];
+            gap += (digit & 0x1f) * Math.pow(2, shift);
+            if (digit & 0x20) {
+                shift += 5;
+                continue;
+            }
+            previous += gap + 1;
+            ordinals.push(previous);
+            gap = 0;
+            shift = 0;
+        }
+        return ordinals;
+    }
+    
+    function postingsAt(shard, i) {
+        if (!shard.decoded[i]) {
+            shard.decoded[i] = decodePostings(shard.postings[i]);
+        }
+        return shard.decoded[i];
+    }
+    
+    // 与 search_index.py 中的 normalize_term / index_terms / shard_name 保持一致
+    function normalizeTerm(token) {
+        if (token.length > 3 && token[token.length - 1] === 's' && token[token.length - 2] !== 's') {
+            return token.slice(0, -1);
+        }
+        return token;
+    }
+    
+    function queryTerms(text, prefixLength) {
+        const tokens = text.toLowerCase().match(/[\p{L}\p{N}_]+/gu) || [];
+        return tokens.filter(t => Array.from(t).length >= prefixLength).map(normalizeTerm);
+    }
+    
+    function shardName(term, prefixLength) {
+        const prefix = Array.from(term).slice(0, prefixLength).join('');
+        if (/^[a-z0-9]+$/.test(prefix)) {
+            return prefix;
+        }
+        return 'x' + Array.from(new TextEncoder().encode(prefix))
+            .map(b => b.toString(16).padStart(2, '0')).join('');
+    }
+    
+    function lowerBound(array, value) {
+        let lo = 0;
+        let hi = array.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >> 1;
+            if (array[mid] < value) {
+                lo = mid + 1;
+            } else {
+                hi = mid;
+            }
+        }
+        return lo;
+    }
+    
+    // 前缀匹配的多个词：合并各自的倒排表
+    function union(lists) {
+        if (lists.length === 1) {
+            return lists[0];
+        }
+        const merged = [].concat(...lists).sort((a, b) => a - b);
+        return merged.filter((x, i) => i === 0 || x !== merged[i - 1]);
+    }
+    
+    // 短表中的每个序号在长表中倍增查找，开销只与短表长度有关
+    function intersect(shorter, longer) {
+        const result = [];
+        let j = 0;
+        for (let i = 0; i < shorter.length && j < longer.length; i++) {
+            const target = shorter[i];
+            let step = 1;
+            let hi = j;
+            while (hi < longer.length && longer[hi] < target) {
+                j = hi + 1;
+                hi += step;
+                step *= 2;
+            }
+            hi = Math.min(hi, longer.length);
+            while (j < hi) {
+                const mid = (j + hi) >> 1;
+                if (longer[mid] < target) {
+                    j = mid + 1;
+                } else {
+                    hi = mid;
+                }
+            }
+            if (j < longer.length && longer[j] === target) {
+                result.push(target);
+                j++;
+            }
+        }
+        return result;
+    }
+    
+    // 返回匹配的论文序号（升序）；没有可检索的词时返回 null
+    async function searchOrdinals(text) {
+        const meta = await loadMeta();
+        const terms = queryTerms(text, meta.prefix_length);
+        if (terms.length === 0) {
+            return null;
+        }
+        
+        const lists = await Promise.all(terms.map(async term => {
+            const shard = await loadShard(meta, shardName(term, meta.prefix_length));
+            const matched = [];
+            for (let i = lowerBound(shard.terms, term); i < shard.terms.length && shard.terms[i].startsWith(term); i++) {
+                matched.push(postingsAt(shard, i));
+            }
+            return matched.length ? union(matched) : [];
+        }));
+        
+        // 发表状态和研究领域筛选同样以倒排表参与求交集，其他页面的匹配数也会随筛选变化
+        if (currentStatus !== 'all' || currentCategory !== 'all') {
+            const facets = await loadFacets();
+            if (currentStatus !== 'all') {
+                lists.push(decodePostings(facets['status:' + currentStatus] || ''));
+            }
+            if (currentCategory !== 'all') {
+                lists.push(decodePostings(facets['tag:' + currentCategory] || ''));
+            }
+        }
+        
+        lists.sort((a, b) => a.length - b.length);
+        return lists.reduce((result, list) => intersect(result, list));
+    }
+    
+    // 与 generate_html.py 中的 page_filename / page_ranges 保持一致：
+    // 归档页从最旧的论文开始每 perPage 篇一页，其余（最新的）论文都在主页
+    function pageFilename(page) {
+        return page === 0 ? 'index.html' : 'page-' + page + '.html';
+    }
+    
+    function pageOf(ordinal) {
+        const archives = Math.max(Math.floor(searchIndex.count / perPage), 1) - 1;
+        return ordinal >= archives * perPage ? 0 : Math.floor(ordinal / perPage) + 1;
+    }
+    
+    // 显示匹配总数和其他页面中的匹配
+    function updateSummary(results) {
+        summary.textContent = '';
+        if (!results) {
+            summary.classList.add('hidden');
+            return;
+        }
+        
+        summary.appendChild(document.createTextNode('共找到 ' + results.length + ' 篇匹配的论文'));
+        if (perPage > 0) {
+            // 从新到旧列出
+            const pages = new Map();
+            for (let i = results.length - 1; i >= 0; i--) {
+                const page = pageOf(results[i]);
+                if (page !== currentPage) {
+                    pages.set(page, (pages.get(page) || 0) + 1);
+                }
+            }
+            if (pages.size > 0) {
+                summary.appendChild(document.createTextNode('，其他页面：'));
+                const query = '?q=' + encodeURIComponent(searchTerm);
+                let shown = 0;
+                for (const [page, count] of pages) {
+                    if (shown === 20) {
+                        summary.appendChild(document.createTextNode(' …'));
+                        break;
+                    }
+                    const link = document.createElement('a');
+                    link.href = pageFilename(page) + query;
+                    link.textContent = (page === 0 ? '最新' : '第 ' + page + ' 页') + ' (' + count + ')';
+                    summary.appendChild(link);
+                    shown++;
+                }
+            }
+        }
+        summary.classList.remove('hidden');
+    }
+    
+    // ---- virtual 模式：论文数据来自 list/papers.json，只渲染可见范围内的卡片 ----
+    const virtualMode = container.dataset.mode === 'virtual';
+    const virtualList = virtualMode ? container.querySelector('.virtual-list') : null;
+    const ESTIMATED_HEIGHT = 240;   // 未测量卡片的估计高度
+    const CARD_GAP = 16;            // 与 .paper-card 的 margin-bottom 一致
+    const OVERSCAN = 600;           // 视口上下额外渲染的像素
+    const listData = {
+        rows: null,
+        tags: [],
+        categories: [],
+        abstractChunk: 1000,
+        abstracts: new Map(),
+        text: null
+    };
+    let visibleOrder = [];          // 筛选后的论文序号
+    let heights = null;
+    const measured = new Map();     // 序号 -> 实测高度
+    const rendered = new Map();     // 序号 -> 卡片元素
+    let renderScheduled = false;
+    
+    // 树状数组：第 i 张卡片的顶部位置是前 i 张卡片（含间距）的高度之和，更新和查找都是 O(log n)
+    function HeightIndex(sizes) {
+        const n = sizes.length;
+        const tree = new Float64Array(n + 1);
+        for (let i = 1; i <= n; i++) {
+            tree[i] += sizes[i - 1];
+            const parent = i + (i & -i);
+            if (parent <= n) {
+                tree[parent] += tree[i];
+            }
+        }
+        this.n = n;
+        this.tree = tree;
+        this.sizes = sizes;
+    }
+    
+    HeightIndex.prototype.prefix = function(i) {
+        let sum = 0;
+        for (; i > 0; i -= i & -i) {
+            sum += this.tree[i];
+        }
+        return sum;
+    };
+    
+    HeightIndex.prototype.update = function(i, size) {
+        const delta = size - this.sizes[i];
+        this.sizes[i] = size;
+        for (let j = i + 1; j <= this.n; j += j & -j) {
+            this.tree[j] += delta;
+        }
+        return delta;
+    };
+    
+    // 包含位置 offset 的卡片下标
+    HeightIndex.prototype.find = function(offset) {
+        let pos = 0;
+        let step = 1;
+        while (step * 2 <= this.n) {
+            step *= 2;
+        }
+        for (; step > 0; step >>= 1) {
+            if (pos + step <= this.n && this.tree[pos + step] <= offset) {
+                pos += step;
+                offset -= this.tree[pos];
+            }
+        }
+        return Math.min(pos, Math.max(this.n - 1, 0));
+    };
+    
+    function escapeHtml(text) {
+        return String(text).replace(/[&<>"']/g, c => ({
+            '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'
+        })[c]);
+    }
+    
+    function loadAbstract(ordinal) {
+        const k = Math.floor(ordinal / listData.abstractChunk);
+        if (!listData.abstracts.has(k)) {
+            listData.abstracts.set(k, fetchJSON('list/abstracts-' + k + '.json'));
+        }
+        return listData.abstracts.get(k).then(chunk => chunk[ordinal % listData.abstractChunk]);
+    }
+    
+    // 与 generate_papers_html 生成的卡片结构一致
+    function buildCard(ordinal) {
+        const row = listData.rows[ordinal];
+        const [id, title, authors, published, conference, category, tags] = row;
+        const pdfUrl = row.length > 7 ? row[7] : 'http://arxiv.org/pdf/' + id;
+        const arxivUrl = row.length > 7 ? row[8] : 'http://arxiv.org/abs/' + id;
+        const tagNames = tags.map(t => listData.tags[t]);
+        const sourceInfo = conference
+            ? '📍 ' + escapeHtml(conference)
+            : '📄 ArXiv Preprint (' + escapeHtml(listData.categories[category]) + ')';
+        
+        const card = document.createElement('article');
+        card.className = 'paper-card';
+        card.dataset.ordinal = ordinal;
+        card.dataset.tags = tagNames.join(',');
+        card.dataset.status = conference ? 'published' : 'preprint';
+        card.innerHTML =
+            '<h2 class="paper-title"><a href="' + escapeHtml(arxivUrl) + '" target="_blank">' + escapeHtml(title) + '</a></h2>' +
+            '<div class="paper-meta"><span class="meta-item">📅 ' + escapeHtml(published) + '</span>' +
+            '<span class="meta-item venue-' + (conference ? 'conference' : 'preprint') + '">' + sourceInfo + '</span></div>' +
+            '<div class="paper-authors">👥 ' + escapeHtml(authors) + '</div>' +
+            '<div class="paper-tags">' + tagNames.map(t => '<span class="tag">' + escapeHtml(t) + '</span>').join('') + '</div>' +
+            '<div class="paper-abstract"><details><summary>查看摘要</summary><p></p></details></div>' +
+            '<div class="paper-links"><a href="' + escapeHtml(pdfUrl) + '" target="_blank" class="btn-link">📄 PDF</a>' +
+            '<a href="' + escapeHtml(arxivUrl) + '" target="_blank" class="btn-link">🔗 ArXiv</a></div>';
+        
+        // 摘要按块懒加载；展开/收起会改变卡片高度，需要重新排布
+        const details = card.querySelector('details');
+        details.addEventListener('toggle', () => {
+            const p = details.querySelector('p');
+            if (details.open && !p.textContent) {
+                p.textContent = '加载中…';
+                loadAbstract(ordinal).then(text => {
+                    p.textContent = text;
+                    scheduleRender();
+                }).catch(() => {
+                    p.textContent = '摘要加载失败';
+                });
+            }
+            scheduleRender();
+        });
+        return card;
+    }
+    
+    function rebuildHeights() {
+        heights = new HeightIndex(visibleOrder.map(o => (measured.get(o) || ESTIMATED_HEIGHT) + CARD_GAP));
+        virtualList.style.height = heights.prefix(heights.n) + 'px';
+    }
+    
+    function scheduleRender() {
+        if (!renderScheduled) {
+            renderScheduled = true;
+            window.requestAnimationFrame(renderVirtual);
+        }
+    }
+    
+    // 渲染视口附近的卡片：已有卡片按序号复用，离开范围的卡片移除
+    function renderVirtual() {
+        renderScheduled = false;
+        if (!heights) {
+            return;
+        }
+        const viewTop = -virtualList.getBoundingClientRect().top;
+        const start = viewTop - OVERSCAN;
+        const end = viewTop + window.innerHeight + OVERSCAN;
+        
+        const range = [];
+        for (let i = heights.n ? heights.find(Math.max(start, 0)) : 0; i < heights.n; i++) {
+            if (heights.prefix(i) > end) {
+                break;
+            }
+            range.push(i);
+        }
+        
+        const keep = new Set(range.map(i => visibleOrder[i]));
+        rendered.forEach((card, ordinal) => {
+            if (!keep.has(ordinal)) {
+                card.remove();
+                rendered.delete(ordinal);
+            }
+        });
+        range.forEach(i => {
+            const ordinal = visibleOrder[i];
+            if (!rendered.has(ordinal)) {
+                const card = buildCard(ordinal);
+                rendered.set(ordinal, card);
+                virtualList.appendChild(card);
+            }
+        });
+        
+        // 测量实际高度；视口上方的卡片高度变化时调整滚动位置，避免内容跳动
+        let changed = false;
+        let shift = 0;
+        range.forEach(i => {
+            const ordinal = visibleOrder[i];
+            const height = rendered.get(ordinal).offsetHeight;
+            measured.set(ordinal, height);
+            const delta = heights.update(i, height + CARD_GAP);
+            if (delta !== 0) {
+                changed = true;
+                if (heights.prefix(i) < viewTop) {
+                    shift += delta;
+                }
+            }
+        });
+        range.forEach(i => {
+            rendered.get(visibleOrder[i]).style.top = heights.prefix(i) + 'px';
+        });
+        virtualList.style.height = heights.prefix(heights.n) + 'px';
+        if (shift !== 0) {
+            window.scrollBy(0, shift);
+        }
+        if (changed) {
+            // 高度估计有偏差时可能需要补渲染，测量结果已缓存，很快收敛
+            scheduleRender();
+        }
+    }
+    
+    function paperText(ordinal) {
+        if (!listData.text) {
+            listData.text = new Array(listData.rows.length);
+        }
+        if (listData.text[ordinal] === undefined) {
+            const row = listData.rows[ordinal];
+            listData.text[ordinal] = (row[1] + ' ' + row[2] + ' ' + row[4]).toLowerCase();
+        }
+        return listData.text[ordinal];
+    }
+    
+    function applyVirtualFilters(results) {
+        if (!listData.rows) {
+            // 数据加载完成后会重新筛选
+            return;
+        }
+        const tagIndex = listData.tags.indexOf(currentCategory);
+        // 序号从最旧的论文开始，按从新到旧的顺序显示
+        const candidates = results || listData.rows;
+        visibleOrder = [];
+        for (let i = candidates.length - 1; i >= 0; i--) {
+            const ordinal = results ? results[i] : i;
+            const row = listData.rows[ordinal];
+            const matchStatus = currentStatus === 'all' || (row[4] ? 'published' : 'preprint') === currentStatus;
+            const matchCategory = currentCategory === 'all' || row[6].includes(tagIndex);
+            const matchSearch = results || searchTerm === '' || paperText(ordinal).includes(searchTerm);
+            if (matchStatus && matchCategory && matchSearch) {
+                visibleOrder.push(ordinal);
+            }
+        }
+        rebuildHeights();
+        scheduleRender();
+        showNoResults(visibleOrder.length === 0, '未找到匹配的论文');
+    }
+    
+    function showNoResults(show, message) {
+        let noResults = container.querySelector('.no-results');
+        if (show) {
+            if (!noResults) {
+                noResults = document.createElement('p');
+                noResults.className = 'no-results';
+                container.appendChild(noResults);
+            }
+            noResults.textContent = message;
+        } else if (noResults) {
+            noResults.remove();
+        }
+    }
+    
     // 发表状态筛选按钮点击事件
     statusBtns.forEach(btn => {
         btn.addEventListener('click', function() {
@@ -60,12 +556,48 @@ document.addEventListener('DOMContentLoaded', function() {
     
     // 搜索输入事件 - 使用防抖优化
     searchInput.addEventListener('input', debounce(function() {
-        searchTerm = this.value.toLowerCase();
+        // debounce 不保留 this，直接读取输入框
+        searchTerm = searchInput.value.toLowerCase();
         filterPapers();
     }, 300));
     
-    // 筛选论文 - 优化版本，使用CSS类而非内联样式
+    // 筛选论文：有搜索词时优先查询搜索索引，索引不可用（例如以 file:// 打开）时退回逐篇匹配
     function filterPapers() {
+        const request = ++searchRequest;
+        if (searchTerm === '' || !searchIndex.available) {
+            applyFilters(null);
+            return;
+        }
+        searchOrdinals(searchTerm).then(results => {
+            if (request === searchRequest) {
+                applyFilters(results);
+            }
+        }).catch(() => {
+            searchIndex.available = false;
+            if (request === searchRequest) {
+                applyFilters(null);
+            }
+        });
+    }
+    
+    // 使用CSS类而非内联样式显示/隐藏当前页的论文
+    function applyFilters(results) {
+        if (virtualMode) {
+            applyVirtualFilters(results);
+            updateSummary(results);
+            return;
+        }
+        
+        let matched = null;
+        if (results) {
+            // 只取落在当前页范围内的序号
+            matched = new Set();
+            const end = pageOffset + paperCache.length;
+            for (let i = lowerBound(results, pageOffset); i < results.length && results[i] < end; i++) {
+                matched.add(results[i]);
+            }
+        }
+        
         let visibleCount = 0;
         
         paperCache.forEach(paper => {
@@ -75,8 +607,16 @@ document.addEventListener('DOMContentLoaded', function() {
             // 检查研究领域筛选
             const matchCategory = currentCategory === 'all' || paper.tags.includes(currentCategory);
             
-            // 检查搜索关键词 - 使用缓存的文本内容
-            const matchSearch = searchTerm === '' || paper.textContent.includes(searchTerm);
+            // 检查搜索关键词
+            let matchSearch = true;
+            if (matched) {
+                matchSearch = matched.has(paper.ordinal);
+            } else if (searchTerm !== '') {
+                if (paper.textContent === null) {
+                    paper.textContent = paper.element.textContent.toLowerCase();
+                }
+                matchSearch = paper.textContent.includes(searchTerm);
+            }
             
             if (matchStatus && matchCategory && matchSearch) {
                 paper.element.classList.remove('hidden');
@@ -86,8 +626,9 @@ document.addEventListener('DOMContentLoaded', function() {
             }
         });
         
+        updateSummary(results);
+        
         // 显示无结果提示
-        const container = document.getElementById('papers-container');
         let noResults = container.querySelector('.no-results');
         
         if (visibleCount === 0) {
@@ -103,4 +644,42 @@ document.addEventListener('DOMContentLoaded', function() {
             }
         }
     }
+    
+    if (virtualMode) {
+        fetchJSON('list/papers.json').then(data => {
+            listData.rows = data.papers;
+            listData.tags = data.tags;
+            listData.categories = data.categories;
+            listData.abstractChunk = data.abstract_chunk;
+            virtualList.removeAttribute('aria-busy');
+            window.addEventListener('scroll', scheduleRender, { passive: true });
+            window.addEventListener('resize', () => {
+                // 宽度变化后卡片高度都会变化，重新测量
+                measured.clear();
+                rebuildHeights();
+                scheduleRender();
+            });
+            filterPapers();
+        }).catch(() => {
+            // 以 file:// 打开时浏览器不允许加载数据文件
+            showNoResults(true, '论文数据加载失败，请通过 HTTP 访问本页面');
+        });
+    }
+    
+    // 统计数字和更新时间以 site.json 为准（内容未变的页面在增量构建时不会重写）
+    fetchJSON('site.json').then(site => {
+        document.querySelectorAll('[data-stat]').forEach(element => {
+            if (site[element.dataset.stat] !== undefined) {
+                element.textContent = site[element.dataset.stat];
+            }
+        });
+    }).catch(() => {});
+    
+    // 从其他页面的搜索结果链接跳转过来时，恢复搜索词
+    const initialQuery = new URLSearchParams(window.location.search).get('q');
+    if (initialQuery) {
+        searchInput.value = initialQuery;
+        searchTerm = initialQuery.toLowerCase();
+        filterPapers();
+    }
 });
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+内存分析
+在 tracemalloc 下按顺序运行流水线的各个阶段（保存、加载、生成页面、生成搜索索引），
+在每个阶段的边界做快照，报告各阶段的峰值、阶段结束时仍占用的内存和分配最多的代码位置，
+并检查 benchmarks/memory_budgets.json 中按语料规模设置的预算，超出时以非零状态退出。
+
+CI 机器和小内存的虚拟机内存有限，用它在每晚的构建被 OOM 之前发现内存膨胀。
+
+用法：
+    python memory_profile.py                       # 10k 篇
+    python memory_profile.py --sizes 1k,10k,100k --top 5
+    python memory_profile.py --output memory.json --budgets benchmarks/memory_budgets.json
+
+注意：tracemalloc 只统计 Python 分配的内存（不含解释器本身和 C 扩展的私有分配），
+并使运行变慢数倍；页面以单进程渲染，子进程的内存不会被统计。
+"""
+
+import argparse
+import gc
+import json
+import logging
+import sys
+import tempfile
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from benchmark import CORPUS_NOW, format_size, parse_size
+from scripts.fetch_papers import PaperFetcher
+from scripts.generate_html import HTMLGenerator
+from scripts.metrics import peak_rss
+from scripts.synthetic import SyntheticCorpus
+
+DEFAULT_BUDGETS = Path("benchmarks/memory_budgets.json")
+MB = 1024 * 1024
+
+# 不计入分配位置统计的帧（tracemalloc 自身和导入机制）
+_IGNORED_FRAMES = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _frame_location(frame: tracemalloc.Frame) -> str:
+    path = Path(frame.filename)
+    try:
+        path = path.relative_to(Path.cwd())
+    except ValueError:
+        pass
+    return f"{path}:{frame.lineno}"
+
+
+class MemoryProfiler:
+    """按阶段记录 tracemalloc 的峰值和快照差异
+
+    分配位置按阶段结束时与开始时的快照差异排序，即阶段留下的内存来自哪里；
+    阶段内分配又释放的临时内存只体现在峰值中。
+    """
+
+    def __init__(self, workdir: Path, top: int = 10, frames: int = 1):
+        # 阶段开始时的快照先写入 workdir，不让快照本身占用阶段中的内存
+        self.workdir = workdir
+        self.top = top
+        self.frames = frames
+        self.stages: List[Dict] = []
+
+    def __enter__(self):
+        tracemalloc.start(self.frames)
+        return self
+
+    def __exit__(self, *exc):
+        tracemalloc.stop()
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(_IGNORED_FRAMES)
+
+    def _top_sites(self, snapshot: tracemalloc.Snapshot, before: tracemalloc.Snapshot) -> List[Dict]:
+        group = 'traceback' if self.frames > 1 else 'lineno'
+        return [
+            {
+                'site': ' <- '.join(_frame_location(frame) for frame in reversed(stat.traceback)),
+                'size_diff_bytes': stat.size_diff,
+                'count_diff': stat.count_diff,
+            }
+            for stat in snapshot.compare_to(before, group)[:self.top]
+        ]
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """阶段开始和结束时各做一次快照；峰值为阶段内 Python 分配的最高值（含之前阶段留下的内存）"""
+        snapshot_path = self.workdir / f"{name}.snapshot"
+        self._snapshot().dump(str(snapshot_path))
+        gc.collect()
+        start_size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            # 阶段抛出异常时同样记录（到失败为止的峰值）并删除快照文件
+            peak = tracemalloc.get_traced_memory()[1]
+            gc.collect()
+            retained = tracemalloc.get_traced_memory()[0]
+            before = tracemalloc.Snapshot.load(str(snapshot_path))
+            snapshot_path.unlink()
+            self.stages.append({
+                'stage': name,
+                'start_bytes': start_size,
+                'peak_bytes': peak,
+                'stage_peak_bytes': peak - start_size,
+                'end_bytes': retained,
+                'retained_bytes': retained - start_size,
+                'top_sites': self._top_sites(self._snapshot(), before),
+            })
+
+
+def run_pipeline(size: int, workdir: Path, profiler: MemoryProfiler):
+    """抓取之后的流水线：保存 -> （新进程）加载 -> 生成页面 -> 生成搜索索引"""
+    fetcher = PaperFetcher()
+    with profiler.stage('corpus'):
+        papers = []
+        for paper in SyntheticCorpus(size, now=CORPUS_NOW).papers():
+            fetcher.enrich_paper(paper)
+            papers.append(paper)
+    with profiler.stage('save_papers'):
+        fetcher.save_papers(papers, str(workdir / "papers"))
+    # 抓取和生成网页在不同的进程中运行，生成时语料只来自磁盘
+    del papers
+    with profiler.stage('load_papers'):
+        generator = HTMLGenerator(data_path=str(workdir / "papers"), output_dir=str(workdir / "docs"),
+                                  workers=1, incremental=False)
+        generator.load_papers()
+    with profiler.stage('generate_index_html'):
+        generator.generate_css()
+        generator.generate_js()
+        generator.generate_index_html()
+    with profiler.stage('generate_search_index'):
+        generator.generate_search_index()
+    del generator
+
+
+def check_budgets(size: int, stages: List[Dict], budgets: Dict) -> List[str]:
+    """预算格式：{"10k": {"save_papers": {"peak": MB, "stage_peak": MB}, ...}, ...}；没有列出的规模、阶段或项不检查
+
+    peak 为阶段内的总峰值（含之前阶段留下的内存），stage_peak 为阶段内新增的峰值；
+    前面阶段的内存增长会推高后面阶段的 peak，只有 stage_peak 能指出是哪个阶段本身膨胀了。
+    只写一个数字时视为 peak（旧格式）。
+    """
+    limits = budgets.get(format_size(size), {})
+    failures = []
+    for stage in stages:
+        limit = limits.get(stage['stage'])
+        if limit is None:
+            continue
+        if not isinstance(limit, dict):
+            limit = {'peak': limit}
+        for field, label in (('peak', '峰值'), ('stage_peak', '新增')):
+            if field not in limit:
+                continue
+            used_mb = stage[f'{field}_bytes'] / MB
+            ok = used_mb <= limit[field]
+            print(f"  {'✅' if ok else '❌'} {stage['stage']:<22} {label} {used_mb:8.1f} MB / 预算 {limit[field]} MB")
+            if not ok:
+                failures.append(f"{stage['stage']}/{format_size(size)}:{field}")
+    return failures
+
+
+def print_stages(stages: List[Dict]):
+    for stage in stages:
+        print(f"\n  [{stage['stage']}] 峰值 {stage['peak_bytes'] / MB:.1f} MB"
+              f"（阶段内新增 {stage['stage_peak_bytes'] / MB:.1f} MB），"
+              f"结束时 {stage['end_bytes'] / MB:.1f} MB（保留 {stage['retained_bytes'] / MB:+.1f} MB）")
+        for site in stage['top_sites']:
+            print(f"      {site['size_diff_bytes'] / MB:+9.2f} MB {site['count_diff']:+9d} 个  {site['site']}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="在 tracemalloc 下分析流水线各阶段的内存")
+    parser.add_argument('--sizes', default='10k', help="语料规模，逗号分隔（例如 1k,10k,100k）")
+    parser.add_argument('--top', type=int, default=10, help="每个阶段列出的分配位置数")
+    parser.add_argument('--frames', type=int, default=1, help="按多少层调用栈归并分配位置")
+    parser.add_argument('--budgets', default=str(DEFAULT_BUDGETS), help="内存预算 JSON")
+    parser.add_argument('--output', help="结果 JSON 的保存路径")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.INFO)
+    budgets_path = Path(args.budgets)
+    budgets = json.loads(budgets_path.read_text(encoding='utf-8')) if budgets_path.exists() else {}
+
+    results, failures = {}, []
+    for size in (parse_size(s) for s in args.sizes.split(',')):
+        print(f"\n🧠 {format_size(size)} 篇论文")
+        with tempfile.TemporaryDirectory(prefix="dailypaper-memory-") as tmp:
+            with MemoryProfiler(Path(tmp), args.top, args.frames) as profiler:
+                run_pipeline(size, Path(tmp), profiler)
+        print_stages(profiler.stages)
+        if budgets:
+            print()
+            failures += check_budgets(size, profiler.stages, budgets)
+        results[format_size(size)] = {'stages': profiler.stages, 'peak_rss_bytes': peak_rss()}
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding='utf-8')
+        print(f"\n结果已保存到 {args.output}")
+
+    if failures:
+        print(f"\n❌ {len(failures)} 个阶段超出内存预算: {', '.join(failures)}")
+        return 1
+    print("\n✨ 内存预算检查通过" if budgets else f"\n未找到内存预算 {budgets_path}，跳过检查")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,13 @@
 #!/usr/bin/env python3
 """
 简单测试 - 只抓取少量论文进行快速验证
+
+使用 --offline 时改为从本地 ArXiv 替身服务器抓取合成论文，
+数据和网页输出到临时目录，不需要网络，也不会改动 data/ 和 docs/
 """
 
 import sys
+import tempfile
 from pathlib import Path
 
 # 添加项目根目录到路径
@@ -12,13 +16,18 @@ sys.path.insert(0, str(project_root))
 
 from scripts.fetch_papers import PaperFetcher
 from scripts.generate_html import HTMLGenerator
+from scripts.arxiv_stub_server import create_server, SyntheticSource
+from scripts.synthetic import SyntheticCorpus
 
 
-def quick_test():
+def quick_test(offline: bool = False):
     """快速测试 - 只抓取一个类别"""
     print("🧪 快速测试开始...")
     print("=" * 60)
     
+    data_path = "data/papers"
+    docs_dir = "docs"
+    
     # 临时修改配置，只抓取 cs.AI 类别的少量论文
     fetcher = PaperFetcher()
     
@@ -28,6 +37,18 @@ def quick_test():
     fetcher.config['sources']['arxiv']['max_results'] = 10  # 只抓取10篇
     fetcher.config['sources']['arxiv']['days_back'] = 7  # 最近7天
     
+    if offline:
+        server = create_server(SyntheticSource(SyntheticCorpus(2000, papers_per_day=100)))
+        server.start_background()
+        fetcher.config['sources']['arxiv']['api_url'] = server.url
+        fetcher.config['sources']['arxiv']['rate_limit'] = 0
+        output_root = Path(tempfile.mkdtemp(prefix="dailypaper-offline-"))
+        data_path = str(output_root / "data" / "papers")
+        docs_dir = str(output_root / "docs")
+        print(f"🔌 离线模式：使用本地替身服务器 {server.url}")
+        print(f"   输出目录: {output_root}")
+        print()
+    
     print("📥 正在抓取 cs.AI 类别的 10 篇最新论文...")
     print()
     
@@ -46,14 +67,14 @@ def quick_test():
             print()
             
             # 保存数据
-            print("💾 保存数据到 data/papers.json...")
-            fetcher.save_papers(papers)
+            print(f"💾 保存数据到 {data_path}/...")
+            fetcher.save_papers(papers, data_path)
             print("✅ 数据保存成功")
             print()
             
             # 生成网页
             print("🌐 生成网页...")
-            generator = HTMLGenerator()
+            generator = HTMLGenerator(data_path, docs_dir)
             generator.run()
             print()
             
@@ -61,7 +82,7 @@ def quick_test():
             print("✨ 测试完全成功！")
             print()
             print("📝 下一步操作：")
-            print("  1. 在浏览器中打开: docs/index.html")
+            print(f"  1. 在浏览器中打开: {Path(docs_dir) / 'index.html'}")
             print("  2. 查看生成的网页效果")
             print("  3. 运行完整测试: python test.py")
             print("  4. 或者直接抓取所有类别: python scripts/fetch_papers.py")
@@ -85,4 +106,4 @@ def quick_test():
 
 
 if __name__ == "__main__":
-    sys.exit(quick_test())
+    sys.exit(quick_test(offline='--offline' in sys.argv[1:]))
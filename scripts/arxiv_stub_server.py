@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+本地 ArXiv API 替身服务器
+在没有网络的环境中为 PaperFetcher 提供 Atom 格式的查询结果，用于回归测试和抓取性能测试
+
+支持三种数据来源：
+  synthetic  由 SyntheticCorpus 生成的合成语料（可配置规模、每页延迟和错误注入）
+  replay     回放之前录制的响应
+  record     转发到真实 ArXiv API 并录制响应，供之后 replay 使用
+
+把 config.yaml 中的 sources.arxiv.api_url 指向 http://127.0.0.1:<port>/api/query 即可使用。
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse
+from xml.sax.saxutils import escape, quoteattr
+
+try:
+    from .synthetic import SyntheticCorpus
+except ImportError:
+    from synthetic import SyntheticCorpus
+
+
+UPSTREAM_URL = "https://export.arxiv.org/api/query"
+
+# 参与响应匹配的查询参数（其余参数不影响结果）
+QUERY_PARAMS = ('search_query', 'id_list', 'sortBy', 'sortOrder', 'start', 'max_results')
+
+
+def fixture_key(params: Dict[str, str]) -> str:
+    """由查询参数计算录制文件名"""
+    normalized = urlencode(sorted((k, params.get(k, '')) for k in QUERY_PARAMS))
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:16]
+
+
+def format_timestamp(dt) -> str:
+    return dt.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def render_entry(entry: Dict) -> str:
+    """把一条论文渲染为 ArXiv API 的 Atom <entry>"""
+    abs_url = f"http://arxiv.org/abs/{entry['id']}"
+    pdf_url = f"http://arxiv.org/pdf/{entry['id']}"
+    parts = [
+        '<entry>',
+        f'<id>{abs_url}</id>',
+        f"<updated>{format_timestamp(entry['updated'])}</updated>",
+        f"<published>{format_timestamp(entry['published'])}</published>",
+        f"<title>{escape(entry['title'])}</title>",
+        f"<summary>{escape(entry['abstract'])}</summary>",
+    ]
+    parts.extend(f'<author><name>{escape(name)}</name></author>' for name in entry['authors'])
+    if entry.get('comment'):
+        parts.append(f"<arxiv:comment>{escape(entry['comment'])}</arxiv:comment>")
+    parts.append(f'<link href={quoteattr(abs_url)} rel="alternate" type="text/html"/>')
+    parts.append(f'<link title="pdf" href={quoteattr(pdf_url)} rel="related" type="application/pdf"/>')
+    parts.append(f"<arxiv:primary_category term={quoteattr(entry['primary_category'])} "
+                 f'scheme="http://arxiv.org/schemas/atom"/>')
+    parts.extend(f'<category term={quoteattr(c)} scheme="http://arxiv.org/schemas/atom"/>'
+                 for c in entry['categories'])
+    parts.append('</entry>')
+    return ''.join(parts)
+
+
+def render_feed(entries: List[Dict], total: int, start: int, query: str) -> bytes:
+    """渲染完整的 Atom feed"""
+    header = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<feed xmlns="http://www.w3.org/2005/Atom" '
+        'xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/" '
+        'xmlns:arxiv="http://arxiv.org/schemas/atom">'
+        f'<title>ArXiv Query: {escape(query)}</title>'
+        '<id>http://arxiv.org/api/stub</id>'
+        f'<opensearch:totalResults>{total}</opensearch:totalResults>'
+        f'<opensearch:startIndex>{start}</opensearch:startIndex>'
+        f'<opensearch:itemsPerPage>{len(entries)}</opensearch:itemsPerPage>'
+    )
+    body = ''.join(render_entry(e) for e in entries)
+    return (header + body + '</feed>').encode('utf-8')
+
+
+class SyntheticSource:
+    """从合成语料回答查询，支持 cat:xxx（可用 OR/AND 组合）和 id_list"""
+
+    def __init__(self, corpus: SyntheticCorpus):
+        self.corpus = corpus
+        # 预先建立 类别 -> 论文下标 的索引，查询时只需切片
+        self._by_category: Dict[str, List[int]] = {}
+        for i in range(len(corpus)):
+            for category in corpus.categories_for(i):
+                self._by_category.setdefault(category, []).append(i)
+        self._by_id = None
+        self._lock = threading.Lock()
+
+    def _indices_for_query(self, query: str) -> List[int]:
+        categories = re.findall(r'cat:([\w.\-]+)', query)
+        if not categories:
+            return list(range(len(self.corpus)))
+        if len(categories) == 1:
+            return self._by_category.get(categories[0], [])
+        merged = set()
+        for category in categories:
+            merged.update(self._by_category.get(category, []))
+        return sorted(merged)
+
+    def _indices_for_ids(self, id_list: List[str]) -> List[int]:
+        with self._lock:
+            if self._by_id is None:
+                self._by_id = {self.corpus.entry(i)['id'].rsplit('v', 1)[0]: i
+                               for i in range(len(self.corpus))}
+        return [self._by_id[i.rsplit('v', 1)[0]] for i in id_list if i.rsplit('v', 1)[0] in self._by_id]
+
+    def respond(self, params: Dict[str, str]) -> Tuple[int, bytes]:
+        start = int(params.get('start', 0) or 0)
+        max_results = int(params.get('max_results', 10) or 10)
+        query = params.get('search_query', '')
+        if params.get('id_list'):
+            indices = self._indices_for_ids(params['id_list'].split(','))
+        else:
+            indices = self._indices_for_query(query)
+        # 下标从新到旧排列，因此默认即为降序
+        if params.get('sortOrder') == 'ascending':
+            indices = indices[::-1]
+        page = [self.corpus.entry(i) for i in indices[start:start + max_results]]
+        return 200, render_feed(page, len(indices), start, query)
+
+
+class FixtureSource:
+    """回放（或录制）查询响应，文件名为查询参数的哈希"""
+
+    def __init__(self, fixtures_dir: str, upstream: Optional[str] = None):
+        self.fixtures_dir = Path(fixtures_dir)
+        self.upstream = upstream
+        self._lock = threading.Lock()
+        if upstream:
+            self.fixtures_dir.mkdir(parents=True, exist_ok=True)
+
+    def respond(self, params: Dict[str, str]) -> Tuple[int, bytes]:
+        key = fixture_key(params)
+        fixture = self.fixtures_dir / f"{key}.xml"
+        if fixture.exists():
+            return 200, fixture.read_bytes()
+        if not self.upstream:
+            return 404, f"no recorded response for {key}".encode('utf-8')
+
+        query = urlencode({k: params[k] for k in QUERY_PARAMS if k in params})
+        with urllib.request.urlopen(f"{self.upstream}?{query}", timeout=60) as resp:
+            body = resp.read()
+        with self._lock:
+            fixture.write_bytes(body)
+            index_file = self.fixtures_dir / "index.json"
+            index = json.loads(index_file.read_text(encoding='utf-8')) if index_file.exists() else {}
+            index[key] = query
+            index_file.write_text(json.dumps(index, indent=2, sort_keys=True), encoding='utf-8')
+        return 200, body
+
+
+class StubServer(ThreadingHTTPServer):
+    """带每页延迟、错误注入和请求统计的 ArXiv API 替身"""
+
+    daemon_threads = True
+
+    def __init__(self, address, source, latency: float = 0.0, error_rate: float = 0.0, seed: int = 0):
+        super().__init__(address, StubRequestHandler)
+        self.source = source
+        self.latency = latency
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'errors_injected': 0, 'entries_served': 0, 'bytes_served': 0}
+        # 每个查询请求的到达时间（time.monotonic）和参数，供测试检查请求间隔和分页
+        self.requests: List[Dict] = []
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api/query"
+
+    def should_fail(self, params: Dict[str, str]) -> bool:
+        with self._lock:
+            self.stats['requests'] += 1
+            self.requests.append({'time': time.monotonic(), **params})
+            fail = self.error_rate > 0 and self._rng.random() < self.error_rate
+            if fail:
+                self.stats['errors_injected'] += 1
+            return fail
+
+    def record(self, body: bytes):
+        with self._lock:
+            self.stats['entries_served'] += body.count(b'<entry>')
+            self.stats['bytes_served'] += len(body)
+
+    def start_background(self) -> threading.Thread:
+        """在后台线程中运行，便于在同一进程内做测试"""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    server: StubServer
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == '/stats':
+            self._send(200, json.dumps(self.server.stats).encode('utf-8'), 'application/json')
+            return
+        if url.path != '/api/query':
+            self._send(404, b'not found', 'text/plain')
+            return
+
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if self.server.should_fail(params):
+            self._send(503, b'injected error', 'text/plain')
+            return
+
+        try:
+            status, body = self.server.source.respond(params)
+        except Exception as e:
+            self._send(500, str(e).encode('utf-8'), 'text/plain')
+            return
+        if status == 200:
+            self.server.record(body)
+        self._send(status, body, 'application/atom+xml; charset=utf-8')
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def create_server(source, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0,
+                  error_rate: float = 0.0, seed: int = 0) -> StubServer:
+    """创建替身服务器；port 为 0 时自动分配端口（见 server.url）"""
+    return StubServer((host, port), source, latency=latency, error_rate=error_rate, seed=seed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="本地 ArXiv API 替身服务器")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help="每个请求的延迟（秒）")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="返回 503 的请求比例")
+    parser.add_argument('--seed', type=int, default=0)
+    sub = parser.add_subparsers(dest='mode', required=True)
+
+    synthetic = sub.add_parser('synthetic', help="合成语料")
+    synthetic.add_argument('--size', type=int, default=10000, help="语料中的论文数")
+    synthetic.add_argument('--papers-per-day', type=float, default=500)
+
+    replay = sub.add_parser('replay', help="回放录制的响应")
+    replay.add_argument('--fixtures', required=True)
+
+    record = sub.add_parser('record', help="转发到真实 API 并录制响应")
+    record.add_argument('--fixtures', required=True)
+    record.add_argument('--upstream', default=UPSTREAM_URL)
+
+    args = parser.parse_args(argv)
+    if args.mode == 'synthetic':
+        source = SyntheticSource(SyntheticCorpus(args.size, seed=args.seed,
+                                                 papers_per_day=args.papers_per_day))
+    elif args.mode == 'replay':
+        source = FixtureSource(args.fixtures)
+    else:
+        source = FixtureSource(args.fixtures, upstream=args.upstream)
+
+    server = create_server(source, args.host, args.port, args.latency, args.error_rate, args.seed)
+    print(f"ArXiv 替身服务器运行在 {server.url}（模式: {args.mode}）")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+静态资源后处理
+压缩 HTML/CSS/JS、为 CSS/JS 生成带内容哈希的文件名（浏览器可以长期缓存），
+并为支持预压缩文件的静态服务器生成 .gz（以及安装了 brotli 时的 .br）副本
+
+压缩只做不改变页面效果的保守处理：合并空白、去掉注释，不改写标识符。
+"""
+
+import gzip
+import hashlib
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, TextIO
+
+try:
+    import brotli
+except ImportError:  # brotli 为可选依赖
+    brotli = None
+
+try:
+    from .storage import write_text_if_changed
+except ImportError:
+    from storage import write_text_if_changed
+
+# 预压缩的文件类型
+COMPRESSIBLE_SUFFIXES = ('.html', '.css', '.js', '.json')
+
+_HTML_BREAK_RE = re.compile(r'[ \t]*\n\s*')
+# CSS 中的注释和字符串（字符串原样保留，只压缩它们之间的部分）
+_CSS_TOKEN_RE = re.compile(r'/\*.*?\*/|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'', re.S)
+_CSS_SPACE_RE = re.compile(r'\s+')
+_CSS_PUNCT_RE = re.compile(r'\s*([{};,>])\s*')
+_CSS_COLON_RE = re.compile(r':\s+')
+# 声明中属性名与冒号之间的空格（color :red）；冒号之后直到 ; 或 } 都没有 { 时才是声明，
+# 选择器中的空格有含义（a :hover 与 a:hover 不同），保持不变
+_CSS_DECL_COLON_RE = re.compile(r'([{;][-\w]+) :(?=[^{};]*(?:[;}]|$))')
+_JS_WORD_RE = re.compile(r'[A-Za-z0-9_$]+')
+# 这些符号和关键字之后的 / 是正则表达式字面量的开始，其余情况（标识符、字面量、) 和 ] 之后）是除号
+_JS_REGEX_AFTER = set('(,=:[!&|?{};+-*%<>~^')
+_JS_REGEX_KEYWORDS = {'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+                      'throw', 'case', 'do', 'else', 'yield', 'await'}
+
+
+def minify_html(html: str) -> str:
+    """包含换行的空白合并为一个换行（不在 <pre>/<textarea> 中时与原页面显示一致）"""
+    return _HTML_BREAK_RE.sub('\n', html)
+
+
+def minify_css(css: str) -> str:
+    """去掉注释和多余空白；引号中的内容（content: "..."、url("...")）保持不变"""
+    strings: List[str] = []
+
+    def protect(match):
+        token = match.group()
+        if token.startswith('/*'):
+            return ''
+        strings.append(token)
+        return f'\0{len(strings) - 1}\0'
+
+    css = _CSS_TOKEN_RE.sub(protect, css)
+    css = _CSS_SPACE_RE.sub(' ', css)
+    css = _CSS_PUNCT_RE.sub(r'\1', css)
+    css = _CSS_COLON_RE.sub(':', css)
+    css = _CSS_DECL_COLON_RE.sub(r'\1:', css)
+    css = css.replace(';}', '}').strip()
+    return re.sub(r'\0(\d+)\0', lambda m: strings[int(m.group(1))], css)
+
+
+def _skip_quoted(js: str, i: int, quote: str) -> int:
+    """i 为开头引号之后的位置，返回结束引号之后的位置"""
+    n = len(js)
+    while i < n:
+        c = js[i]
+        if c == '\\':
+            i += 2
+        elif c == quote or (c == '\n' and quote != '`'):
+            return i + 1
+        elif quote == '`' and js.startswith('${', i):
+            return i
+        else:
+            i += 1
+    return n
+
+
+def _skip_regex(js: str, i: int) -> int:
+    """i 为开头 / 之后的位置，返回结束 / 之后的位置（标志由调用方按标识符处理）"""
+    n, in_class = len(js), False
+    while i < n:
+        c = js[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '\n':
+            return i
+        if in_class:
+            in_class = c != ']'
+        elif c == '[':
+            in_class = True
+        elif c == '/':
+            return i + 1
+        i += 1
+    return n
+
+
+def minify_js(js: str) -> str:
+    """去掉注释、缩进和空行，保留换行（不依赖自动分号插入规则的变化），不改写标识符
+
+    逐字符扫描并识别字符串、模板字符串和正则表达式字面量，其中的 //、/* 和空白保持不变。
+    """
+    out: List[str] = []
+    n, i = len(js), 0
+    prev = ''            # 上一个有效记号，用来判断 / 是除号还是正则表达式
+    line_start = True
+    space = False        # 代码之间待输出的空白
+    templates: List[int] = []  # 模板字符串中 ${ 所在的花括号深度
+    depth = 0
+
+    def emit(text: str):
+        nonlocal line_start, space
+        if space and not line_start:
+            out.append(' ')
+        out.append(text)
+        line_start = space = False
+
+    def newline():
+        nonlocal line_start, space
+        if out and not line_start:
+            out.append('\n')
+        line_start, space = True, False
+
+    while i < n:
+        c = js[i]
+        if c == '\n':
+            newline()
+            i += 1
+        elif c in ' \t\r':
+            space = True
+            i += 1
+        elif js.startswith('//', i):
+            end = js.find('\n', i)
+            i = n if end < 0 else end
+        elif js.startswith('/*', i):
+            end = js.find('*/', i + 2)
+            end = n if end < 0 else end + 2
+            if '\n' in js[i:end]:
+                newline()
+            else:
+                space = True
+            i = end
+        elif c in '"\'`' or (c == '}' and templates and templates[-1] == depth):
+            if c == '}':
+                templates.pop()
+            start, i = i, _skip_quoted(js, i + 1, '`' if c == '}' else c)
+            if js.startswith('${', i):
+                templates.append(depth)
+                i += 2
+                prev = '{'
+            else:
+                prev = '"'
+            emit(js[start:i])
+        elif c == '/' and (prev in _JS_REGEX_AFTER or prev in _JS_REGEX_KEYWORDS):
+            start, i = i, _skip_regex(js, i + 1)
+            emit(js[start:i])
+            prev = '"'
+        else:
+            match = _JS_WORD_RE.match(js, i)
+            token = match.group() if match else c
+            if c == '{':
+                depth += 1
+            elif c == '}':
+                depth -= 1
+            emit(token)
+            prev = token
+            i += len(token)
+    return ''.join(out).strip() + '\n'
+
+
+class MinifyingWriter:
+    """按块写入时压缩 HTML
+
+    块末尾的空白先保留，与下一块开头的空白合并后再处理，
+    因此无论页面被切分成怎样的块，输出都完全相同。
+    """
+
+    def __init__(self, f: TextIO):
+        self._f = f
+        self._pending = ''
+
+    def write(self, chunk: str):
+        text = self._pending + chunk
+        stripped = text.rstrip()
+        self._pending = text[len(stripped):]
+        if stripped:
+            self._f.write(minify_html(stripped))
+
+    def writelines(self, chunks: Iterable[str]):
+        for chunk in chunks:
+            self.write(chunk)
+
+    def close(self):
+        self._f.write(minify_html(self._pending))
+        self._pending = ''
+
+
+def write_asset(path: Path, content: str, minify=None, fingerprint: bool = True) -> str:
+    """写出实际被页面引用的资源文件，返回文件名
+
+    fingerprint=True 时文件名为 <名称>.<内容哈希><扩展名>，否则为 <名称>.min<扩展名>；
+    minify 为压缩函数（None 表示不压缩）。旧版本按 prune_assets 的规则清理。
+    """
+    if minify is not None:
+        content = minify(content)
+    if fingerprint:
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:10]
+        target = path.with_name(f"{path.stem}.{digest}{path.suffix}")
+    else:
+        target = path.with_name(f"{path.stem}.min{path.suffix}")
+    write_text_if_changed(target, content)
+    prune_assets(path, target)
+    return target.name
+
+
+def prune_assets(path: Path, current: Path) -> List[Path]:
+    """删除 path 生成的过期资源（<名称>.min<扩展名> 和 <名称>.<内容哈希><扩展名>），返回删除的文件
+
+    除页面当前引用的 current 外，只保留最近的一个旧版本（浏览器或 CDN 缓存的旧页面仍然引用它），
+    在带哈希、.min 和原文件名之间切换配置时同样适用。
+    """
+    if not path.parent.exists():
+        return []
+    pattern = re.compile(re.escape(path.stem) + r'\.(?:min|[0-9a-f]{10})' + re.escape(path.suffix))
+    previous = sorted((p for p in path.parent.iterdir() if p.name != current.name and pattern.fullmatch(p.name)),
+                      key=lambda p: p.stat().st_mtime_ns, reverse=True)
+    for old in previous[1:]:
+        old.unlink()
+    return previous[1:]
+
+
+def precompress(output_dir, use_brotli: bool = True, min_size: int = 256) -> Dict[str, int]:
+    """为输出目录中的文本文件生成 .gz / .br 副本
+
+    副本比源文件新时跳过（增量构建中没有重写的文件不会重新压缩）；源文件已删除的副本一并删除。
+    gzip 头中的时间戳固定为 0，内容不变时压缩结果也不变。
+    """
+    output_dir = Path(output_dir)
+    use_brotli = use_brotli and brotli is not None
+    stats = {'compressed': 0, 'skipped': 0, 'removed': 0}
+    suffixes = ['.gz', '.br'] if use_brotli else ['.gz']
+    for root, _, files in os.walk(output_dir):
+        names = set(files)
+        for name in files:
+            path = Path(root) / name
+            if name.endswith(('.gz', '.br')):
+                if name[:-3] not in names:
+                    path.unlink()
+                    stats['removed'] += 1
+                continue
+            if not name.endswith(COMPRESSIBLE_SUFFIXES) or name.startswith('.'):
+                continue
+            source_stat = path.stat()
+            if source_stat.st_size < min_size:
+                continue
+            data = None
+            for suffix in suffixes:
+                target = path.with_name(name + suffix)
+                if target.exists() and target.stat().st_mtime_ns >= source_stat.st_mtime_ns:
+                    stats['skipped'] += 1
+                    continue
+                if data is None:
+                    data = path.read_bytes()
+                if suffix == '.gz':
+                    compressed = gzip.compress(data, compresslevel=9, mtime=0)
+                else:
+                    compressed = brotli.compress(data, quality=11)
+                target.write_bytes(compressed)
+                stats['compressed'] += 1
+    return stats
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+增量构建清单
+记录每个输出文件（页面、搜索索引、列表数据）是由哪些输入生成的（输入的哈希），
+再次生成网站时只重新渲染输入发生变化或文件缺失的输出
+"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+try:
+    from .storage import write_text_if_changed
+    from .paper import Paper
+except ImportError:
+    from storage import write_text_if_changed
+    from paper import Paper
+
+logger = logging.getLogger(__name__)
+
+# 旧版本保存在输出目录中的清单（会随网站一起发布），读取后删除
+LEGACY_MANIFEST_NAME = ".build-manifest.json"
+BUILD_MANIFEST_VERSION = 1
+
+
+def default_manifest_path(output_dir) -> Path:
+    """输出目录旁边的 .cache/build-manifest-<目录名>.json（docs -> .cache/build-manifest-docs.json）"""
+    output_dir = Path(output_dir)
+    return output_dir.parent / ".cache" / f"build-manifest-{output_dir.name}.json"
+
+
+def record_hash(paper: Dict) -> str:
+    """整条论文记录的哈希（任何字段变化都会改变）"""
+    record = paper.to_dict() if isinstance(paper, Paper) else paper
+    data = json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()[:20]
+
+
+def inputs_hash(*parts: Iterable[str]) -> str:
+    """把若干组字符串（生成代码的哈希、论文哈希等）合成一个哈希"""
+    h = hashlib.sha1()
+    for part in parts:
+        for item in ([part] if isinstance(part, str) else part):
+            h.update(item.encode('utf-8'))
+            h.update(b'\0')
+        h.update(b'\1')
+    return h.hexdigest()[:20]
+
+
+def source_hash(*paths) -> str:
+    """若干源文件内容的哈希；生成输出的代码（模板字符串、卡片结构、数据格式）有任何改动都会改变"""
+    h = hashlib.sha1()
+    for path in paths:
+        h.update(Path(path).read_bytes())
+        h.update(b'\0')
+    return h.hexdigest()[:20]
+
+
+class BuildManifest:
+    """输出文件（相对于输出目录的路径）-> [输入哈希, 文件大小(, 附加信息)]
+
+    保存在输出目录之外（默认见 default_manifest_path），不会随网站发布；
+    清单与输出目录分开保存或恢复时，文件缺失或大小与记录不一致（例如被手动修改）的输出视为需要重新生成。
+    """
+
+    def __init__(self, output_dir, enabled: bool = True, path=None):
+        self.output_dir = Path(output_dir)
+        self.path = Path(path) if path else default_manifest_path(self.output_dir)
+        self.legacy_path = self.output_dir / LEGACY_MANIFEST_NAME
+        self.enabled = enabled
+        self._entries: Dict[str, list] = {}
+        self.skipped = 0
+        self.rebuilt = 0
+        if enabled:
+            self.load()
+
+    def load(self):
+        path = self.path if self.path.exists() else self.legacy_path
+        if not path.exists():
+            return
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"构建清单无法读取，将完整生成: {e}")
+            return
+        if data.get('version') == BUILD_MANIFEST_VERSION:
+            self._entries = data.get('outputs', {})
+
+    def is_fresh(self, name: str, input_hash: str) -> bool:
+        """输出文件存在且由相同的输入生成"""
+        entry = self._entries.get(name) if self.enabled else None
+        fresh = False
+        if entry is not None and entry[0] == input_hash:
+            path = self.output_dir / name
+            fresh = path.exists() and path.stat().st_size == entry[1]
+        if fresh:
+            self.skipped += 1
+        else:
+            self.rebuilt += 1
+        return fresh
+
+    def get(self, name: str) -> Optional[list]:
+        """输出文件存在时返回其记录，用于判断能否在已有输出上增量更新"""
+        entry = self._entries.get(name) if self.enabled else None
+        if entry is None or not (self.output_dir / name).exists():
+            return None
+        return entry
+
+    def record(self, name: str, input_hash: str, *extra):
+        """输出文件已按 input_hash 生成；extra 为需要一起保存的附加信息（例如已索引的论文数）"""
+        self._entries[name] = [input_hash, (self.output_dir / name).stat().st_size, *extra]
+
+    def prune(self, names: Optional[Iterable[str]] = None, prefix: str = ''):
+        """删除以 prefix 开头、不在 names 中的条目（对应的输出已不再生成）"""
+        keep = set(names or ())
+        for name in [n for n in self._entries if n.startswith(prefix) and n not in keep]:
+            del self._entries[name]
+
+    def save(self):
+        data = {
+            'version': BUILD_MANIFEST_VERSION,
+            'outputs': dict(sorted(self._entries.items())),
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_text_if_changed(self.path, json.dumps(data, separators=(',', ':')))
+        self.legacy_path.unlink(missing_ok=True)
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+论文富化缓存
+按论文内容哈希缓存会议提取和分类结果，内容和相关配置都没有变化的论文不再重复计算
+"""
+
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 提取/分类算法本身发生变化时递增，使旧缓存全部失效
+ENRICHMENT_VERSION = 1
+
+# 日志行数超过快照条目数（且不少于该值）时重写快照
+MIN_COMPACT_LINES = 1000
+
+
+def content_hash(paper: Dict) -> str:
+    """论文中影响富化结果的内容（标题、摘要、comment）的哈希"""
+    content = '\0'.join((paper.get('title') or '', paper.get('abstract') or '', paper.get('comment') or ''))
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()[:20]
+
+
+def config_fingerprint(*sections) -> str:
+    """配置片段的指纹"""
+    data = json.dumps([ENRICHMENT_VERSION, *sections], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()[:12]
+
+
+class EnrichmentCache:
+    """有容量上限的 LRU 富化缓存
+
+    每个条目记录会议和标签，以及计算它们时所用配置的指纹：
+    venues 配置变化只会让会议重新提取，categories/classification 配置变化只会让标签重新计算。
+
+    磁盘上分为快照（path）和追加日志（path + '.log'）：保存时只把本次访问过的条目追加到日志，
+    日志比快照还长时才重写快照并清空日志，每次运行的写入量与访问的论文数成正比，而不是与缓存大小成正比。
+    """
+
+    def __init__(self, path: Optional[str], venue_fingerprint: str, tags_fingerprint: str,
+                 max_entries: int = 200000):
+        self.path = Path(path) if path else None
+        self.journal_path = self.path.with_name(self.path.name + '.log') if self.path else None
+        self.venue_fingerprint = venue_fingerprint
+        self.tags_fingerprint = tags_fingerprint
+        self.max_entries = max_entries
+        # 内容哈希 -> [会议, 会议指纹, 标签, 标签指纹]
+        self._entries: 'OrderedDict[str, list]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        # 上次保存后访问过的键，按访问顺序；保存时按此顺序追加到日志
+        self._touched: 'OrderedDict[str, None]' = OrderedDict()
+        self._journal_lines = 0
+        self._compact = True
+        self.load()
+
+    @classmethod
+    def from_config(cls, config: dict) -> Optional['EnrichmentCache']:
+        """按 config.yaml 的 enrichment_cache 配置创建；未启用时返回 None"""
+        options = config.get('enrichment_cache') or {}
+        if not options.get('enabled', False):
+            return None
+        return cls(
+            options.get('path', '.cache/enrichment.json'),
+            venue_fingerprint=config_fingerprint(config.get('venues')),
+            tags_fingerprint=config_fingerprint(config.get('categories'), config.get('classification')),
+            max_entries=options.get('max_entries', 200000),
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def load(self):
+        """读取快照，再按顺序重放日志；快照缺失、损坏或版本不符时整体丢弃，下次保存时重写"""
+        if not self.path or not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"富化缓存无法读取，将重新建立: {e}")
+            return
+        if data.get('version') != ENRICHMENT_VERSION:
+            return
+        # 文件中按从旧到新的访问顺序保存
+        for key, *entry in data.get('entries', []):
+            self._entries[key] = entry
+        self._compact = False
+        self._replay_journal()
+        if len(self._entries) > self.max_entries:
+            # 容量上限调小了：淘汰后重写快照，文件随之缩小
+            self._evict()
+            self._compact = True
+
+    def _replay_journal(self):
+        if not self.journal_path.exists():
+            return
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    key, *entry = json.loads(line)
+                except ValueError:
+                    # 上次写入中断留下的半行
+                    logger.warning("富化缓存日志中有无法解析的行，已跳过")
+                    continue
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                self._journal_lines += 1
+
+    def save(self):
+        """写回缓存（没有变化时跳过）：追加本次访问过的条目，日志过长时重写快照"""
+        if not self.path or not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        touched = [key for key in self._touched if key in self._entries]
+        if self._compact or self._journal_lines + len(touched) > max(len(self._entries), MIN_COMPACT_LINES):
+            self._write_snapshot()
+        else:
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                for key in touched:
+                    f.write(json.dumps([key, *self._entries[key]], ensure_ascii=False, separators=(',', ':')) + '\n')
+            self._journal_lines += len(touched)
+        self._touched.clear()
+        self._dirty = False
+        logger.info(f"富化缓存: {len(self._entries)} 条（命中 {self.hits}，重新计算 {self.misses}）")
+
+    def _write_snapshot(self):
+        data = {
+            'version': ENRICHMENT_VERSION,
+            'entries': [[key, *entry] for key, entry in self._entries.items()],
+        }
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+        # 快照已包含日志中的全部内容；在这之间中断时重放日志也只是重复写入相同的条目
+        if self.journal_path.exists():
+            self.journal_path.unlink()
+        self._journal_lines = 0
+        self._compact = False
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._dirty = True
+
+    def _touch(self, key: str):
+        self._touched[key] = None
+        self._touched.move_to_end(key)
+
+    def _entry(self, paper: Dict) -> list:
+        key = content_hash(paper)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = [None, None, None, None]
+            self._entries[key] = entry
+            self._evict()
+        else:
+            self._entries.move_to_end(key)
+        self._touch(key)
+        return entry
+
+    def _count(self, computed: bool):
+        if computed:
+            self.misses += 1
+            self._dirty = True
+        else:
+            self.hits += 1
+
+    def lookup(self, paper: Dict, tags: bool = True) -> Optional[Tuple[Optional[str], Optional[List[str]]]]:
+        """命中时返回 (会议, 标签)，否则返回 None；tags=False 时只要求会议是最新的"""
+        key = content_hash(paper)
+        entry = self._entries.get(key)
+        if entry is None or entry[1] != self.venue_fingerprint or (tags and entry[3] != self.tags_fingerprint):
+            return None
+        self._entries.move_to_end(key)
+        self._touch(key)
+        self.hits += 1
+        return entry[0], (list(entry[2]) if entry[3] == self.tags_fingerprint else None)
+
+    def store(self, paper: Dict, conference: Optional[str], tags: Optional[List[str]] = None):
+        """记录在别处（如子进程中）计算出的结果；tags 为 None 时只更新会议"""
+        entry = self._entry(paper)
+        entry[0], entry[1] = conference, self.venue_fingerprint
+        if tags is not None:
+            entry[2], entry[3] = list(tags), self.tags_fingerprint
+        self._count(True)
+
+    def conference(self, paper: Dict, extract_venue: Callable[[Optional[str]], Optional[str]]) -> Optional[str]:
+        """论文的会议/期刊信息；venues 配置和 comment 都没变时直接使用缓存"""
+        entry = self._entry(paper)
+        computed = entry[1] != self.venue_fingerprint
+        if computed:
+            entry[0] = extract_venue(paper.get('comment'))
+            entry[1] = self.venue_fingerprint
+        self._count(computed)
+        return entry[0]
+
+    def enrich(self, paper: Dict, extract_venue: Callable[[Optional[str]], Optional[str]],
+               classify: Callable[[Dict], List[str]]) -> bool:
+        """为论文填充 conference 和 tags，只重新计算指纹过期的部分；返回是否有重新计算"""
+        entry = self._entry(paper)
+        computed = False
+        if entry[1] != self.venue_fingerprint:
+            entry[0] = extract_venue(paper.get('comment'))
+            entry[1] = self.venue_fingerprint
+            computed = True
+        if entry[3] != self.tags_fingerprint:
+            entry[2] = classify(paper)
+            entry[3] = self.tags_fingerprint
+            computed = True
+        self._count(computed)
+
+        paper['conference'] = entry[0]
+        paper['tags'] = list(entry[2])
+        return computed
@@ -7,12 +7,32 @@
 import arxiv
 import json
 import yaml
-import re
+import threading
+import time
+import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 import logging
 
+try:
+    from .storage import open_store
+    from .sqlite_store import SqliteStore
+    from .venues import VenueMatcher
+    from .keywords import KeywordMatcher
+    from .enrichment import EnrichmentCache
+    from .paper import Paper, to_records
+    from .metrics import RunMetrics
+except ImportError:
+    from storage import open_store
+    from sqlite_store import SqliteStore
+    from venues import VenueMatcher
+    from keywords import KeywordMatcher
+    from enrichment import EnrichmentCache
+    from paper import Paper, to_records
+    from metrics import RunMetrics
+
 # 配置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -21,6 +41,64 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class RateLimiter:
+    """线程安全的全局限速器，保证任意两次请求之间至少间隔 interval 秒"""
+    
+    def __init__(self, interval: float):
+        self.interval = max(0.0, interval)
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+    
+    def wait(self):
+        """阻塞直到轮到当前请求"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class PaperCollector:
+    """按 ArXiv ID 即时合并各类别返回的论文（线程安全）
+    
+    同一篇论文在各类别的查询中返回的是同一个条目，记录只在首次见到时构建一次；
+    之后的命中只合并到已有记录中：venue 取配置中最靠前的命中类别，命中类别补进 categories。
+    输出顺序按 (最靠前的命中类别, 该类别内排名) 排列，因此结果与线程完成的先后无关。
+    """
+    
+    def __init__(self, categories: List[str]):
+        self._category_order = {category: i for i, category in enumerate(categories)}
+        self._lock = threading.Lock()
+        self._papers = {}
+        self._sort_keys = {}
+        self.duplicates = 0
+    
+    def add(self, paper_id: str, category: str, rank: int, make_paper) -> bool:
+        """登记一次命中；只在首次见到时调用 make_paper 构建记录，返回是否为新论文"""
+        key = (self._category_order[category], rank)
+        with self._lock:
+            paper = self._papers.get(paper_id)
+            if paper is None:
+                self._papers[paper_id] = make_paper()
+                self._sort_keys[paper_id] = key
+                return True
+            
+            self.duplicates += 1
+            if category not in paper['categories']:
+                paper['categories'] = list(paper['categories']) + [category]
+            if key < self._sort_keys[paper_id]:
+                # 配置中更靠前的类别后到达：以它作为 venue 和排序位置
+                paper['venue'] = category
+                self._sort_keys[paper_id] = key
+            return False
+    
+    def papers(self) -> List[Dict]:
+        """按确定的顺序返回去重后的论文"""
+        return sorted(self._papers.values(), key=lambda p: self._sort_keys[p['id']])
+
+
 class PaperFetcher:
     """论文抓取器"""
     
@@ -28,53 +106,42 @@ class PaperFetcher:
         """初始化"""
         self.config = self.load_config(config_path)
         self.papers = []
-        # Precompile regex patterns for better performance
-        self._compile_venue_patterns()
-        # Precompile category keywords for faster classification
-        self._compile_category_patterns()
+        # 跨运行保存的抓取状态（各类别近期论文数量等）
+        data_dir = self.config.get('output', {}).get('data_dir', 'data')
+        self.state_path = Path(data_dir) / "fetch_state.json"
+        self.fetch_state = self.load_fetch_state()
+        # 会议/期刊名称编译为单个正则，每条 comment 只扫描一次
+        self.venue_matcher = VenueMatcher.from_config(self.config)
+        # 所有领域的关键词编译为一个 Aho-Corasick 自动机
+        self.keyword_matcher = KeywordMatcher.from_config(self.config)
+        # 按内容哈希缓存富化结果（未启用时为 None）
+        self.enrichment_cache = EnrichmentCache.from_config(self.config)
+        # 各阶段耗时、API 延迟和重试次数（见 metrics.py）
+        self.metrics = RunMetrics.from_config(self.config, 'fetch')
         
     def load_config(self, config_path: str) -> dict:
         """加载配置文件"""
         with open(config_path, 'r', encoding='utf-8') as f:
             return yaml.safe_load(f)
     
-    def _compile_venue_patterns(self):
-        """预编译会议和期刊的正则表达式模式"""
-        # 常见会议列表
-        conferences = [
-            'CVPR', 'ICCV', 'ECCV', 'NeurIPS', 'ICML', 'ICLR', 
-            'ACL', 'EMNLP', 'NAACL', 'AAAI', 'IJCAI', 'KDD',
-            'ICRA', 'IROS', 'CoRL', 'RSS',
-            'SIGIR', 'WWW', 'WSDM', 'RecSys',
-            'SIGMOD', 'VLDB', 'ICDE',
-            'SIGGRAPH', 'ICASSP', 'INTERSPEECH'
-        ]
-        
-        # 常见期刊列表
-        journals = [
-            'Nature', 'Science', 'PAMI', 'TPAMI', 'JMLR', 'IJCV',
-            'IEEE', 'ACM', 'Transactions', 'Journal'
-        ]
-        
-        # 预编译会议模式（会议名 + 年份）
-        self._conference_patterns = []
-        for conf in conferences:
-            # 匹配 "CVPR 2025" 或 "Accepted to CVPR 2025" 等模式
-            pattern_with_year = re.compile(rf'\b{conf}\s*[:\']?\s*(\d{{4}})\b', re.IGNORECASE)
-            pattern_without_year = re.compile(rf'\b{conf}\b', re.IGNORECASE)
-            self._conference_patterns.append((conf, pattern_with_year, pattern_without_year))
-        
-        # 预编译期刊模式
-        self._journal_patterns = [(j, re.compile(rf'\b{j}\b', re.IGNORECASE)) for j in journals]
+    def load_fetch_state(self) -> dict:
+        """加载抓取状态"""
+        if not self.state_path.exists():
+            return {'categories': {}}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"抓取状态文件无法读取，将重新开始统计: {e}")
+            return {'categories': {}}
+        state.setdefault('categories', {})
+        return state
     
-    def _compile_category_patterns(self):
-        """预编译分类关键词的正则表达式"""
-        self._category_patterns = {}
-        categories = self.config.get('categories', {})
-        for category_name, category_info in categories.items():
-            keywords = category_info.get('keywords', [])
-            # 将关键词列表转换为小写并存储
-            self._category_patterns[category_name] = [kw.lower() for kw in keywords]
+    def save_fetch_state(self):
+        """保存抓取状态"""
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.state_path, 'w', encoding='utf-8') as f:
+            json.dump(self.fetch_state, f, ensure_ascii=False, indent=2, sort_keys=True)
     
     def fetch_arxiv_papers(self) -> List[Dict]:
         """从 ArXiv 抓取论文"""
@@ -85,30 +152,136 @@ class PaperFetcher:
             logger.info("ArXiv 数据源未启用")
             return []
         
-        papers = []
         categories = arxiv_config['categories']
-        max_results = arxiv_config['max_results']
         days_back = arxiv_config.get('days_back', 1)
+        concurrency = max(1, min(arxiv_config.get('concurrency', 1), len(categories) or 1))
+        # 所有类别共享同一个限速器，避免并发请求触发 ArXiv 的限流
+        limiter = RateLimiter(arxiv_config.get('rate_limit', 3.0))
         
-        # 计算时间范围（使用 UTC 时区）
+        # 计算时间范围（使用 UTC 时区）；增量模式下每个类别从自己的游标开始
         end_date = datetime.now(timezone.utc)
-        start_date = end_date - timedelta(days=days_back)
+        default_start = end_date - timedelta(days=days_back)
+        start_dates = {category: self._window_start(category, default_start) for category in categories}
         
-        for category in categories:
-            logger.info(f"抓取类别: {category}")
-            
-            try:
-                # 构建查询
-                search = arxiv.Search(
-                    query=f"cat:{category}",
-                    max_results=max_results,
-                    sort_by=arxiv.SortCriterion.SubmittedDate,
-                    sort_order=arxiv.SortOrder.Descending
-                )
+        # 交叉发布的论文在进入富化（会议提取、分类）之前就按 ID 合并
+        collector = PaperCollector(categories)
+        
+        def fetch(category):
+            with self.metrics.stage('fetch_category', category=category):
+                return self._fetch_category(category, start_dates[category], limiter, collector)
+        
+        # map 按类别配置顺序返回结果，保证并发模式下输出顺序确定
+        if concurrency > 1:
+            logger.info(f"并发抓取 {len(categories)} 个类别（并发数: {concurrency}）")
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                results = list(executor.map(fetch, categories))
+        else:
+            results = [fetch(category) for category in categories]
+        
+        for category, result in zip(categories, results):
+            if result is None:
+                continue
+            count, newest, complete = result
+            window_days = max((end_date - start_dates[category]).total_seconds() / 86400, 1 / 24)
+            self._update_category_rate(category, count / window_days)
+            if complete:
+                self._advance_cursor(category, newest)
+            else:
+                # 结果被 max_results 截断：保留旧游标，下次运行仍覆盖未抓到的部分
+                logger.warning(f"{category} 的结果达到 max_results 上限，本次不推进游标")
+        
+        papers = collector.papers()
+        with self.metrics.stage('enrich'):
+            for paper in papers:
+                self.enrich_paper(paper)
+        self.metrics.increment('papers_fetched', len(papers))
+        self.metrics.increment('cross_listed_duplicates', collector.duplicates)
+        
+        logger.info(f"ArXiv 总共抓取了 {len(papers)} 篇论文（合并了 {collector.duplicates} 条跨类别重复）")
+        return papers
+    
+    def _window_start(self, category: str, default_start: datetime) -> datetime:
+        """计算类别的抓取起始时间：增量模式下为游标减去重叠时间"""
+        arxiv_config = self.config['sources']['arxiv']
+        if not arxiv_config.get('incremental', False):
+            return default_start
+        cursor = self.fetch_state['categories'].get(category, {}).get('cursor')
+        if not cursor:
+            return default_start
+        # 重叠一段时间，以便抓到晚于游标才出现在 API 中的论文；
+        # 游标过旧（例如任务停运多日）时不超过 days_back 的窗口
+        overlap = timedelta(hours=arxiv_config.get('overlap_hours', 12))
+        return max(datetime.fromisoformat(cursor['updated']) - overlap, default_start)
+    
+    def _advance_cursor(self, category: str, newest):
+        """将类别游标推进到本次见到的最新论文 (updated, id)"""
+        if newest is None:
+            return
+        category_state = self.fetch_state['categories'].setdefault(category, {})
+        cursor = category_state.get('cursor')
+        if cursor and (datetime.fromisoformat(cursor['updated']), cursor['id']) >= newest:
+            return
+        category_state['cursor'] = {'updated': newest[0].isoformat(), 'id': newest[1]}
+    
+    def _update_category_rate(self, category: str, daily_count: float):
+        """用指数移动平均更新类别每天的论文数量估计"""
+        category_state = self.fetch_state['categories'].setdefault(category, {})
+        previous = category_state.get('daily_rate')
+        if previous is not None:
+            daily_count = 0.5 * daily_count + 0.5 * previous
+        category_state['daily_rate'] = round(daily_count, 2)
+    
+    def _initial_page_size(self, category: str, window_days: float, max_page_size: int) -> int:
+        """根据该类别近期每天的论文数量估计首页大小"""
+        arxiv_config = self.config['sources']['arxiv']
+        min_page_size = min(arxiv_config.get('min_page_size', 10), max_page_size)
+        daily_rate = self.fetch_state['categories'].get(category, {}).get('daily_rate')
+        if daily_rate is None:
+            return max_page_size
+        # 多留 25% 余量，尽量一页取完时间窗口内的论文
+        expected = int(daily_rate * window_days * 1.25) + 1
+        return max(min_page_size, min(expected, max_page_size))
+    
+    def _fetch_category(self, category: str, start_date: datetime, limiter: RateLimiter,
+                        collector: PaperCollector) -> Optional[Tuple[int, Optional[tuple], bool]]:
+        """抓取单个类别的论文（可在工作线程中运行），结果直接登记到 collector
+        
+        返回 (时间窗口内的论文数, 见到的最新 (updated, id), 是否完整覆盖时间窗口)，出错时返回 None
+        """
+        logger.info(f"抓取类别: {category}")
+        
+        arxiv_config = self.config['sources']['arxiv']
+        max_results = arxiv_config['max_results']
+        max_page_size = min(arxiv_config.get('page_size', 100), max_results)
+        min_page_size = min(arxiv_config.get('min_page_size', 10), max_page_size)
+        window_days = (datetime.now(timezone.utc) - start_date).total_seconds() / 86400
+        page_size = self._initial_page_size(category, window_days, max_page_size)
+        # 每个线程使用独立的 Client（Client 本身不是线程安全的），重试由 _fetch_page 负责；
+        # 请求间隔只由共享的 limiter 控制，Client 自身不再等待，否则每页要等两次
+        client = arxiv.Client(
+            page_size=max_page_size,
+            delay_seconds=0,
+            num_retries=0
+        )
+        # 可指向本地替身服务器（见 scripts/arxiv_stub_server.py）
+        api_url = arxiv_config.get('api_url')
+        if api_url:
+            client.query_url_format = api_url + '?{}'
+        
+        count = 0
+        newest = None
+        complete = False
+        offset = 0
+        try:
+            while offset < max_results:
+                request_size = min(page_size, max_results - offset)
+                results = self._fetch_page(client, category, offset, request_size, limiter)
+                if not results:
+                    complete = True
+                    break
                 
-                # 获取结果
-                count = 0
-                for result in search.results():
+                in_window = 0
+                for result in results:
                     # 检查发布时间（使用更新时间或发布时间）
                     paper_date = result.updated if result.updated else result.published
                     
@@ -116,112 +289,131 @@ class PaperFetcher:
                     if paper_date < start_date:
                         continue
                     
-                    paper = {
-                        'id': result.entry_id.split('/')[-1],
-                        'title': result.title,
-                        'authors': [author.name for author in result.authors],
-                        'abstract': result.summary,
-                        'published': result.published.strftime('%Y-%m-%d'),
-                        'updated': result.updated.strftime('%Y-%m-%d'),
-                        'categories': result.categories,
-                        'primary_category': result.primary_category,
-                        'pdf_url': result.pdf_url,
-                        'arxiv_url': result.entry_id,
-                        'source': 'ArXiv',
-                        'venue': category,
-                        'comment': result.comment if result.comment else None
-                    }
-                    
-                    # 提取会议/期刊信息
-                    paper['conference'] = self.extract_venue_from_comment(paper.get('comment'))
-                    
-                    # 分类论文
-                    paper['tags'] = self.classify_paper(paper)
-                    
-                    papers.append(paper)
+                    paper_id = result.entry_id.split('/')[-1]
+                    if newest is None or (paper_date, paper_id) > newest:
+                        newest = (paper_date, paper_id)
+                    collector.add(paper_id, category, count,
+                                  lambda: self._result_to_paper(result, category))
                     count += 1
+                    in_window += 1
                 
-                logger.info(f"从 {category} 抓取了 {count} 篇论文（时间范围：{start_date.strftime('%Y-%m-%d')} 至今）")
+                offset += len(results)
                 
-            except Exception as e:
-                logger.error(f"抓取 {category} 时出错: {e}")
-                continue
-        
-        logger.info(f"ArXiv 总共抓取了 {len(papers)} 篇论文")
-        return papers
-    
-    def extract_venue_from_comment(self, comment: str) -> str:
-        """从 comment 字段提取会议/期刊信息"""
-        if not comment:
+                # 结果按提交时间降序排列：整页都早于时间窗口时，后面的页不可能再有匹配
+                if in_window == 0:
+                    logger.info(f"{category} 第 {offset} 条之后均早于时间窗口，提前结束")
+                    complete = True
+                    break
+                
+                if len(results) < request_size:
+                    # 返回不足一页，说明已经没有更多结果
+                    complete = True
+                    break
+                
+                if in_window == len(results):
+                    # 整页都在时间窗口内，后面还有更多论文，扩大下一页
+                    page_size = min(page_size * 2, max_page_size)
+                else:
+                    # 已越过时间窗口边界，只用小页探测剩余的修订论文
+                    page_size = min_page_size
+                    complete = True
+            
+            logger.info(f"从 {category} 抓取了 {count} 篇论文（时间范围：{start_date.strftime('%Y-%m-%d')} 至今）")
+        except Exception as e:
+            logger.error(f"抓取 {category} 时出错: {e}")
             return None
         
-        comment = comment.strip()
-        
-        # 如果是 preprint，返回 None
-        if 'preprint' in comment.lower():
-            return None
+        return count, newest, complete
+    
+    def _fetch_page(self, client: arxiv.Client, category: str, offset: int,
+                    page_size: int, limiter: RateLimiter) -> List[arxiv.Result]:
+        """抓取一页结果，每次请求（包括重试）前都经过全局限速器"""
+        search = arxiv.Search(
+            query=f"cat:{category}",
+            max_results=offset + page_size,
+            sort_by=arxiv.SortCriterion.SubmittedDate,
+            sort_order=arxiv.SortOrder.Descending
+        )
+        client.page_size = page_size
+        num_retries = self.config['sources']['arxiv'].get('num_retries', 3)
         
-        # 使用预编译的会议模式进行匹配
-        for conf, pattern_with_year, pattern_without_year in self._conference_patterns:
-            match = pattern_with_year.search(comment)
-            if match:
-                year = match.group(1)
-                return f"{conf} {year}"
-            
-            # 匹配只有会议名的情况
-            if pattern_without_year.search(comment):
-                return conf
+        for attempt in range(num_retries + 1):
+            limiter.wait()
+            start = time.perf_counter()
+            try:
+                results = list(client.results(search, offset=offset))
+                self.metrics.observe('api_request_seconds', time.perf_counter() - start, category=category)
+                return results
+            except (arxiv.HTTPError, arxiv.UnexpectedEmptyPageError,
+                    requests.exceptions.ConnectionError) as e:
+                self.metrics.observe('api_request_seconds', time.perf_counter() - start, category=category)
+                self.metrics.increment('api_errors', category=category)
+                if attempt >= num_retries:
+                    raise
+                self.metrics.increment('api_retries', category=category)
+                logger.warning(f"请求 {category} (offset={offset}) 失败，重试 {attempt + 1}/{num_retries}: {e}")
+        return []
+    
+    def _result_to_paper(self, result: arxiv.Result, category: str) -> Paper:
+        """将 ArXiv 结果转换为论文记录"""
+        return Paper(
+            id=result.entry_id.split('/')[-1],
+            title=result.title,
+            authors=[author.name for author in result.authors],
+            abstract=result.summary,
+            published=result.published.strftime('%Y-%m-%d'),
+            updated=result.updated.strftime('%Y-%m-%d'),
+            categories=result.categories,
+            primary_category=result.primary_category,
+            pdf_url=result.pdf_url,
+            arxiv_url=result.entry_id,
+            source='ArXiv',
+            venue=category,
+            comment=result.comment if result.comment else None
+        )
+    
+    def enrich_paper(self, paper: Dict):
+        """提取会议/期刊信息并分类；启用缓存时只重新计算内容或配置发生变化的部分"""
+        if self.enrichment_cache is not None:
+            self.enrichment_cache.enrich(paper, self.extract_venue_from_comment, self.classify_paper)
+            return
         
-        # 使用预编译的期刊模式进行匹配
-        for journal, pattern in self._journal_patterns:
-            if pattern.search(comment):
-                # 尝试提取完整的期刊名称（取前50个字符）
-                return comment[:50] if len(comment) > 50 else comment
+        # 提取会议/期刊信息
+        paper['conference'] = self.extract_venue_from_comment(paper.get('comment'))
         
-        return None
+        # 分类论文
+        paper['tags'] = self.classify_paper(paper)
+    
+    def extract_venue_from_comment(self, comment: str) -> str:
+        """从 comment 字段提取会议/期刊信息"""
+        return self.venue_matcher.match(comment)
     
     def classify_paper(self, paper: Dict) -> List[str]:
-        """根据关键词分类论文"""
-        tags = set()
-        # Cache the lowercase text to avoid repeated operations
-        text = f"{paper['title']} {paper['abstract']}".lower()
-        
-        # Use precompiled category patterns
-        for category_name, keywords in self._category_patterns.items():
-            # Early exit once a match is found for this category
-            for keyword in keywords:
-                if keyword in text:
-                    tags.add(category_name)
-                    break  # Move to next category once match found
-        
-        return list(tags)
+        """根据关键词分类论文（一次扫描标题和摘要，按配置顺序返回命中的领域）"""
+        return self.keyword_matcher.classify(f"{paper['title']} {paper['abstract']}")
     
-    def save_papers(self, papers: List[Dict], output_path: str = "data/papers.json"):
-        """保存论文数据"""
+    def save_papers(self, papers: List[Paper], output_path: str = "data/papers"):
+        """保存论文数据（output_path 为分片目录；以 .json 结尾时使用旧的单文件格式，以 .sqlite 结尾时使用 SQLite）"""
         output_file = Path(output_path)
         output_file.parent.mkdir(parents=True, exist_ok=True)
         
-        # 加载已有数据
-        existing_papers = []
-        if output_file.exists():
-            with open(output_file, 'r', encoding='utf-8') as f:
-                existing_papers = json.load(f)
-        
-        # 去重（根据论文ID）
-        existing_ids = {p['id'] for p in existing_papers}
-        new_papers = [p for p in papers if p['id'] not in existing_ids]
-        
-        # 合并数据
-        all_papers = new_papers + existing_papers
-        
-        # 按日期排序
-        all_papers.sort(key=lambda x: x['published'], reverse=True)
-        
-        # 保存
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(all_papers, f, ensure_ascii=False, indent=2)
-        
-        logger.info(f"保存了 {len(new_papers)} 篇新论文，总共 {len(all_papers)} 篇")
+        # 默认所有存储的语义相同：按 ID 去重后合并，已有论文保持不变
+        # （分片存储只重写新论文所在的分片，SQLite 在一个事务中插入新论文）；
+        # output.update_existing 开启时，SQLite 存储改为批量 upsert，重新抓取到的已有论文按新记录更新
+        store = open_store(output_path)
+        update_existing = self.config.get('output', {}).get('update_existing', False)
+        if update_existing and isinstance(store, SqliteStore):
+            new_count, updated = store.upsert(to_records(papers))
+            total = store.count()
+            self.metrics.increment('papers_updated', updated)
+            logger.info(f"保存了 {new_count} 篇新论文，更新了 {updated} 篇已有论文，总共 {total} 篇")
+        else:
+            if update_existing:
+                logger.warning("output.update_existing 只支持 SQLite 存储，已有论文保持不变")
+            new_papers, total = store.merge(to_records(papers))
+            new_count = len(new_papers)
+            logger.info(f"保存了 {new_count} 篇新论文，总共 {total} 篇")
+        self.metrics.increment('papers_saved', new_count)
         
         # 同时保存今日论文
         today = datetime.now().strftime('%Y-%m-%d')
@@ -229,7 +421,7 @@ class PaperFetcher:
         if today_papers:
             today_file = output_file.parent / f"papers_{today}.json"
             with open(today_file, 'w', encoding='utf-8') as f:
-                json.dump(today_papers, f, ensure_ascii=False, indent=2)
+                json.dump(list(to_records(today_papers)), f, ensure_ascii=False, indent=2)
             logger.info(f"今日论文保存到: {today_file}")
     
     def run(self):
@@ -238,18 +430,29 @@ class PaperFetcher:
         logger.info("开始抓取论文")
         logger.info("=" * 60)
         
-        # 从各个数据源抓取
-        arxiv_papers = self.fetch_arxiv_papers()
+        # 失败的运行同样写出指标报告（已完成阶段的耗时和失败前的计数）
+        try:
+            # 从各个数据源抓取
+            with self.metrics.stage('fetch'):
+                arxiv_papers = self.fetch_arxiv_papers()
         
-        # 合并所有论文
-        all_papers = arxiv_papers
+            # 合并所有论文
+            all_papers = arxiv_papers
         
-        # 保存数据
-        if all_papers:
-            self.save_papers(all_papers)
-            logger.info(f"抓取完成！共获取 {len(all_papers)} 篇论文")
-        else:
-            logger.warning("未抓取到任何论文")
+            # 保存数据
+            if all_papers:
+                with self.metrics.stage('save'):
+                    self.save_papers(all_papers, self.config.get('output', {}).get('papers_path', 'data/papers'))
+                logger.info(f"抓取完成！共获取 {len(all_papers)} 篇论文")
+            else:
+                logger.warning("未抓取到任何论文")
+        
+            with self.metrics.stage('save_state'):
+                self.save_fetch_state()
+                if self.enrichment_cache is not None:
+                    self.enrichment_cache.save()
+        finally:
+            self.metrics.save()
         
         logger.info("=" * 60)
 
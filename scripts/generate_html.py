@@ -4,12 +4,36 @@
 将论文数据生成为 HTML 页面
 """
 
+import argparse
+import inspect
 import json
+import math
+import os
+from collections import deque
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict
+from typing import Iterator, List, Dict, Optional
 import logging
 
+import yaml
+
+try:
+    from .storage import open_store, write_text_if_changed
+    from .paper import StoredPapers, from_records, iter_slices
+    from .search_index import SearchIndexBuilder
+    from .build_manifest import BuildManifest, inputs_hash, record_hash, source_hash
+    from .assets import MinifyingWriter, minify_css, minify_js, precompress, prune_assets, write_asset
+    from .metrics import RunMetrics
+except ImportError:
+    from storage import open_store, write_text_if_changed
+    from paper import StoredPapers, from_records, iter_slices
+    from search_index import SearchIndexBuilder
+    from build_manifest import BuildManifest, inputs_hash, record_hash, source_hash
+    from assets import MinifyingWriter, minify_css, minify_js, precompress, prune_assets, write_asset
+    from metrics import RunMetrics
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -17,42 +41,314 @@ logger = logging.getLogger(__name__)
 class HTMLGenerator:
     """HTML 生成器"""
     
-    def __init__(self, data_path: str = "data/papers.json", 
-                 output_dir: str = "docs"):
+    # virtual 模式下每个摘要文件包含的论文数
+    ABSTRACT_CHUNK_SIZE = 1000
+    # 生成代码的哈希：本文件中的页面模板、卡片结构和列表数据格式，以及搜索索引和压缩的实现；
+    # 任何改动都会使增量构建清单中的记录全部失效，不依赖手动维护的版本号
+    TEMPLATE_HASH = source_hash(__file__, inspect.getfile(SearchIndexBuilder), inspect.getfile(write_asset))
+    
+    # 写入页面文件时的缓冲区大小
+    WRITE_BUFFER_SIZE = 1 << 16
+    # 单页论文很多时，每个渲染任务包含的卡片数
+    CARD_CHUNK_SIZE = 1000
+    
+    # ArXiv 类别代码 -> 友好的名称
+    CATEGORY_NAMES = {
+        'cs.AI': 'Artificial Intelligence',
+        'cs.CV': 'Computer Vision',
+        'cs.CL': 'Computational Linguistics (NLP)',
+        'cs.LG': 'Machine Learning',
+        'cs.IR': 'Information Retrieval',
+        'cs.RO': 'Robotics',
+        'cs.NE': 'Neural and Evolutionary Computing',
+        'cs.CR': 'Cryptography and Security',
+        'cs.HC': 'Human-Computer Interaction',
+        'cs.MM': 'Multimedia',
+        'stat.ML': 'Machine Learning (Statistics)',
+    }
+    
+    def __init__(self, data_path: str = "data/papers", 
+                 output_dir: str = "docs", papers_per_page: int = 50,
+                 workers: Optional[int] = None, search_index: bool = True,
+                 render_mode: str = "static", incremental: bool = True,
+                 parallel_min_papers: int = 2000,
+                 minify: bool = False, fingerprint_assets: bool = False, precompress: bool = False,
+                 metrics: Optional[RunMetrics] = None):
         self.data_path = Path(data_path)
+        self.store = open_store(data_path)
         self.output_dir = Path(output_dir)
+        # 每篇论文记录的哈希（与 self.papers 一一对应），用于判断输出是否需要重新生成
+        self._paper_hashes = None
+        # 论文的统计（总数、已发表/预印本计数），首次使用时计算；self.papers 被重新赋值时一并清除
+        self._paper_stats = None
         self.papers = []
+        # 每页论文数（0 表示全部放在 index.html 中）
+        self.papers_per_page = papers_per_page
+        # 并行渲染的进程数（默认 CPU 核数，1 表示串行）；需要渲染的卡片少于 parallel_min_papers 时不启动进程池
+        self.workers = workers
+        self.parallel_min_papers = parallel_min_papers
+        # 是否生成客户端搜索索引（docs/search/）
+        self.search_index = search_index
+        # static: 服务端渲染全部卡片（按 papers_per_page 分页）
+        # virtual: 只输出紧凑的 JSON 数据（docs/list/），由 main.js 渲染可见范围内的卡片
+        if render_mode not in ("static", "virtual"):
+            raise ValueError(f"未知的 render_mode: {render_mode}")
+        self.render_mode = render_mode
+        # 增量构建：只重新生成输入发生变化的页面和数据文件（见 build_manifest.py）
+        self.incremental = incremental
+        self.manifest = None
+        # 所有页面共用的头部信息（统计数字、更新时间），在 generate_index_html 中计算一次
+        self._page_context = None
+        # 输出后处理（见 assets.py）：压缩 HTML/CSS/JS、CSS/JS 文件名带内容哈希、生成 .gz/.br 副本
+        self.minify = minify
+        self.fingerprint_assets = fingerprint_assets
+        self.precompress = precompress
+        # 页面引用的 CSS/JS 路径（相对于输出目录），由 generate_assets 更新
+        self.asset_paths = {'css': 'css/style.css', 'js': 'js/main.js'}
+        # 各阶段耗时（见 metrics.py）；默认只在内存中记录，不写报告
+        self.metrics = metrics or RunMetrics('generate')
         # Track CSS and JS content for change detection
         self._css_content = None
         self._js_content = None
         
+    @property
+    def papers(self) -> List[Dict]:
+        return self._papers
+    
+    @papers.setter
+    def papers(self, papers: List[Dict]):
+        # 由论文派生的哈希和统计随论文列表一起失效
+        self._papers = papers
+        self._paper_hashes = None
+        self._paper_stats = None
+    
     def load_papers(self):
-        """加载论文数据"""
-        if not self.data_path.exists():
+        """加载论文数据
+        
+        只遍历一遍存储，记下每篇论文的记录哈希和统计，论文本身不留在内存中：
+        self.papers 为 StoredPapers，渲染页面、生成列表数据和搜索索引时再按需从存储流式读取，
+        增量构建只需要读取最新的几页。
+        """
+        if not self.store.exists():
             logger.warning(f"数据文件不存在: {self.data_path}")
             return
         
-        with open(self.data_path, 'r', encoding='utf-8') as f:
-            self.papers = json.load(f)
+        # 直接对存储中的记录计算哈希，不构建 Paper（记录由 to_records 写出，字段顺序与 Paper.to_dict 相同）
+        hashes, published = [], 0
+        for record in self.store.iter_papers():
+            hashes.append(record_hash(record))
+            if record.get('conference'):
+                published += 1
+        self.papers = StoredPapers(self.store, len(hashes))
+        self._paper_hashes = hashes
+        self._paper_stats = {'total': len(hashes), 'published': published, 'preprint': len(hashes) - published}
         
         logger.info(f"加载了 {len(self.papers)} 篇论文")
     
+    def __getstate__(self):
+        # 交给子进程渲染页面时只需要当前页的论文，不携带全部论文
+        state = self.__dict__.copy()
+        state['_papers'] = []
+        state['manifest'] = None
+        state['_paper_hashes'] = None
+        state['_paper_stats'] = None
+        # 子进程中不再嵌套进程池
+        state['workers'] = 1
+        return state
+    
+    @staticmethod
+    def page_filename(page: int) -> str:
+        """页面文件名：0 为主页，归档页 page-N.html 从最旧的论文开始编号"""
+        return "index.html" if page == 0 else f"page-{page}.html"
+    
+    def page_count(self) -> int:
+        """页数（含主页）；主页放最新的 papers_per_page ~ 2*papers_per_page-1 篇，其余每页 papers_per_page 篇"""
+        if self.render_mode == "virtual" or not self.papers_per_page or self.papers_per_page <= 0:
+            return 1
+        return max(1, len(self.papers) // self.papers_per_page)
+    
+    def page_ranges(self) -> List[tuple]:
+        """(页号, 起始下标, 结束下标)，下标为 self.papers（从新到旧）中的位置
+        
+        归档页从最旧的论文开始切分，新增论文只会进入主页，已有归档页的内容保持不变
+        （主页满 2*papers_per_page 篇时才会分出新的一页），增量构建只需重写少数几页。
+        """
+        total = len(self.papers)
+        total_pages = self.page_count()
+        if total_pages == 1:
+            return [(0, 0, total)]
+        per_page = self.papers_per_page
+        ranges = [(0, 0, total - per_page * (total_pages - 1))]
+        for page in range(total_pages - 1, 0, -1):
+            ranges.append((page, total - per_page * page, total - per_page * (page - 1)))
+        return ranges
+    
+    def generate_pagination_html(self, page: int, total_pages: int) -> str:
+        """生成较新/较旧和页码导航：主页之后按从新到旧列出归档页（页码较多时只显示当前页附近）"""
+        if total_pages <= 1:
+            return ''
+        archives = total_pages - 1
+        
+        parts = ['<nav class="pagination">']
+        if page > 0:
+            newer = page + 1 if page < archives else 0
+            parts.append(f'<a class="page-link page-prev" href="{self.page_filename(newer)}">« 较新</a>')
+        else:
+            parts.append('<span class="page-link page-prev disabled">« 较新</span>')
+        
+        current = page or archives + 1
+        shown = [0] + sorted({1, *range(max(1, current - 2), min(archives, current + 2) + 1)}, reverse=True)
+        previous = archives + 1
+        for number in shown:
+            if number and previous - number > 1:
+                parts.append('<span class="page-ellipsis">…</span>')
+            label = number or '最新'
+            if number == page:
+                parts.append(f'<span class="page-link current">{label}</span>')
+            else:
+                parts.append(f'<a class="page-link" href="{self.page_filename(number)}">{label}</a>')
+            previous = number or archives + 1
+        
+        older = page - 1 if page else archives
+        if older > 0:
+            parts.append(f'<a class="page-link page-next" href="{self.page_filename(older)}">较旧 »</a>')
+        else:
+            parts.append('<span class="page-link page-next disabled">较旧 »</span>')
+        parts.append('</nav>')
+        return ''.join(parts)
+    
+    def paper_hashes(self) -> List[str]:
+        if self._paper_hashes is None or len(self._paper_hashes) != len(self.papers):
+            self._paper_hashes = [record_hash(paper) for paper in self.papers]
+        return self._paper_hashes
+    
+    def paper_stats(self) -> Dict[str, int]:
+        """self.papers 的总数和已发表/预印本计数；重新赋值 self.papers 时清除，原地追加论文时按长度变化重新统计"""
+        if self._paper_stats is None or self._paper_stats['total'] != len(self.papers):
+            published = sum(1 for paper in self.papers if paper.get('conference'))
+            self._paper_stats = {'total': len(self.papers), 'published': published,
+                                 'preprint': len(self.papers) - published}
+        return self._paper_stats
+    
+    def _page_inputs_hash(self, page: int, start: int, end: int, total_pages: int) -> str:
+        """决定页面内容的全部输入（统计数字和更新时间除外，见 generate_site_data）"""
+        return inputs_hash(
+            (self.TEMPLATE_HASH, self.render_mode, str(page), str(len(self.papers) - end),
+             str(self.papers_per_page if total_pages > 1 else 0), str(self.minify),
+             self.asset_paths['css'], self.asset_paths['js']),
+            self.generate_pagination_html(page, total_pages),
+            self.paper_hashes()[start:end] if self.render_mode == "static" else (),
+        )
+    
+    def _build_page_context(self) -> Dict:
+        stats = self.paper_stats()
+        total_pages = self.page_count()
+        return {
+            'per_page': self.papers_per_page if total_pages > 1 else len(self.papers),
+            'total': stats['total'],
+            'published': stats['published'],
+            'preprint': stats['preprint'],
+            'update_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        }
+    
     def generate_index_html(self):
-        """生成主页 HTML"""
-        html = f"""<!DOCTYPE html>
+        """生成主页和分页页面（第 2 页起为 page-N.html），页数较多时并行渲染"""
+        self._page_context = self._build_page_context()
+        total_pages = self.page_count()
+        manifest = self.manifest or BuildManifest(self.output_dir, enabled=False)
+        
+        # 只渲染输入发生变化（或文件缺失）的页面
+        outdated, hashes = [], {}
+        for page, start, end in self.page_ranges():
+            name = self.page_filename(page)
+            hashes[name] = self._page_inputs_hash(page, start, end, total_pages)
+            if not manifest.is_fresh(name, hashes[name]):
+                outdated.append((page, start, end))
+        
+        # 页面按从新到旧的顺序排列，各页的论文从存储中一遍读出，读完最后一个需要重新生成的页面即停止；
+        # virtual 模式下主页只包含页面框架，论文由 main.js 从 list/papers.json 渲染
+        if self.render_mode == "static":
+            page_papers = iter_slices(self.papers, [(start, end) for _, start, end in outdated])
+            card_count = sum(end - start for _, start, end in outdated)
+        else:
+            page_papers = ([] for _ in outdated)
+            card_count = 0
+        pages = ((papers, page, total_pages) for (page, _, _), papers in zip(outdated, page_papers))
+        
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        workers = self._parallel_workers(card_count)
+        if len(outdated) > 1 and workers > 1:
+            # 连续的若干页作为一个任务，减少进程间传递的次数；最多 2×进程数 个任务在途，内存中只有这些页面的论文
+            batch_size = max(1, math.ceil(len(outdated) / (workers * 4)))
+            with ProcessPoolExecutor(max_workers=min(workers, math.ceil(len(outdated) / batch_size))) as executor:
+                in_flight = deque()
+                while True:
+                    batch = list(islice(pages, batch_size))
+                    if not batch:
+                        break
+                    in_flight.append(executor.submit(self.write_pages, batch))
+                    if len(in_flight) >= workers * 2:
+                        in_flight.popleft().result()
+                while in_flight:
+                    in_flight.popleft().result()
+        else:
+            # 单页（或只有一页需要重新生成）时在 iter_page 中按卡片分块并行渲染
+            for args in pages:
+                self.write_page(*args)
+        for page, _, _ in outdated:
+            name = self.page_filename(page)
+            manifest.record(name, hashes[name])
+        
+        # 论文变少导致页数减少时，删除多余的旧页面
+        for stale in self.output_dir.glob("page-*.html"):
+            number = stale.stem[len("page-"):]
+            if number.isdigit() and int(number) >= total_pages:
+                stale.unlink()
+        manifest.prune(hashes, prefix='page-')
+        
+        logger.info(f"生成主页: {self.output_dir / 'index.html'}（共 {total_pages} 页，重新生成 {len(outdated)} 页）")
+    
+    def write_pages(self, pages: List[tuple]) -> List[Path]:
+        """依次写入多页，pages 为 (论文, 页号, 总页数)"""
+        return [self.write_page(*args) for args in pages]
+    
+    def write_page(self, papers: List[Dict], page: int, total_pages: int) -> Path:
+        """渲染并写入一页
+        
+        页面按块写入带缓冲的文件，不在内存中拼出整页，内存占用与每页论文数无关。
+        """
+        output_file = self.output_dir / self.page_filename(page)
+        with open(output_file, 'w', encoding='utf-8', buffering=self.WRITE_BUFFER_SIZE) as f:
+            writer = MinifyingWriter(f) if self.minify else f
+            writer.writelines(self.iter_page(papers, page, total_pages))
+            if self.minify:
+                writer.close()
+        return output_file
+    
+    def render_page(self, papers: List[Dict], page: int = 0, total_pages: int = 1) -> str:
+        """渲染一页完整的 HTML"""
+        return ''.join(self.iter_page(papers, page, total_pages))
+    
+    def iter_page(self, papers: List[Dict], page: int = 0, total_pages: int = 1) -> Iterator[str]:
+        """按块生成一页 HTML：页头、每张论文卡片、页尾"""
+        context = self._page_context or self._build_page_context()
+        # 本页最旧一篇论文的序号（序号从最旧的论文开始编号，与搜索索引一致）
+        offset = context['per_page'] * (page - 1) if page else context['per_page'] * (total_pages - 1)
+        title_suffix = f" - 第 {page} 页" if page else ""
+        yield f"""<!DOCTYPE html>
 <html lang="zh-CN">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>DailyPaper - AI/ML/CV/NLP 最新论文</title>
-    <link rel="stylesheet" href="css/style.css">
+    <title>DailyPaper - AI/ML/CV/NLP 最新论文{title_suffix}</title>
+    <link rel="stylesheet" href="{self.asset_paths['css']}">
 </head>
 <body>
     <header>
         <div class="container">
             <h1>📚 DailyPaper</h1>
             <p class="subtitle">每日自动更新 AI/ML/CV/NLP 领域最新论文</p>
-            <p class="update-time">最后更新: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} UTC</p>
+            <p class="update-time">最后更新: <span data-stat="update_time">{context['update_time']}</span> UTC</p>
         </div>
     </header>
     
@@ -61,9 +357,9 @@ class HTMLGenerator:
             <div class="filter-group">
                 <label class="filter-label">📌 发表状态：</label>
                 <div class="filters status-filters">
-                    <button class="filter-btn status-btn active" data-status="all">全部 ({len(self.papers)})</button>
-                    <button class="filter-btn status-btn" data-status="published">已发表 ({sum(1 for p in self.papers if p.get('conference'))})</button>
-                    <button class="filter-btn status-btn" data-status="preprint">预印本 ({sum(1 for p in self.papers if not p.get('conference'))})</button>
+                    <button class="filter-btn status-btn active" data-status="all">全部 (<span data-stat="total">{context['total']}</span>)</button>
+                    <button class="filter-btn status-btn" data-status="published">已发表 (<span data-stat="published">{context['published']}</span>)</button>
+                    <button class="filter-btn status-btn" data-status="preprint">预印本 (<span data-stat="preprint">{context['preprint']}</span>)</button>
                 </div>
             </div>
             <div class="filter-group">
@@ -84,9 +380,25 @@ class HTMLGenerator:
     </nav>
     
     <main class="container">
-        <div id="papers-container">
-            {self.generate_papers_html()}
+        <div id="search-summary" class="search-summary hidden"></div>
+        """
+        
+        if self.render_mode == "virtual":
+            yield (f'<div id="papers-container" data-mode="virtual" data-page="0" data-offset="0" data-per-page="0">\n'
+                   f'            <div class="virtual-list" aria-busy="true"></div>')
+        else:
+            per_page = context['per_page'] if total_pages > 1 else 0
+            yield f'<div id="papers-container" data-page="{page}" data-offset="{offset}" data-per-page="{per_page}">\n            '
+            workers = self._parallel_workers(len(papers))
+            if workers > 1:
+                yield from self._iter_papers_html_parallel(papers, offset + len(papers) - 1, workers)
+            else:
+                yield from self.iter_papers_html(papers, offset + len(papers) - 1)
+        
+        pagination_html = self.generate_pagination_html(page, total_pages)
+        yield f"""
         </div>
+        {pagination_html}
     </main>
     
     <footer>
@@ -95,44 +407,51 @@ class HTMLGenerator:
         </div>
     </footer>
     
-    <script src="js/main.js"></script>
+    <script src="{self.asset_paths['js']}"></script>
 </body>
 </html>
 """
-        
-        output_file = self.output_dir / "index.html"
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html)
-        
-        logger.info(f"生成主页: {output_file}")
     
     def get_category_name(self, category: str) -> str:
         """将 ArXiv 类别代码转换为友好的名称"""
-        category_map = {
-            'cs.AI': 'Artificial Intelligence',
-            'cs.CV': 'Computer Vision',
-            'cs.CL': 'Computational Linguistics (NLP)',
-            'cs.LG': 'Machine Learning',
-            'cs.IR': 'Information Retrieval',
-            'cs.RO': 'Robotics',
-            'cs.NE': 'Neural and Evolutionary Computing',
-            'cs.CR': 'Cryptography and Security',
-            'cs.HC': 'Human-Computer Interaction',
-            'cs.MM': 'Multimedia',
-            'stat.ML': 'Machine Learning (Statistics)',
-        }
-        return category_map.get(category, category)
-    
-    def generate_papers_html(self) -> str:
-        """生成论文列表 HTML"""
-        if not self.papers:
-            return '<p class="no-results">暂无论文数据</p>'
-        
-        # Use list comprehension and join for much better performance
-        html_parts = []
-        for paper in self.papers:
+        return self.CATEGORY_NAMES.get(category, category)
+    
+    def generate_papers_html(self, papers: Optional[List[Dict]] = None, start: int = 0) -> str:
+        """生成论文列表 HTML（默认为全部论文）
+        
+        start 为第一篇（最新）论文的序号，之后的论文依次递减；序号从最旧的论文开始编号，新增论文不改变已有论文的序号。
+        """
+        if papers is None:
+            papers = self.papers
+            start = len(papers) - 1
+        return ''.join(self.iter_papers_html(papers, start))
+    
+    def _parallel_workers(self, card_count: int) -> int:
+        """渲染 card_count 张卡片时使用的进程数；卡片较少时启动进程池得不偿失，返回 1"""
+        workers = self.workers or os.cpu_count() or 1
+        if card_count < max(self.parallel_min_papers, 2):
+            return 1
+        return min(workers, math.ceil(card_count / self.CARD_CHUNK_SIZE))
+    
+    def _iter_papers_html_parallel(self, papers: List[Dict], start: int, workers: int) -> Iterator[str]:
+        """分块在进程池中渲染卡片，按原顺序产出；最多 2×进程数 个块在途，内存占用有上限"""
+        chunk_size = self.CARD_CHUNK_SIZE
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            in_flight = deque()
+            for i in range(0, len(papers), chunk_size):
+                in_flight.append(executor.submit(self.generate_papers_html, papers[i:i + chunk_size], start - i))
+                if len(in_flight) >= workers * 2:
+                    yield in_flight.popleft().result()
+            while in_flight:
+                yield in_flight.popleft().result()
+    
+    def iter_papers_html(self, papers: List[Dict], start: int) -> Iterator[str]:
+        """逐张生成论文卡片 HTML（参数同 generate_papers_html）"""
+        if not papers:
+            yield '<p class="no-results">暂无论文数据</p>'
+            return
+        
+        for ordinal, paper in zip(range(start, start - len(papers), -1), papers):
             tags_html = ''.join([f'<span class="tag">{tag}</span>' for tag in paper.get('tags', [])])
             authors = paper['authors'][:5]
             authors_html = ', '.join(authors)
@@ -157,8 +476,8 @@ class HTMLGenerator:
             # 确定发表状态
             is_published = 'published' if conference else 'preprint'
             
-            paper_html = f"""
-            <article class="paper-card" data-tags="{','.join(paper.get('tags', []))}" data-status="{is_published}">
+            yield f"""
+            <article class="paper-card" data-ordinal="{ordinal}" data-tags="{','.join(paper.get('tags', []))}" data-status="{is_published}">
                 <h2 class="paper-title">
                     <a href="{paper['arxiv_url']}" target="_blank">{paper['title']}</a>
                 </h2>
@@ -184,9 +503,6 @@ class HTMLGenerator:
                 </div>
             </article>
             """
-            html_parts.append(paper_html)
-        
-        return ''.join(html_parts)
     
     def generate_css(self):
         """生成 CSS 样式"""
@@ -445,6 +761,30 @@ footer a {
     text-decoration: none;
 }
 
+/* 搜索结果摘要 */
+.search-summary {
+    margin-top: 1rem;
+    padding: 0.8rem 1rem;
+    background: white;
+    border-radius: 8px;
+    color: #666;
+    box-shadow: 0 2px 10px rgba(0,0,0,0.05);
+}
+
+.search-summary.hidden {
+    display: none;
+}
+
+.search-summary a {
+    color: #667eea;
+    text-decoration: none;
+    margin-left: 0.5rem;
+}
+
+.search-summary a:hover {
+    text-decoration: underline;
+}
+
 /* 无结果提示 */
 .no-results {
     text-align: center;
@@ -453,6 +793,60 @@ footer a {
     font-size: 1.1rem;
 }
 
+/* virtual 模式：卡片按测量出的高度绝对定位 */
+.virtual-list {
+    position: relative;
+}
+
+.virtual-list .paper-card {
+    position: absolute;
+    left: 0;
+    right: 0;
+    margin: 0;
+}
+
+/* 分页导航 */
+.pagination {
+    display: flex;
+    flex-wrap: wrap;
+    justify-content: center;
+    align-items: center;
+    gap: 0.5rem;
+    margin: 2rem 0 1rem;
+}
+
+.page-link {
+    min-width: 2.5rem;
+    padding: 0.5rem 0.8rem;
+    text-align: center;
+    background: white;
+    color: #667eea;
+    text-decoration: none;
+    border-radius: 5px;
+    box-shadow: 0 2px 10px rgba(0,0,0,0.05);
+    transition: background 0.3s, color 0.3s;
+}
+
+a.page-link:hover {
+    background: #667eea;
+    color: white;
+}
+
+.page-link.current {
+    background: #667eea;
+    color: white;
+    font-weight: bold;
+}
+
+.page-link.disabled {
+    color: #bbb;
+    box-shadow: none;
+}
+
+.page-ellipsis {
+    color: #999;
+}
+
 /* 响应式设计 */
 @media (max-width: 768px) {
     header h1 {
@@ -475,6 +869,7 @@ footer a {
         
         css_file = css_dir / "style.css"
         
+        self._css_content = css
         # Only write if content has changed
         if css_file.exists():
             with open(css_file, 'r', encoding='utf-8') as f:
@@ -495,21 +890,30 @@ document.addEventListener('DOMContentLoaded', function() {
     const statusBtns = document.querySelectorAll('.status-btn');
     const categoryBtns = document.querySelectorAll('.category-btn');
     const searchInput = document.getElementById('searchInput');
+    const container = document.getElementById('papers-container');
+    const summary = document.getElementById('search-summary');
     const papers = document.querySelectorAll('.paper-card');
     
+    // 当前页在全部论文中的位置（用于把搜索结果对应到页面）
+    const pageOffset = parseInt(container.dataset.offset || '0', 10);
+    const perPage = parseInt(container.dataset.perPage || '0', 10);
+    const currentPage = parseInt(container.dataset.page || '0', 10);
+    
     let currentStatus = 'all';
     let currentCategory = 'all';
     let searchTerm = '';
+    let searchRequest = 0;
     
     // Cache paper data for better performance
     const paperCache = [];
     papers.forEach(paper => {
         paperCache.push({
             element: paper,
+            ordinal: parseInt(paper.dataset.ordinal, 10),
             tags: paper.dataset.tags.split(','),
             status: paper.dataset.status,
-            // Cache lowercase text content once instead of recalculating
-            textContent: paper.textContent.toLowerCase()
+            // 只有搜索索引不可用时才需要，首次用到时再缓存
+            textContent: null
         });
     });
     
@@ -526,6 +930,493 @@ document.addEventListener('DOMContentLoaded', function() {
         };
     }
     
+    // ---- 搜索索引（由 generate_html.py 生成在 search/ 目录下）----
+    const ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_';
+    const DECODE = {};
+    for (let i = 0; i < ALPHABET.length; i++) {
+        DECODE[ALPHABET[i]] = i;
+    }
+    const EMPTY_SHARD = { terms: [], postings: [] };
+    const searchIndex = {
+        available: true,
+        meta: null,
+        facets: null,
+        shards: new Map()
+    };
+    
+    function fetchJSON(url) {
+        return fetch(url).then(response => {
+            if (!response.ok) {
+                throw new Error(url + ': ' + response.status);
+            }
+            return response.json();
+        });
+    }
+    
+    function loadMeta() {
+        if (!searchIndex.meta) {
+            searchIndex.meta = fetchJSON('search/meta.json').then(meta => {
+                searchIndex.count = meta.count;
+                return meta;
+            });
+        }
+        return searchIndex.meta;
+    }
+    
+    function loadFacets() {
+        if (!searchIndex.facets) {
+            searchIndex.facets = fetchJSON('search/facets.json');
+        }
+        return searchIndex.facets;
+    }
+    
+    function loadShard(meta, name) {
+        if (!meta.shards.includes(name)) {
+            return Promise.resolve(EMPTY_SHARD);
+        }
+        if (!searchIndex.shards.has(name)) {
+            searchIndex.shards.set(name, fetchJSON('search/' + name + '.json').then(shard => {
+                shard.decoded = new Array(shard.terms.length);
+                return shard;
+            }));
+        }
+        return searchIndex.shards.get(name);
+    }
+    
+    // 倒排表：差分后的变长编码（每个字符 5 位数据 + 1 位续位）
+    function decodePostings(encoded) {
+        const ordinals = [];
+        let previous = -1;
+        let gap = 0;
+        let shift = 0;
+        for (let i = 0; i < encoded.length; i++) {
+            const digit = DECODE[encoded[i]];
+            gap += (digit & 0x1f) * Math.pow(2, shift);
+            if (digit & 0x20) {
+                shift += 5;
+                continue;
+            }
+            previous += gap + 1;
+            ordinals.push(previous);
+            gap = 0;
+            shift = 0;
+        }
+        return ordinals;
+    }
+    
+    function postingsAt(shard, i) {
+        if (!shard.decoded[i]) {
+            shard.decoded[i] = decodePostings(shard.postings[i]);
+        }
+        return shard.decoded[i];
+    }
+    
+    // 与 search_index.py 中的 normalize_term / index_terms / shard_name 保持一致
+    function normalizeTerm(token) {
+        if (token.length > 3 && token[token.length - 1] === 's' && token[token.length - 2] !== 's') {
+            return token.slice(0, -1);
+        }
+        return token;
+    }
+    
+    function queryTerms(text, prefixLength) {
+        const tokens = text.toLowerCase().match(/[\\p{L}\\p{N}_]+/gu) || [];
+        return tokens.filter(t => Array.from(t).length >= prefixLength).map(normalizeTerm);
+    }
+    
+    function shardName(term, prefixLength) {
+        const prefix = Array.from(term).slice(0, prefixLength).join('');
+        if (/^[a-z0-9]+$/.test(prefix)) {
+            return prefix;
+        }
+        return 'x' + Array.from(new TextEncoder().encode(prefix))
+            .map(b => b.toString(16).padStart(2, '0')).join('');
+    }
+    
+    function lowerBound(array, value) {
+        let lo = 0;
+        let hi = array.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >> 1;
+            if (array[mid] < value) {
+                lo = mid + 1;
+            } else {
+                hi = mid;
+            }
+        }
+        return lo;
+    }
+    
+    // 前缀匹配的多个词：合并各自的倒排表
+    function union(lists) {
+        if (lists.length === 1) {
+            return lists[0];
+        }
+        const merged = [].concat(...lists).sort((a, b) => a - b);
+        return merged.filter((x, i) => i === 0 || x !== merged[i - 1]);
+    }
+    
+    // 短表中的每个序号在长表中倍增查找，开销只与短表长度有关
+    function intersect(shorter, longer) {
+        const result = [];
+        let j = 0;
+        for (let i = 0; i < shorter.length && j < longer.length; i++) {
+            const target = shorter[i];
+            let step = 1;
+            let hi = j;
+            while (hi < longer.length && longer[hi] < target) {
+                j = hi + 1;
+                hi += step;
+                step *= 2;
+            }
+            hi = Math.min(hi, longer.length);
+            while (j < hi) {
+                const mid = (j + hi) >> 1;
+                if (longer[mid] < target) {
+                    j = mid + 1;
+                } else {
+                    hi = mid;
+                }
+            }
+            if (j < longer.length && longer[j] === target) {
+                result.push(target);
+                j++;
+            }
+        }
+        return result;
+    }
+    
+    // 返回匹配的论文序号（升序）；没有可检索的词时返回 null
+    async function searchOrdinals(text) {
+        const meta = await loadMeta();
+        const terms = queryTerms(text, meta.prefix_length);
+        if (terms.length === 0) {
+            return null;
+        }
+        
+        const lists = await Promise.all(terms.map(async term => {
+            const shard = await loadShard(meta, shardName(term, meta.prefix_length));
+            const matched = [];
+            for (let i = lowerBound(shard.terms, term); i < shard.terms.length && shard.terms[i].startsWith(term); i++) {
+                matched.push(postingsAt(shard, i));
+            }
+            return matched.length ? union(matched) : [];
+        }));
+        
+        // 发表状态和研究领域筛选同样以倒排表参与求交集，其他页面的匹配数也会随筛选变化
+        if (currentStatus !== 'all' || currentCategory !== 'all') {
+            const facets = await loadFacets();
+            if (currentStatus !== 'all') {
+                lists.push(decodePostings(facets['status:' + currentStatus] || ''));
+            }
+            if (currentCategory !== 'all') {
+                lists.push(decodePostings(facets['tag:' + currentCategory] || ''));
+            }
+        }
+        
+        lists.sort((a, b) => a.length - b.length);
+        return lists.reduce((result, list) => intersect(result, list));
+    }
+    
+    // 与 generate_html.py 中的 page_filename / page_ranges 保持一致：
+    // 归档页从最旧的论文开始每 perPage 篇一页，其余（最新的）论文都在主页
+    function pageFilename(page) {
+        return page === 0 ? 'index.html' : 'page-' + page + '.html';
+    }
+    
+    function pageOf(ordinal) {
+        const archives = Math.max(Math.floor(searchIndex.count / perPage), 1) - 1;
+        return ordinal >= archives * perPage ? 0 : Math.floor(ordinal / perPage) + 1;
+    }
+    
+    // 显示匹配总数和其他页面中的匹配
+    function updateSummary(results) {
+        summary.textContent = '';
+        if (!results) {
+            summary.classList.add('hidden');
+            return;
+        }
+        
+        summary.appendChild(document.createTextNode('共找到 ' + results.length + ' 篇匹配的论文'));
+        if (perPage > 0) {
+            // 从新到旧列出
+            const pages = new Map();
+            for (let i = results.length - 1; i >= 0; i--) {
+                const page = pageOf(results[i]);
+                if (page !== currentPage) {
+                    pages.set(page, (pages.get(page) || 0) + 1);
+                }
+            }
+            if (pages.size > 0) {
+                summary.appendChild(document.createTextNode('，其他页面：'));
+                const query = '?q=' + encodeURIComponent(searchTerm);
+                let shown = 0;
+                for (const [page, count] of pages) {
+                    if (shown === 20) {
+                        summary.appendChild(document.createTextNode(' …'));
+                        break;
+                    }
+                    const link = document.createElement('a');
+                    link.href = pageFilename(page) + query;
+                    link.textContent = (page === 0 ? '最新' : '第 ' + page + ' 页') + ' (' + count + ')';
+                    summary.appendChild(link);
+                    shown++;
+                }
+            }
+        }
+        summary.classList.remove('hidden');
+    }
+    
+    // ---- virtual 模式：论文数据来自 list/papers.json，只渲染可见范围内的卡片 ----
+    const virtualMode = container.dataset.mode === 'virtual';
+    const virtualList = virtualMode ? container.querySelector('.virtual-list') : null;
+    const ESTIMATED_HEIGHT = 240;   // 未测量卡片的估计高度
+    const CARD_GAP = 16;            // 与 .paper-card 的 margin-bottom 一致
+    const OVERSCAN = 600;           // 视口上下额外渲染的像素
+    const listData = {
+        rows: null,
+        tags: [],
+        categories: [],
+        abstractChunk: 1000,
+        abstracts: new Map(),
+        text: null
+    };
+    let visibleOrder = [];          // 筛选后的论文序号
+    let heights = null;
+    const measured = new Map();     // 序号 -> 实测高度
+    const rendered = new Map();     // 序号 -> 卡片元素
+    let renderScheduled = false;
+    
+    // 树状数组：第 i 张卡片的顶部位置是前 i 张卡片（含间距）的高度之和，更新和查找都是 O(log n)
+    function HeightIndex(sizes) {
+        const n = sizes.length;
+        const tree = new Float64Array(n + 1);
+        for (let i = 1; i <= n; i++) {
+            tree[i] += sizes[i - 1];
+            const parent = i + (i & -i);
+            if (parent <= n) {
+                tree[parent] += tree[i];
+            }
+        }
+        this.n = n;
+        this.tree = tree;
+        this.sizes = sizes;
+    }
+    
+    HeightIndex.prototype.prefix = function(i) {
+        let sum = 0;
+        for (; i > 0; i -= i & -i) {
+            sum += this.tree[i];
+        }
+        return sum;
+    };
+    
+    HeightIndex.prototype.update = function(i, size) {
+        const delta = size - this.sizes[i];
+        this.sizes[i] = size;
+        for (let j = i + 1; j <= this.n; j += j & -j) {
+            this.tree[j] += delta;
+        }
+        return delta;
+    };
+    
+    // 包含位置 offset 的卡片下标
+    HeightIndex.prototype.find = function(offset) {
+        let pos = 0;
+        let step = 1;
+        while (step * 2 <= this.n) {
+            step *= 2;
+        }
+        for (; step > 0; step >>= 1) {
+            if (pos + step <= this.n && this.tree[pos + step] <= offset) {
+                pos += step;
+                offset -= this.tree[pos];
+            }
+        }
+        return Math.min(pos, Math.max(this.n - 1, 0));
+    };
+    
+    function escapeHtml(text) {
+        return String(text).replace(/[&<>"']/g, c => ({
+            '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'
+        })[c]);
+    }
+    
+    function loadAbstract(ordinal) {
+        const k = Math.floor(ordinal / listData.abstractChunk);
+        if (!listData.abstracts.has(k)) {
+            listData.abstracts.set(k, fetchJSON('list/abstracts-' + k + '.json'));
+        }
+        return listData.abstracts.get(k).then(chunk => chunk[ordinal % listData.abstractChunk]);
+    }
+    
+    // 与 generate_papers_html 生成的卡片结构一致
+    function buildCard(ordinal) {
+        const row = listData.rows[ordinal];
+        const [id, title, authors, published, conference, category, tags] = row;
+        const pdfUrl = row.length > 7 ? row[7] : 'http://arxiv.org/pdf/' + id;
+        const arxivUrl = row.length > 7 ? row[8] : 'http://arxiv.org/abs/' + id;
+        const tagNames = tags.map(t => listData.tags[t]);
+        const sourceInfo = conference
+            ? '📍 ' + escapeHtml(conference)
+            : '📄 ArXiv Preprint (' + escapeHtml(listData.categories[category]) + ')';
+        
+        const card = document.createElement('article');
+        card.className = 'paper-card';
+        card.dataset.ordinal = ordinal;
+        card.dataset.tags = tagNames.join(',');
+        card.dataset.status = conference ? 'published' : 'preprint';
+        card.innerHTML =
+            '<h2 class="paper-title"><a href="' + escapeHtml(arxivUrl) + '" target="_blank">' + escapeHtml(title) + '</a></h2>' +
+            '<div class="paper-meta"><span class="meta-item">📅 ' + escapeHtml(published) + '</span>' +
+            '<span class="meta-item venue-' + (conference ? 'conference' : 'preprint') + '">' + sourceInfo + '</span></div>' +
+            '<div class="paper-authors">👥 ' + escapeHtml(authors) + '</div>' +
+            '<div class="paper-tags">' + tagNames.map(t => '<span class="tag">' + escapeHtml(t) + '</span>').join('') + '</div>' +
+            '<div class="paper-abstract"><details><summary>查看摘要</summary><p></p></details></div>' +
+            '<div class="paper-links"><a href="' + escapeHtml(pdfUrl) + '" target="_blank" class="btn-link">📄 PDF</a>' +
+            '<a href="' + escapeHtml(arxivUrl) + '" target="_blank" class="btn-link">🔗 ArXiv</a></div>';
+        
+        // 摘要按块懒加载；展开/收起会改变卡片高度，需要重新排布
+        const details = card.querySelector('details');
+        details.addEventListener('toggle', () => {
+            const p = details.querySelector('p');
+            if (details.open && !p.textContent) {
+                p.textContent = '加载中…';
+                loadAbstract(ordinal).then(text => {
+                    p.textContent = text;
+                    scheduleRender();
+                }).catch(() => {
+                    p.textContent = '摘要加载失败';
+                });
+            }
+            scheduleRender();
+        });
+        return card;
+    }
+    
+    function rebuildHeights() {
+        heights = new HeightIndex(visibleOrder.map(o => (measured.get(o) || ESTIMATED_HEIGHT) + CARD_GAP));
+        virtualList.style.height = heights.prefix(heights.n) + 'px';
+    }
+    
+    function scheduleRender() {
+        if (!renderScheduled) {
+            renderScheduled = true;
+            window.requestAnimationFrame(renderVirtual);
+        }
+    }
+    
+    // 渲染视口附近的卡片：已有卡片按序号复用，离开范围的卡片移除
+    function renderVirtual() {
+        renderScheduled = false;
+        if (!heights) {
+            return;
+        }
+        const viewTop = -virtualList.getBoundingClientRect().top;
+        const start = viewTop - OVERSCAN;
+        const end = viewTop + window.innerHeight + OVERSCAN;
+        
+        const range = [];
+        for (let i = heights.n ? heights.find(Math.max(start, 0)) : 0; i < heights.n; i++) {
+            if (heights.prefix(i) > end) {
+                break;
+            }
+            range.push(i);
+        }
+        
+        const keep = new Set(range.map(i => visibleOrder[i]));
+        rendered.forEach((card, ordinal) => {
+            if (!keep.has(ordinal)) {
+                card.remove();
+                rendered.delete(ordinal);
+            }
+        });
+        range.forEach(i => {
+            const ordinal = visibleOrder[i];
+            if (!rendered.has(ordinal)) {
+                const card = buildCard(ordinal);
+                rendered.set(ordinal, card);
+                virtualList.appendChild(card);
+            }
+        });
+        
+        // 测量实际高度；视口上方的卡片高度变化时调整滚动位置，避免内容跳动
+        let changed = false;
+        let shift = 0;
+        range.forEach(i => {
+            const ordinal = visibleOrder[i];
+            const height = rendered.get(ordinal).offsetHeight;
+            measured.set(ordinal, height);
+            const delta = heights.update(i, height + CARD_GAP);
+            if (delta !== 0) {
+                changed = true;
+                if (heights.prefix(i) < viewTop) {
+                    shift += delta;
+                }
+            }
+        });
+        range.forEach(i => {
+            rendered.get(visibleOrder[i]).style.top = heights.prefix(i) + 'px';
+        });
+        virtualList.style.height = heights.prefix(heights.n) + 'px';
+        if (shift !== 0) {
+            window.scrollBy(0, shift);
+        }
+        if (changed) {
+            // 高度估计有偏差时可能需要补渲染，测量结果已缓存，很快收敛
+            scheduleRender();
+        }
+    }
+    
+    function paperText(ordinal) {
+        if (!listData.text) {
+            listData.text = new Array(listData.rows.length);
+        }
+        if (listData.text[ordinal] === undefined) {
+            const row = listData.rows[ordinal];
+            listData.text[ordinal] = (row[1] + ' ' + row[2] + ' ' + row[4]).toLowerCase();
+        }
+        return listData.text[ordinal];
+    }
+    
+    function applyVirtualFilters(results) {
+        if (!listData.rows) {
+            // 数据加载完成后会重新筛选
+            return;
+        }
+        const tagIndex = listData.tags.indexOf(currentCategory);
+        // 序号从最旧的论文开始，按从新到旧的顺序显示
+        const candidates = results || listData.rows;
+        visibleOrder = [];
+        for (let i = candidates.length - 1; i >= 0; i--) {
+            const ordinal = results ? results[i] : i;
+            const row = listData.rows[ordinal];
+            const matchStatus = currentStatus === 'all' || (row[4] ? 'published' : 'preprint') === currentStatus;
+            const matchCategory = currentCategory === 'all' || row[6].includes(tagIndex);
+            const matchSearch = results || searchTerm === '' || paperText(ordinal).includes(searchTerm);
+            if (matchStatus && matchCategory && matchSearch) {
+                visibleOrder.push(ordinal);
+            }
+        }
+        rebuildHeights();
+        scheduleRender();
+        showNoResults(visibleOrder.length === 0, '未找到匹配的论文');
+    }
+    
+    function showNoResults(show, message) {
+        let noResults = container.querySelector('.no-results');
+        if (show) {
+            if (!noResults) {
+                noResults = document.createElement('p');
+                noResults.className = 'no-results';
+                container.appendChild(noResults);
+            }
+            noResults.textContent = message;
+        } else if (noResults) {
+            noResults.remove();
+        }
+    }
+    
     // 发表状态筛选按钮点击事件
     statusBtns.forEach(btn => {
         btn.addEventListener('click', function() {
@@ -552,12 +1443,48 @@ document.addEventListener('DOMContentLoaded', function() {
     
     // 搜索输入事件 - 使用防抖优化
     searchInput.addEventListener('input', debounce(function() {
-        searchTerm = this.value.toLowerCase();
+        // debounce 不保留 this，直接读取输入框
+        searchTerm = searchInput.value.toLowerCase();
         filterPapers();
     }, 300));
     
-    // 筛选论文 - 优化版本，使用CSS类而非内联样式
+    // 筛选论文：有搜索词时优先查询搜索索引，索引不可用（例如以 file:// 打开）时退回逐篇匹配
     function filterPapers() {
+        const request = ++searchRequest;
+        if (searchTerm === '' || !searchIndex.available) {
+            applyFilters(null);
+            return;
+        }
+        searchOrdinals(searchTerm).then(results => {
+            if (request === searchRequest) {
+                applyFilters(results);
+            }
+        }).catch(() => {
+            searchIndex.available = false;
+            if (request === searchRequest) {
+                applyFilters(null);
+            }
+        });
+    }
+    
+    // 使用CSS类而非内联样式显示/隐藏当前页的论文
+    function applyFilters(results) {
+        if (virtualMode) {
+            applyVirtualFilters(results);
+            updateSummary(results);
+            return;
+        }
+        
+        let matched = null;
+        if (results) {
+            // 只取落在当前页范围内的序号
+            matched = new Set();
+            const end = pageOffset + paperCache.length;
+            for (let i = lowerBound(results, pageOffset); i < results.length && results[i] < end; i++) {
+                matched.add(results[i]);
+            }
+        }
+        
         let visibleCount = 0;
         
         paperCache.forEach(paper => {
@@ -567,8 +1494,16 @@ document.addEventListener('DOMContentLoaded', function() {
             // 检查研究领域筛选
             const matchCategory = currentCategory === 'all' || paper.tags.includes(currentCategory);
             
-            // 检查搜索关键词 - 使用缓存的文本内容
-            const matchSearch = searchTerm === '' || paper.textContent.includes(searchTerm);
+            // 检查搜索关键词
+            let matchSearch = true;
+            if (matched) {
+                matchSearch = matched.has(paper.ordinal);
+            } else if (searchTerm !== '') {
+                if (paper.textContent === null) {
+                    paper.textContent = paper.element.textContent.toLowerCase();
+                }
+                matchSearch = paper.textContent.includes(searchTerm);
+            }
             
             if (matchStatus && matchCategory && matchSearch) {
                 paper.element.classList.remove('hidden');
@@ -578,8 +1513,9 @@ document.addEventListener('DOMContentLoaded', function() {
             }
         });
         
+        updateSummary(results);
+        
         // 显示无结果提示
-        const container = document.getElementById('papers-container');
         let noResults = container.querySelector('.no-results');
         
         if (visibleCount === 0) {
@@ -595,6 +1531,44 @@ document.addEventListener('DOMContentLoaded', function() {
             }
         }
     }
+    
+    if (virtualMode) {
+        fetchJSON('list/papers.json').then(data => {
+            listData.rows = data.papers;
+            listData.tags = data.tags;
+            listData.categories = data.categories;
+            listData.abstractChunk = data.abstract_chunk;
+            virtualList.removeAttribute('aria-busy');
+            window.addEventListener('scroll', scheduleRender, { passive: true });
+            window.addEventListener('resize', () => {
+                // 宽度变化后卡片高度都会变化，重新测量
+                measured.clear();
+                rebuildHeights();
+                scheduleRender();
+            });
+            filterPapers();
+        }).catch(() => {
+            // 以 file:// 打开时浏览器不允许加载数据文件
+            showNoResults(true, '论文数据加载失败，请通过 HTTP 访问本页面');
+        });
+    }
+    
+    // 统计数字和更新时间以 site.json 为准（内容未变的页面在增量构建时不会重写）
+    fetchJSON('site.json').then(site => {
+        document.querySelectorAll('[data-stat]').forEach(element => {
+            if (site[element.dataset.stat] !== undefined) {
+                element.textContent = site[element.dataset.stat];
+            }
+        });
+    }).catch(() => {});
+    
+    // 从其他页面的搜索结果链接跳转过来时，恢复搜索词
+    const initialQuery = new URLSearchParams(window.location.search).get('q');
+    if (initialQuery) {
+        searchInput.value = initialQuery;
+        searchTerm = initialQuery.toLowerCase();
+        filterPapers();
+    }
 });
 """
         
@@ -603,6 +1577,7 @@ document.addEventListener('DOMContentLoaded', function() {
         
         js_file = js_dir / "main.js"
         
+        self._js_content = js
         # Only write if content has changed
         if js_file.exists():
             with open(js_file, 'r', encoding='utf-8') as f:
@@ -616,20 +1591,229 @@ document.addEventListener('DOMContentLoaded', function() {
         
         logger.info("生成 JavaScript 文件")
     
+    def generate_assets(self):
+        """写出页面实际引用的 CSS/JS（压缩、文件名带内容哈希），须在生成页面之前调用
+        
+        css/style.css 和 js/main.js 保持可读的原样；带哈希的文件内容不变时文件名也不变，
+        浏览器可以长期缓存，内容变化后页面引用新文件名，不会读到过期的缓存。
+        """
+        if not (self.minify or self.fingerprint_assets):
+            self.asset_paths = {'css': 'css/style.css', 'js': 'js/main.js'}
+            # 之前的构建生成的压缩/带哈希文件只保留最近的一个版本
+            for name in self.asset_paths.values():
+                prune_assets(self.output_dir / name, self.output_dir / name)
+            return
+        if self._css_content is None:
+            self.generate_css()
+        if self._js_content is None:
+            self.generate_js()
+        css_name = write_asset(self.output_dir / "css" / "style.css", self._css_content,
+                               minify_css if self.minify else None, self.fingerprint_assets)
+        js_name = write_asset(self.output_dir / "js" / "main.js", self._js_content,
+                              minify_js if self.minify else None, self.fingerprint_assets)
+        self.asset_paths = {'css': f"css/{css_name}", 'js': f"js/{js_name}"}
+        logger.info(f"页面引用资源: {self.asset_paths['css']}, {self.asset_paths['js']}")
+    
+    def precompress_output(self):
+        """为输出目录中的 HTML/CSS/JS/JSON 生成 .gz（以及安装了 brotli 时的 .br）副本"""
+        stats = precompress(self.output_dir)
+        logger.info(f"预压缩: 新生成 {stats['compressed']} 个，未变化 {stats['skipped']} 个，"
+                    f"删除 {stats['removed']} 个过期副本")
+    
+    def generate_site_data(self):
+        """写入 site.json：统计数字和更新时间
+        
+        这些信息每次运行都会变化，不计入页面的输入哈希；内容未变的页面不会重写，
+        由 main.js 在加载时从 site.json 刷新页面中的 data-stat 元素。
+        """
+        context = self._page_context or self._build_page_context()
+        data = {key: context[key] for key in ('total', 'published', 'preprint', 'update_time')}
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        write_text_if_changed(self.output_dir / "site.json", json.dumps(data, ensure_ascii=False))
+    
+    def generate_list_data(self):
+        """virtual 模式：把论文列表输出为紧凑 JSON
+        
+        list/papers.json 中每篇论文是一个数组：
+            [id, 标题, 作者（已截断）, 发表日期, 会议, 类别名下标, [标签下标...](, pdf 链接, arxiv 链接)]
+        数组下标即论文序号（从最旧的论文开始）；链接可以由 id 推导时省略；
+        摘要按 ABSTRACT_CHUNK_SIZE 篇一组保存在 list/abstracts-K.json，展开摘要时才加载，新增论文只改变最后一个摘要文件。
+        """
+        input_hash = inputs_hash(self.TEMPLATE_HASH, self.paper_hashes())
+        if self.manifest is not None and self.manifest.is_fresh("list/papers.json", input_hash):
+            logger.info("列表数据未改变，跳过生成")
+            return
+        
+        list_dir = self.output_dir / "list"
+        list_dir.mkdir(parents=True, exist_ok=True)
+        total = len(self.papers)
+        chunk_count = math.ceil(total / self.ABSTRACT_CHUNK_SIZE)
+        
+        # 从新到旧流式读取论文：每读到一个摘要分组中最旧的一篇就写出这一组，内存中只保留一组摘要；
+        # 列表行先记录类别名和标签名，反转为从旧到新之后再编号，编号顺序与按序号遍历时相同
+        written = 0
+        entries, abstracts = [], []
+        for position, paper in enumerate(self.papers):
+            authors = paper['authors'][:5]
+            authors_text = ', '.join(authors)
+            if len(paper['authors']) > 5:
+                authors_text += ' et al.'
+            category_name = self.get_category_name(paper.get('primary_category', paper['venue']))
+            links = None
+            if (paper['pdf_url'] != f"http://arxiv.org/pdf/{paper['id']}"
+                    or paper['arxiv_url'] != f"http://arxiv.org/abs/{paper['id']}"):
+                links = [paper['pdf_url'], paper['arxiv_url']]
+            entries.append(([paper['id'], paper['title'], authors_text, paper['published'],
+                             paper.get('conference') or ''], category_name, paper.get('tags', []), links))
+            
+            abstracts.append(paper['abstract'])
+            ordinal = total - 1 - position
+            if ordinal % self.ABSTRACT_CHUNK_SIZE == 0:
+                abstracts.reverse()
+                written += write_text_if_changed(list_dir / f"abstracts-{ordinal // self.ABSTRACT_CHUNK_SIZE}.json",
+                                                 json.dumps(abstracts, ensure_ascii=False, separators=(',', ':')))
+                abstracts = []
+        entries.reverse()
+        
+        tags, tag_index = [], {}
+        categories, category_index = [], {}
+        rows = []
+        for row, category_name, paper_tags, links in entries:
+            if category_name not in category_index:
+                category_index[category_name] = len(categories)
+                categories.append(category_name)
+            tag_ids = []
+            for tag in paper_tags:
+                if tag not in tag_index:
+                    tag_index[tag] = len(tags)
+                    tags.append(tag)
+                tag_ids.append(tag_index[tag])
+            row.extend([category_index[category_name], tag_ids])
+            if links:
+                row.extend(links)
+            rows.append(row)
+        
+        data = {
+            'version': 1,
+            'count': len(rows),
+            'abstract_chunk': self.ABSTRACT_CHUNK_SIZE,
+            'tags': tags,
+            'categories': categories,
+            'papers': rows,
+        }
+        written += write_text_if_changed(list_dir / "papers.json",
+                                         json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+        
+        for stale in list_dir.glob("abstracts-*.json"):
+            number = stale.stem[len("abstracts-"):]
+            if number.isdigit() and int(number) >= chunk_count:
+                stale.unlink()
+        if self.manifest is not None:
+            self.manifest.record("list/papers.json", input_hash)
+        
+        logger.info(f"生成列表数据: {len(rows)} 篇论文，{chunk_count} 个摘要文件（更新 {written} 个文件）")
+    
+    def generate_search_index(self):
+        """生成客户端搜索索引（序号与页面中论文卡片的 data-ordinal 一致）
+        
+        序号从最旧的论文开始编号，新增论文时已有论文的倒排表不变，只有新论文涉及的分片会被重写。
+        """
+        per_page = self.papers_per_page if self.page_count() > 1 else 0
+        version = (self.TEMPLATE_HASH, str(per_page))
+        hashes = self.paper_hashes()[::-1]
+        input_hash = inputs_hash(version, hashes)
+        manifest = self.manifest or BuildManifest(self.output_dir, enabled=False)
+        if manifest.is_fresh("search/meta.json", input_hash):
+            logger.info("搜索索引未改变，跳过生成")
+            return
+        
+        # 上次索引的论文都没有变化（只新增了论文）时，在已有索引后追加
+        start = 0
+        entry = manifest.get("search/meta.json")
+        if entry is not None and len(entry) > 2 and 0 < entry[2] < len(hashes):
+            if inputs_hash(version, hashes[:entry[2]]) == entry[0]:
+                start = entry[2]
+        
+        try:
+            stats = self._write_search_index(start, per_page)
+        except ValueError as e:
+            # 已有索引与清单不一致（例如只恢复了部分输出目录），改为完整生成
+            if not start:
+                raise
+            logger.warning(f"{e}，重新生成完整的搜索索引")
+            start = 0
+            stats = self._write_search_index(start, per_page)
+        manifest.record("search/meta.json", input_hash, len(hashes))
+        logger.info(f"生成搜索索引: {stats['terms']} 个词，{stats['shards']} 个分片（"
+                    f"{'追加 ' + str(len(hashes) - start) + ' 篇，' if start else ''}更新 {stats['written']} 个文件）")
+    
+    def _write_search_index(self, start: int, per_page: int) -> Dict:
+        """索引序号从 start 开始的论文；start > 0 时追加到已有索引，已有索引不一致时抛出 ValueError"""
+        builder = SearchIndexBuilder(start)
+        # 从新到旧流式读取，读到序号 start 为止（追加时只读取新论文）
+        total = len(self.papers)
+        for position, paper in enumerate(islice(self.papers, total - start)):
+            builder.add(paper, total - 1 - position)
+        return builder.write(self.output_dir, per_page, append=start > 0)
+    
     def run(self):
         """运行生成流程"""
         logger.info("开始生成静态网页...")
         
-        self.load_papers()
-        self.generate_css()
-        self.generate_js()
-        self.generate_index_html()
+        metrics = self.metrics
+        try:
+            with metrics.stage('load'):
+                self.load_papers()
+                self.manifest = BuildManifest(self.output_dir, enabled=self.incremental)
+            with metrics.stage('assets'):
+                self.generate_css()
+                self.generate_js()
+                self.generate_assets()
+            with metrics.stage('render'):
+                self.generate_index_html()
+            with metrics.stage('site_data'):
+                self.generate_site_data()
+                if self.render_mode == "virtual":
+                    self.generate_list_data()
+            if self.search_index:
+                with metrics.stage('search_index'):
+                    self.generate_search_index()
+            self.manifest.save()
+            if self.precompress:
+                with metrics.stage('precompress'):
+                    self.precompress_output()
+            metrics.increment('papers', len(self.papers))
+            metrics.increment('outputs_rebuilt', self.manifest.rebuilt)
+            metrics.increment('outputs_skipped', self.manifest.skipped)
         
-        logger.info(f"网页生成完成! 输出目录: {self.output_dir}")
+            logger.info(f"网页生成完成! 输出目录: {self.output_dir}"
+                        f"（增量构建: 跳过 {self.manifest.skipped} 个输出，重新生成 {self.manifest.rebuilt} 个）")
+        finally:
+            metrics.save()
 
 
 def main():
-    generator = HTMLGenerator()
+    parser = argparse.ArgumentParser(description="生成静态网页")
+    parser.add_argument('--full', action='store_true', help="忽略增量构建清单，重新生成全部页面")
+    args = parser.parse_args()
+    
+    config = {}
+    config_path = Path("config.yaml")
+    if config_path.exists():
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f) or {}
+    output = config.get('output') or {}
+    generator = HTMLGenerator(data_path=output.get('papers_path', 'data/papers'),
+                              papers_per_page=output.get('papers_per_page', 50),
+                              search_index=output.get('search_index', True),
+                              render_mode=output.get('render_mode', 'static'),
+                              incremental=output.get('incremental', True) and not args.full,
+                              workers=output.get('workers') or None,
+                              parallel_min_papers=output.get('parallel_min_papers', 2000),
+                              minify=output.get('minify', False),
+                              fingerprint_assets=output.get('fingerprint_assets', False),
+                              precompress=output.get('precompress', False),
+                              metrics=RunMetrics.from_config(config, 'generate'))
     generator.run()
 
 
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+关键词分类
+把 config.yaml 中各领域的关键词编译成一个 Aho-Corasick 自动机，一次扫描找出文本命中的所有领域
+"""
+
+import re
+from typing import Dict, Iterable, List, Sequence
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def tokenize(text: str) -> List[str]:
+    """把文本切分为小写的词和标点，并去掉简单的复数词尾（models -> model）
+
+    关键词和正文使用同一套规则，因此 "language model" 能匹配 "language models"，
+    但 "control" 不会匹配 "controller"。
+    """
+    return [
+        t[:-1] if len(t) > 3 and t[-1] == 's' and t[-2] != 's' else t
+        for t in _TOKEN_RE.findall(text.lower())
+    ]
+
+
+class _Automaton:
+    """在任意符号序列（字符或词）上运行的 Aho-Corasick 自动机，输出为模式所属的标签下标"""
+
+    def __init__(self, patterns: Iterable[tuple]):
+        # patterns: (符号序列, 标签下标)
+        self.goto: List[Dict] = [{}]
+        self.output: List[frozenset] = [frozenset()]
+        outputs = [set()]
+        for symbols, label in patterns:
+            if not symbols:
+                continue
+            state = 0
+            for symbol in symbols:
+                next_state = self.goto[state].get(symbol)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][symbol] = next_state
+                    self.goto.append({})
+                    outputs.append(set())
+                state = next_state
+            outputs[state].add(label)
+
+        # 按 BFS 顺序计算失败指针，并沿失败指针合并输出
+        self.fail = [0] * len(self.goto)
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for symbol, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and symbol not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(symbol, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                outputs[next_state] |= outputs[self.fail[next_state]]
+        self.output = [frozenset(o) for o in outputs]
+
+    def labels(self, symbols: Sequence, label_count: int) -> set:
+        """扫描一次序列，返回命中的标签下标；全部标签都命中后提前结束"""
+        goto, fail, output = self.goto, self.fail, self.output
+        found = set()
+        state = 0
+        for symbol in symbols:
+            while state and symbol not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(symbol, 0)
+            if output[state]:
+                found |= output[state]
+                if len(found) == label_count:
+                    break
+        return found
+
+
+class KeywordMatcher:
+    """多关键词分类器
+
+    word_boundary=True 时按词匹配（关键词必须与完整的词序列对齐）；
+    否则与旧实现一样按子串匹配。两种模式的开销都只与文本长度有关，与关键词数量无关。
+    """
+
+    def __init__(self, categories: Dict[str, Iterable[str]], word_boundary: bool = True):
+        self.categories = list(categories)
+        self.word_boundary = word_boundary
+        patterns = []
+        for label, category in enumerate(self.categories):
+            for keyword in categories[category]:
+                symbols = tokenize(keyword) if word_boundary else keyword.lower()
+                patterns.append((tuple(symbols), label))
+        self._automaton = _Automaton(patterns)
+
+    @classmethod
+    def from_config(cls, config: dict) -> 'KeywordMatcher':
+        """从 config.yaml 的 categories 和 classification 配置构建"""
+        categories = {
+            name: (info or {}).get('keywords', [])
+            for name, info in (config.get('categories') or {}).items()
+        }
+        options = config.get('classification') or {}
+        return cls(categories, word_boundary=options.get('word_boundary', True))
+
+    def classify(self, text: str) -> List[str]:
+        """返回文本命中的领域（按配置顺序）"""
+        symbols = tokenize(text) if self.word_boundary else text.lower()
+        labels = self._automaton.labels(symbols, len(self.categories))
+        return [self.categories[i] for i in sorted(labels)]
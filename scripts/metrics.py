@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+运行指标
+记录抓取（fetch）和生成网页（generate）各阶段的耗时、计数和分布，
+写成 JSON 运行报告，并可写出 Prometheus textfile（node_exporter 的 textfile collector），
+用于观察语料增长时哪个阶段在变慢。
+
+- 阶段：墙钟时间、CPU 时间（进入阶段的线程）、调用次数；
+  在主线程中运行的阶段还记录读写字节数和阶段结束时的峰值内存
+  （读写字节数来自 /proc/self/io 的 rchar/wchar，即 read/write 系统调用的字节数，只在 Linux 上可用，
+  不包含 socket 的 recv/send，也不包含进程池子进程的读写；CPU 时间同样不包含子进程）
+- 计数：例如 API 重试次数、抓取的论文数
+- 分布：例如每页 API 请求的延迟
+"""
+
+import json
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    from .storage import write_text_if_changed
+except ImportError:
+    from storage import write_text_if_changed
+
+logger = logging.getLogger(__name__)
+
+METRICS_VERSION = 1
+# Prometheus 指标名前缀
+METRIC_PREFIX = "dailypaper"
+# 延迟分布的直方图桶（秒）
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_PROC_IO = Path("/proc/self/io")
+
+
+def io_counters() -> Optional[Tuple[int, int]]:
+    """进程累计通过 read/write 系统调用读写的字节数，只在 Linux 上可用"""
+    try:
+        fields = dict(line.split(': ') for line in _PROC_IO.read_text().splitlines())
+    except (OSError, ValueError):
+        return None
+    return int(fields['rchar']), int(fields['wchar'])
+
+
+def peak_rss() -> Optional[int]:
+    """进程的峰值常驻内存（字节）"""
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 上单位为 KB，macOS 上为字节
+    return maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+
+def _key(name: str, labels: Dict) -> Tuple[str, Tuple]:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape_label(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _quantile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class RunMetrics:
+    """一次运行的指标；可在多个线程中同时记录
+
+    enabled=False 时所有记录操作都不做任何事，调用方不需要判断是否启用。
+    """
+
+    def __init__(self, job: str, report_dir: Optional[str] = None,
+                 prometheus_dir: Optional[str] = None, enabled: bool = True):
+        self.job = job
+        self.report_dir = Path(report_dir) if report_dir else None
+        self.prometheus_dir = Path(prometheus_dir) if prometheus_dir else None
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        # (名称, 标签) -> [调用次数, 墙钟时间, CPU 时间, 读字节, 写字节, 峰值内存]
+        self._stages: Dict[Tuple, list] = {}
+        self._counters: Dict[Tuple, float] = {}
+        self._observations: Dict[Tuple, List[float]] = {}
+        self._started = datetime.now(timezone.utc)
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        self._io_start = io_counters()
+
+    @classmethod
+    def from_config(cls, config: dict, job: str) -> 'RunMetrics':
+        """按 config.yaml 的 metrics 配置创建"""
+        options = config.get('metrics') or {}
+        return cls(job, report_dir=options.get('report_dir', '.cache/metrics'),
+                   prometheus_dir=options.get('prometheus_dir'),
+                   enabled=options.get('enabled', True))
+
+    def __getstate__(self):
+        # 交给子进程时不携带已记录的指标，子进程中的记录也不会传回
+        return {'job': self.job, 'report_dir': None, 'prometheus_dir': None, 'enabled': False}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    @contextmanager
+    def stage(self, name: str, **labels) -> Iterator[None]:
+        """计量一个阶段；同名同标签的阶段多次进入时累加"""
+        if not self.enabled:
+            yield
+            return
+        main_thread = threading.current_thread() is threading.main_thread()
+        io_before = io_counters() if main_thread else None
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.thread_time() - cpu
+            io_after = io_counters() if io_before else None
+            with self._lock:
+                entry = self._stages.setdefault(_key(name, labels), [0, 0.0, 0.0, None, None, None])
+                entry[0] += 1
+                entry[1] += wall
+                entry[2] += cpu
+                if io_after:
+                    entry[3] = (entry[3] or 0) + io_after[0] - io_before[0]
+                    entry[4] = (entry[4] or 0) + io_after[1] - io_before[1]
+                if main_thread:
+                    entry[5] = peak_rss()
+
+    def increment(self, name: str, value: float = 1, **labels):
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        """记录一个取值（例如一次请求的延迟）"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._observations.setdefault(_key(name, labels), []).append(value)
+
+    def report(self) -> Dict:
+        io_end = io_counters()
+        stages = [
+            {'name': name, 'labels': dict(labels), 'calls': calls,
+             'wall_seconds': round(wall, 6), 'cpu_seconds': round(cpu, 6),
+             'read_bytes': read, 'write_bytes': written, 'peak_rss_bytes': rss}
+            for (name, labels), (calls, wall, cpu, read, written, rss) in self._stages.items()
+        ]
+        observations = []
+        for (name, labels), values in self._observations.items():
+            observations.append({
+                'name': name, 'labels': dict(labels), 'count': len(values), 'sum': round(sum(values), 6),
+                'min': round(min(values), 6), 'max': round(max(values), 6),
+                'p50': round(_quantile(values, 0.5), 6), 'p95': round(_quantile(values, 0.95), 6),
+            })
+        return {
+            'version': METRICS_VERSION,
+            'job': self.job,
+            'started': self._started.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'finished': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'wall_seconds': round(time.perf_counter() - self._wall_start, 6),
+            'cpu_seconds': round(time.process_time() - self._cpu_start, 6),
+            'read_bytes': io_end[0] - self._io_start[0] if io_end and self._io_start else None,
+            'write_bytes': io_end[1] - self._io_start[1] if io_end and self._io_start else None,
+            'peak_rss_bytes': peak_rss(),
+            'stages': stages,
+            'counters': [{'name': name, 'labels': dict(labels), 'value': value}
+                         for (name, labels), value in self._counters.items()],
+            'observations': observations,
+        }
+
+    def prometheus_text(self, report: Optional[Dict] = None) -> str:
+        """Prometheus 文本格式（所有指标带 run 标签；job 标签留给抓取配置使用）"""
+        report = report or self.report()
+        lines = []
+
+        def family(metric: str, kind: str, help_text: str):
+            lines.append(f"# HELP {METRIC_PREFIX}_{metric} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{metric} {kind}")
+
+        def sample(metric: str, labels: Dict, value):
+            labels = {'run': self.job, **labels}
+            rendered = ','.join(f'{k}="{_escape_label(v)}"' for k, v in labels.items())
+            lines.append(f"{METRIC_PREFIX}_{metric}{{{rendered}}} {value}")
+
+        family('run_wall_seconds', 'gauge', "Wall time of the whole run")
+        sample('run_wall_seconds', {}, report['wall_seconds'])
+        family('run_cpu_seconds', 'gauge', "CPU time of the whole run")
+        sample('run_cpu_seconds', {}, report['cpu_seconds'])
+        family('run_finished_timestamp_seconds', 'gauge', "Unix time when the run finished")
+        sample('run_finished_timestamp_seconds', {}, int(time.time()))
+        for field in ('read_bytes', 'write_bytes', 'peak_rss_bytes'):
+            if report[field] is not None:
+                family(f'run_{field}', 'gauge', f"{field.replace('_', ' ').capitalize()} of the whole run")
+                sample(f'run_{field}', {}, report[field])
+
+        for field, help_text in (('wall_seconds', "Wall time per stage"), ('cpu_seconds', "CPU time per stage"),
+                                 ('calls', "Number of times the stage ran"),
+                                 ('read_bytes', "Bytes read during the stage"),
+                                 ('write_bytes', "Bytes written during the stage")):
+            rows = [s for s in report['stages'] if s[field] is not None]
+            if rows:
+                family(f'stage_{field}', 'gauge', help_text)
+                for s in rows:
+                    sample(f'stage_{field}', {'stage': s['name'], **s['labels']}, s[field])
+
+        # 计数只是本次运行的值，每次运行都从 0 开始，按 gauge 导出（counter 会让 rate() 把每次运行当成重置）
+        names = sorted({c['name'] for c in report['counters']})
+        for name in names:
+            family(name, 'gauge', f"Count of {name.replace('_', ' ')} in the run")
+            for c in report['counters']:
+                if c['name'] == name:
+                    sample(name, c['labels'], c['value'])
+
+        for name in sorted({name for name, _ in self._observations}):
+            family(name, 'histogram', f"Distribution of {name.replace('_', ' ')}")
+            for (obs_name, labels), values in self._observations.items():
+                if obs_name != name:
+                    continue
+                labels = dict(labels)
+                for bound in LATENCY_BUCKETS:
+                    sample(f'{name}_bucket', {**labels, 'le': bound}, sum(1 for v in values if v <= bound))
+                sample(f'{name}_bucket', {**labels, 'le': '+Inf'}, len(values))
+                sample(f'{name}_sum', labels, round(sum(values), 6))
+                sample(f'{name}_count', labels, len(values))
+        return '\n'.join(lines) + '\n'
+
+    def save(self) -> Optional[Dict]:
+        """写出 <report_dir>/<job>.json 和（配置了 prometheus_dir 时）<prometheus_dir>/dailypaper_<job>.prom"""
+        if not self.enabled:
+            return None
+        report = self.report()
+        if self.report_dir:
+            self.report_dir.mkdir(parents=True, exist_ok=True)
+            write_text_if_changed(self.report_dir / f"{self.job}.json",
+                                  json.dumps(report, ensure_ascii=False, indent=2))
+        if self.prometheus_dir:
+            self.prometheus_dir.mkdir(parents=True, exist_ok=True)
+            # 写入临时文件再替换，textfile collector 不会读到写了一半的文件
+            write_text_if_changed(self.prometheus_dir / f"{METRIC_PREFIX}_{self.job}.prom",
+                                  self.prometheus_text(report))
+        self.log_summary(report)
+        return report
+
+    def log_summary(self, report: Dict, limit: int = 8):
+        """在日志中列出耗时最多的阶段"""
+        stages = sorted(report['stages'], key=lambda s: s['wall_seconds'], reverse=True)[:limit]
+        summary = '，'.join(
+            f"{s['name']}{'[' + ','.join(s['labels'].values()) + ']' if s['labels'] else ''} {s['wall_seconds']:.2f}s"
+            for s in stages
+        )
+        peak = report['peak_rss_bytes']
+        logger.info(f"运行指标（{self.job}）: 共 {report['wall_seconds']:.2f}s，CPU {report['cpu_seconds']:.2f}s"
+                    f"{f'，峰值内存 {peak / 1024 / 1024:.0f}MB' if peak else ''}；{summary}")
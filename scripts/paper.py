@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+紧凑的论文记录
+用 __slots__ 代替 dict，并对大量重复的字段做驻留（intern），加载全部历史论文时显著减少内存占用
+"""
+
+import sys
+from collections.abc import Sequence
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+# 存储中的字段顺序（与 PaperFetcher 生成的记录一致，to_dict 按此顺序输出）
+FIELDS = (
+    'id', 'title', 'authors', 'abstract', 'published', 'updated',
+    'categories', 'primary_category', 'pdf_url', 'arxiv_url',
+    'source', 'venue', 'comment', 'conference', 'tags',
+)
+
+# 取值集合很小、在论文之间大量重复的字段
+_INTERNED_FIELDS = frozenset(('published', 'updated', 'primary_category', 'source', 'venue', 'conference'))
+# 整个元组在论文之间大量重复的列表字段
+_SHARED_TUPLE_FIELDS = frozenset(('categories', 'tags'))
+# 可以由 id 推导的链接字段 -> 前缀
+_DERIVED_URLS = {
+    'pdf_url': 'http://arxiv.org/pdf/',
+    'arxiv_url': 'http://arxiv.org/abs/',
+}
+
+_UNSET = object()    # 原记录中没有这个字段
+_DERIVED = object()  # 链接与由 id 推导出的值相同，不单独保存
+
+_shared_tuples: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+def _intern_tuple(values: Iterable) -> Tuple:
+    return tuple(_intern(v) for v in values)
+
+
+def _shared_tuple(values: Iterable) -> Tuple:
+    """相同内容的元组只保留一份"""
+    t = _intern_tuple(values)
+    return _shared_tuples.setdefault(t, t)
+
+
+class Paper:
+    """一篇论文
+
+    兼容原来的 dict 用法（paper['title']、paper.get('tags', [])、paper['tags'] = [...]、'comment' in paper）。
+    与 JSON 互转无损：
+    - 列表字段在内存中保存为元组，to_dict 时还原为列表
+    - 原记录中不存在的字段不会凭空出现，未知字段原样保留
+    """
+
+    __slots__ = tuple(f for f in FIELDS if f not in _DERIVED_URLS) + ('_pdf_url', '_arxiv_url', '_extra')
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, _UNSET)
+        self._extra = None
+        for name, value in fields.items():
+            self[name] = value
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Paper':
+        paper = cls()
+        # 先设置 id，链接字段才能判断是否可以由 id 推导
+        if 'id' in data:
+            paper['id'] = data['id']
+        for name, value in data.items():
+            if name != 'id':
+                paper[name] = value
+        return paper
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {}
+        for name in FIELDS:
+            value = self._get(name)
+            if value is _UNSET:
+                continue
+            data[name] = list(value) if type(value) is tuple else value
+        if self._extra:
+            data.update(self._extra)
+        return data
+
+    # ---- dict 兼容接口 ----
+
+    def _get(self, name: str):
+        if name in _DERIVED_URLS:
+            value = getattr(self, '_' + name)
+            if value is _DERIVED:
+                return _DERIVED_URLS[name] + self.id
+            return value
+        if name in FIELDS:
+            return getattr(self, name)
+        if self._extra and name in self._extra:
+            return self._extra[name]
+        return _UNSET
+
+    def __getitem__(self, name: str):
+        value = self._get(name)
+        if value is _UNSET:
+            raise KeyError(name)
+        return value
+
+    def get(self, name: str, default=None):
+        value = self._get(name)
+        return default if value is _UNSET else value
+
+    def __contains__(self, name: str) -> bool:
+        return self._get(name) is not _UNSET
+
+    def __setitem__(self, name: str, value):
+        if name in _DERIVED_URLS:
+            if type(value) is str and type(self.id) is str and value == _DERIVED_URLS[name] + self.id:
+                value = _DERIVED
+            setattr(self, '_' + name, value)
+        elif name in FIELDS:
+            if name in _INTERNED_FIELDS:
+                value = _intern(value)
+            elif name == 'authors' and isinstance(value, (list, tuple)):
+                # 作者名在论文之间重复，但作者列表本身很少重复
+                value = _intern_tuple(value)
+            elif name in _SHARED_TUPLE_FIELDS and isinstance(value, (list, tuple)):
+                value = _shared_tuple(value)
+            setattr(self, name, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[name] = value
+
+    def keys(self) -> Iterator[str]:
+        return iter(self.to_dict())
+
+    def __iter__(self) -> Iterator[str]:
+        return self.keys()
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Paper):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        # 哨兵对象在其他进程中不是同一个实例，跨进程传递时按 dict 重建
+        return Paper.from_dict, (self.to_dict(),)
+
+    def __repr__(self) -> str:
+        return f"Paper(id={self.get('id')!r}, title={self.get('title')!r})"
+
+
+def to_records(papers: Iterable) -> Iterator[Dict]:
+    """转换为可以直接 JSON 序列化的 dict（已经是 dict 的原样返回）"""
+    for paper in papers:
+        yield paper.to_dict() if isinstance(paper, Paper) else paper
+
+
+def from_records(records: Iterable[Dict]) -> Iterator[Paper]:
+    """逐条转换为 Paper"""
+    for record in records:
+        yield Paper.from_dict(record)
+
+
+class StoredPapers(Sequence):
+    """存储中论文的只读序列（从新到旧）：内存中只保留篇数，遍历和切片时从存储流式读取
+
+    切片只为区间内的论文构建 Paper，读到区间末尾即停止；语料很大而只需要其中几页时，不必加载全部论文。
+    store 为 storage.open_store 返回的任一种存储，count 为其中的论文数。
+    """
+
+    def __init__(self, store, count: int):
+        self.store = store
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Paper]:
+        return from_records(islice(self.store.iter_papers(), self._count))
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            positions = range(*key.indices(self._count))
+            if not positions:
+                return []
+            low, high = min(positions), max(positions) + 1
+            papers = list(from_records(islice(self.store.iter_papers(), low, high)))
+            return papers if positions.step == 1 else [papers[i - low] for i in positions]
+        if key < 0:
+            key += self._count
+        if not 0 <= key < self._count:
+            raise IndexError(key)
+        return next(from_records(islice(self.store.iter_papers(), key, key + 1)))
+
+    def iter_slices(self, ranges: Iterable[Tuple[int, int]]) -> Iterator[List[Paper]]:
+        """依次取出若干 [start, end) 区间（起始下标递增、互不重叠），整个过程只读一遍存储"""
+        records = self.store.iter_papers()
+        position = 0
+        for start, end in ranges:
+            # 跳过区间之间的论文时只解析 JSON，不构建 Paper
+            for _ in islice(records, start - position):
+                pass
+            yield list(from_records(islice(records, end - start)))
+            position = end
+
+
+def iter_slices(papers: Sequence, ranges: Iterable[Tuple[int, int]]) -> Iterator[List]:
+    """依次取出 papers 中的若干区间；papers 为 StoredPapers 时只读一遍存储"""
+    if isinstance(papers, StoredPapers):
+        yield from papers.iter_slices(ranges)
+        return
+    for start, end in ranges:
+        yield list(papers[start:end])
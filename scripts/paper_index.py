@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+论文的内存索引
+遍历一次语料，建立 发表日期 / 标签 / 会议 / 主类别 / 作者 -> 论文序号 的映射，并预先统计计数，
+按这些字段取论文或计数时不再扫描全部论文。
+
+序号为论文加入索引的顺序（从 0 开始）；按加载顺序（从新到旧）建立时，查询结果也是从新到旧，
+与在论文列表上逐篇过滤的结果相同。新论文可以随时用 add / extend 追加，不需要重建。
+
+fields 指定建立哪些倒排表（默认全部）；只需要计数时可以只建需要的部分，例如作者倒排表在 10 万篇时约占 10MB。
+已发表/预印本计数总是统计。
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 可以建立倒排表的字段
+FIELDS = ('date', 'tag', 'conference', 'primary_category', 'author')
+
+
+def _append(index: Dict[str, List[int]], key: str, ordinal: int):
+    """同一篇论文的重复取值（例如同名作者）只记录一次"""
+    ordinals = index.setdefault(key, [])
+    if not ordinals or ordinals[-1] != ordinal:
+        ordinals.append(ordinal)
+
+
+class PaperIndex:
+    """论文列表和各字段的倒排表"""
+
+    def __init__(self, papers: Iterable[Dict] = (), fields: Tuple[str, ...] = FIELDS):
+        unknown = set(fields) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"未知的索引字段: {', '.join(sorted(unknown))}")
+        self.fields = tuple(fields)
+        self.papers: List[Dict] = []
+        # 没有建立的倒排表为 None
+        self.by_date: Optional[Dict[str, List[int]]] = {} if 'date' in fields else None
+        self.by_tag: Optional[Dict[str, List[int]]] = {} if 'tag' in fields else None
+        self.by_conference: Optional[Dict[str, List[int]]] = {} if 'conference' in fields else None
+        self.by_primary_category: Optional[Dict[str, List[int]]] = {} if 'primary_category' in fields else None
+        self.by_author: Optional[Dict[str, List[int]]] = {} if 'author' in fields else None
+        # 有会议/期刊信息的论文数（其余为预印本）
+        self.published = 0
+        self.extend(papers)
+
+    def __len__(self) -> int:
+        return len(self.papers)
+
+    @property
+    def preprint(self) -> int:
+        return len(self.papers) - self.published
+
+    def add(self, paper: Dict) -> int:
+        """追加一篇论文，返回它的序号"""
+        ordinal = len(self.papers)
+        self.papers.append(paper)
+        published = paper.get('published')
+        if published and self.by_date is not None:
+            self.by_date.setdefault(published, []).append(ordinal)
+        if self.by_tag is not None:
+            for tag in paper.get('tags') or ():
+                _append(self.by_tag, tag, ordinal)
+        conference = paper.get('conference')
+        if conference:
+            self.published += 1
+            if self.by_conference is not None:
+                self.by_conference.setdefault(conference, []).append(ordinal)
+        category = paper.get('primary_category')
+        if category and self.by_primary_category is not None:
+            self.by_primary_category.setdefault(category, []).append(ordinal)
+        if self.by_author is not None:
+            for author in paper.get('authors') or ():
+                _append(self.by_author, author, ordinal)
+        return ordinal
+
+    def extend(self, papers: Iterable[Dict]):
+        if not self.fields:
+            # 不建立倒排表时只需要统计已发表的论文数
+            start = len(self.papers)
+            self.papers.extend(papers)
+            self.published += sum(1 for paper in self.papers[start:] if paper.get('conference'))
+            return
+        for paper in papers:
+            self.add(paper)
+
+    def _postings(self, field: str) -> Dict[str, List[int]]:
+        postings = getattr(self, f'by_{field}')
+        if postings is None:
+            raise ValueError(f"索引没有建立 {field} 倒排表（fields={self.fields}）")
+        return postings
+
+    def _select(self, field: str, key: str) -> List[Dict]:
+        papers = self.papers
+        return [papers[i] for i in self._postings(field).get(key) or ()]
+
+    def _count(self, field: str) -> Dict[str, int]:
+        return {key: len(ordinals) for key, ordinals in self._postings(field).items()}
+
+    # ---- 查询（结果按加入顺序） ----
+
+    def papers_by_date(self, date: str) -> List[Dict]:
+        return self._select('date', date)
+
+    def papers_by_tag(self, tag: str) -> List[Dict]:
+        return self._select('tag', tag)
+
+    def papers_by_conference(self, conference: str) -> List[Dict]:
+        return self._select('conference', conference)
+
+    def papers_by_primary_category(self, category: str) -> List[Dict]:
+        return self._select('primary_category', category)
+
+    def papers_by_author(self, author: str) -> List[Dict]:
+        return self._select('author', author)
+
+    # ---- 计数（每篇论文的同一取值只计一次） ----
+
+    def count_by_date(self) -> Dict[str, int]:
+        return self._count('date')
+
+    def count_by_tag(self) -> Dict[str, int]:
+        return self._count('tag')
+
+    def count_by_conference(self) -> Dict[str, int]:
+        return self._count('conference')
+
+    def count_by_primary_category(self) -> Dict[str, int]:
+        return self._count('primary_category')
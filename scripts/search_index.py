@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+客户端搜索索引
+把论文的标题、作者、摘要和会议切分为词，生成 词 -> 论文序号 的倒排索引，
+按词的前两个字符分片写入 docs/search/，main.js 按需加载分片并对倒排表求交集。
+
+倒排表先做差分，再用 base64url 字符的变长编码（每个字符 5 位数据 + 1 位续位）压缩成字符串。
+序号从最旧的论文开始编号，只新增论文时可以在已有索引后追加，不必重建。
+"""
+
+import json
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+try:
+    from .storage import write_text_if_changed
+except ImportError:
+    from storage import write_text_if_changed
+
+SEARCH_INDEX_VERSION = 1
+# 分片键的长度：查询词至少需要这么多字符
+PREFIX_LENGTH = 2
+
+_TERM_RE = re.compile(r"\w+")
+_SAFE_SHARD_RE = re.compile(r"[a-z0-9]+")
+_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+_DECODE = {c: i for i, c in enumerate(_ALPHABET)}
+
+
+def normalize_term(token: str) -> str:
+    """去掉简单的复数词尾（与 main.js 中的 normalizeTerm 保持一致）"""
+    if len(token) > 3 and token[-1] == 's' and token[-2] != 's':
+        return token[:-1]
+    return token
+
+
+def index_terms(text: str) -> Set[str]:
+    """文本中可检索的词（小写，至少 PREFIX_LENGTH 个字符）"""
+    return {normalize_term(t) for t in _TERM_RE.findall(text.lower()) if len(t) >= PREFIX_LENGTH}
+
+
+def encode_postings(ordinals: Iterable[int], previous: int = -1) -> str:
+    """把递增的论文序号编码为紧凑的字符串；previous 为已编码部分的最后一个序号（追加时使用）"""
+    chars = []
+    for ordinal in ordinals:
+        gap = ordinal - previous - 1
+        previous = ordinal
+        while True:
+            digit = gap & 0x1f
+            gap >>= 5
+            if gap:
+                chars.append(_ALPHABET[digit | 0x20])
+            else:
+                chars.append(_ALPHABET[digit])
+                break
+    return ''.join(chars)
+
+
+def decode_postings(encoded: str) -> List[int]:
+    ordinals = []
+    previous = -1
+    gap = shift = 0
+    for char in encoded:
+        digit = _DECODE[char]
+        gap |= (digit & 0x1f) << shift
+        if digit & 0x20:
+            shift += 5
+            continue
+        previous += gap + 1
+        ordinals.append(previous)
+        gap = shift = 0
+    return ordinals
+
+
+def shard_name(term: str) -> str:
+    """词所在分片的文件名（不含扩展名）；非 ASCII 前缀用十六进制表示"""
+    prefix = term[:PREFIX_LENGTH]
+    if _SAFE_SHARD_RE.fullmatch(prefix):
+        return prefix
+    return 'x' + prefix.encode('utf-8').hex()
+
+
+def _append_postings(encoded: str, ordinals: List[int]) -> str:
+    existing = decode_postings(encoded)
+    return encoded + encode_postings(ordinals, existing[-1] if existing else -1)
+
+
+def _load_json(path: Path, default):
+    if not path.exists():
+        return default
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class SearchIndexBuilder:
+    """逐篇添加论文，最后写出分片索引
+
+    默认按序号从小到大（从最旧的论文开始）编号；也可以给出序号按任意顺序添加（例如从新到旧流式读取时），
+    写出前倒排表会按序号排序。
+    start > 0 时只添加序号从 start 开始的新论文，write(append=True) 把它们合并到已有的索引文件中。
+    """
+
+    def __init__(self, start: int = 0):
+        self.start = start
+        self.count = start
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        # 筛选条件（发表状态、研究领域）也保存为倒排表，搜索时可以直接求交集
+        self._facets: Dict[str, List[int]] = defaultdict(list)
+
+    def add(self, paper: Dict, ordinal: Optional[int] = None) -> int:
+        if ordinal is None:
+            ordinal = self.count
+        self.count = max(self.count, ordinal + 1)
+        text = ' '.join((
+            paper.get('title') or '',
+            ' '.join(paper.get('authors') or ()),
+            paper.get('abstract') or '',
+            paper.get('conference') or '',
+        ))
+        for term in index_terms(text):
+            self._postings[term].append(ordinal)
+
+        self._facets['status:' + ('published' if paper.get('conference') else 'preprint')].append(ordinal)
+        for tag in paper.get('tags') or ():
+            self._facets['tag:' + tag].append(ordinal)
+        return ordinal
+
+    def write(self, output_dir, per_page: int, append: bool = False) -> Dict:
+        """写入 <output_dir>/search/；只重写内容发生变化的文件，返回统计信息
+
+        append=True 时读取已有索引（必须恰好包含序号 0 ~ start-1），只重写新论文涉及的分片；
+        已有索引不一致或缺少文件时抛出 ValueError。
+        """
+        search_dir = Path(output_dir) / "search"
+        search_dir.mkdir(parents=True, exist_ok=True)
+
+        existing_shards: List[str] = []
+        if append:
+            meta = _load_json(search_dir / "meta.json", {})
+            if meta.get('version') != SEARCH_INDEX_VERSION or meta.get('count') != self.start:
+                raise ValueError(f"已有搜索索引无法追加: 需要 {self.start} 篇，实际为 {meta.get('count')}")
+            existing_shards = meta['shards']
+            missing = [f"{name}.json" for name in existing_shards if not (search_dir / f"{name}.json").exists()]
+            if not (search_dir / "facets.json").exists():
+                missing.append("facets.json")
+            if missing:
+                raise ValueError(f"已有搜索索引无法追加: 缺少 {', '.join(missing[:5])}"
+                                 f"{' 等 ' + str(len(missing)) + ' 个文件' if len(missing) > 5 else ''}")
+
+        # 按序号添加时已经有序（从新到旧添加时为逆序），排序的开销是线性的
+        for postings in (self._postings, self._facets):
+            for ordinals in postings.values():
+                ordinals.sort()
+
+        shards: Dict[str, Dict[str, List[int]]] = defaultdict(dict)
+        for term in self._postings:
+            shards[shard_name(term)][term] = self._postings[term]
+
+        written = 0
+        for name, terms in shards.items():
+            path = search_dir / f"{name}.json"
+            encoded = {}
+            if name in existing_shards:
+                shard = _load_json(path, {'terms': [], 'postings': []})
+                encoded = dict(zip(shard['terms'], shard['postings']))
+            for term, ordinals in terms.items():
+                encoded[term] = _append_postings(encoded[term], ordinals) if term in encoded else encode_postings(ordinals)
+            ordered = sorted(encoded)
+            data = json.dumps({'terms': ordered, 'postings': [encoded[t] for t in ordered]},
+                              ensure_ascii=False, separators=(',', ':'))
+            written += write_text_if_changed(path, data)
+
+        facets = _load_json(search_dir / "facets.json", {}) if append else {}
+        for key, ordinals in self._facets.items():
+            facets[key] = _append_postings(facets[key], ordinals) if key in facets else encode_postings(ordinals)
+        written += write_text_if_changed(search_dir / "facets.json",
+                                         json.dumps(dict(sorted(facets.items())), ensure_ascii=False,
+                                                    separators=(',', ':')))
+
+        all_shards = sorted(set(existing_shards) | set(shards))
+        meta = {
+            'version': SEARCH_INDEX_VERSION,
+            'count': self.count,
+            'per_page': per_page,
+            'prefix_length': PREFIX_LENGTH,
+            'shards': all_shards,
+        }
+        written += write_text_if_changed(search_dir / "meta.json", json.dumps(meta, separators=(',', ':')))
+
+        # 删除已经不存在的分片
+        if not append:
+            for stale in search_dir.glob("*.json"):
+                if stale.stem not in shards and stale.name not in ("facets.json", "meta.json"):
+                    stale.unlink()
+                    written += 1
+
+        return {'terms': len(self._postings), 'shards': len(all_shards), 'written': written}
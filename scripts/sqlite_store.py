@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+SQLite 论文存储（可选后端）
+路径以 .sqlite / .db 结尾时由 open_store 选用，与分片存储的接口相同（iter_papers / save_all / merge），
+静态网页生成和格式转换（python scripts/storage.py papers.sqlite data/papers）照常使用。
+
+在此之上提供按索引查询，供工具和报表使用：
+- published、conference、primary_category 上的索引
+- paper_tags 关联表（按标签查询和计数）
+- 标题和摘要的 FTS5 全文索引
+
+完整记录以 JSON 保存在 record 列中，与 JSON 存储互转无损；索引列只是其中字段的副本。
+"""
+
+import itertools
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    from .paper import Paper
+    from .storage import shard_key
+except ImportError:
+    from paper import Paper
+    from storage import shard_key
+
+SCHEMA_VERSION = 1
+# 单条 SQL 中 IN (...) 参数的最大个数
+_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    published TEXT,
+    conference TEXT,
+    primary_category TEXT,
+    title TEXT,
+    abstract TEXT,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS papers_published ON papers(published);
+CREATE INDEX IF NOT EXISTS papers_conference ON papers(conference);
+CREATE INDEX IF NOT EXISTS papers_primary_category ON papers(primary_category);
+
+CREATE TABLE IF NOT EXISTS paper_tags (
+    tag TEXT NOT NULL,
+    seq INTEGER NOT NULL REFERENCES papers(seq) ON DELETE CASCADE,
+    PRIMARY KEY (tag, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS paper_tags_seq ON paper_tags(seq);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+    title, abstract, content='papers', content_rowid='seq'
+);
+"""
+
+# 全文索引随 papers 表的增删改同步更新；整体写入时先插入数据再一次性重建全文索引，比逐行触发快数倍
+_TRIGGERS = """
+CREATE TRIGGER IF NOT EXISTS papers_fts_insert AFTER INSERT ON papers BEGIN
+    INSERT INTO papers_fts(rowid, title, abstract) VALUES (new.seq, new.title, new.abstract);
+END;
+CREATE TRIGGER IF NOT EXISTS papers_fts_delete AFTER DELETE ON papers BEGIN
+    INSERT INTO papers_fts(papers_fts, rowid, title, abstract) VALUES ('delete', old.seq, old.title, old.abstract);
+END;
+CREATE TRIGGER IF NOT EXISTS papers_fts_update AFTER UPDATE ON papers BEGIN
+    INSERT INTO papers_fts(papers_fts, rowid, title, abstract) VALUES ('delete', old.seq, old.title, old.abstract);
+    INSERT INTO papers_fts(rowid, title, abstract) VALUES (new.seq, new.title, new.abstract);
+END;
+"""
+
+# 与分片存储相同的顺序：发表日期从新到旧，同一天内后合并的在前（seq 越大越晚插入）
+_ORDER = "ORDER BY published DESC, seq DESC"
+
+
+def _record(paper: Dict) -> Dict:
+    return paper.to_dict() if isinstance(paper, Paper) else paper
+
+
+def _row(record: Dict) -> tuple:
+    return (record['id'], record.get('published'), record.get('conference'), record.get('primary_category'),
+            record.get('title'), record.get('abstract'), json.dumps(record, ensure_ascii=False))
+
+
+def _fts_query(text: str) -> str:
+    """把用户输入的词逐个加引号（所有词都要出现），避免 FTS5 语法错误"""
+    return ' '.join('"' + token.replace('"', '""') + '"' for token in text.split())
+
+
+class SqliteStore:
+    """单文件 SQLite 存储
+
+    连接在首次使用时打开，用完后可以 close()；写操作都在一个事务中完成。
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = self._open(self.path)
+        return self._conn
+
+    @staticmethod
+    def _open(path: Path, records: Optional[List[Dict]] = None) -> sqlite3.Connection:
+        """打开数据库，新数据库先建表；records 为新数据库的初始内容（从新到旧）"""
+        conn = sqlite3.connect(str(path))
+        conn.execute("PRAGMA foreign_keys = ON")
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version == 0:
+            with conn:
+                conn.executescript(_SCHEMA)
+                if records:
+                    SqliteStore._insert(conn, records)
+                    conn.execute("INSERT INTO papers_fts(papers_fts) VALUES ('rebuild')")
+                conn.executescript(_TRIGGERS)
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        elif version != SCHEMA_VERSION:
+            conn.close()
+            raise ValueError(f"不支持的 SQLite 存储版本: {version}（{path}）")
+        return conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _records(self, sql: str, params: tuple = ()) -> List[Dict]:
+        if not self.exists():
+            return []
+        return [json.loads(row[0]) for row in self._connect().execute(sql, params)]
+
+    def _ids(self, sql: str, params: tuple = ()) -> List[str]:
+        if not self.exists():
+            return []
+        return [row[0] for row in self._connect().execute(sql, params)]
+
+    # ---- 与其他存储相同的接口 ----
+
+    def count(self) -> int:
+        if not self.exists():
+            return 0
+        return self._connect().execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+
+    def iter_papers(self) -> Iterator[Dict]:
+        """逐篇读取全部论文，从新到旧"""
+        if not self.exists():
+            return
+        for row in self._connect().execute(f"SELECT record FROM papers {_ORDER}"):
+            yield json.loads(row[0])
+
+    def load_all(self) -> List[Dict]:
+        return list(self.iter_papers())
+
+    @staticmethod
+    def _insert(conn: sqlite3.Connection, records: List[Dict]):
+        """插入论文和标签；records 按从新到旧的顺序，倒序插入使同一天内靠前的论文 seq 更大"""
+        conn.executemany(
+            "INSERT INTO papers (id, published, conference, primary_category, title, abstract, record) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (_row(record) for record in reversed(records)))
+        conn.executemany(
+            "INSERT OR IGNORE INTO paper_tags (tag, seq) SELECT ?, seq FROM papers WHERE id = ?",
+            ((tag, record['id']) for record in records for tag in record.get('tags') or ()))
+
+    def save_all(self, papers: Iterable[Dict]) -> int:
+        """整体重写：写入临时数据库后替换原文件；返回写入的文件数"""
+        records = [_record(p) for p in papers]
+        records.sort(key=lambda x: x.get('published', ''), reverse=True)
+        self.close()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        tmp_path.unlink(missing_ok=True)
+        self._open(tmp_path, records).close()
+        os.replace(tmp_path, self.path)
+        return 1
+
+    def iter_shards(self) -> Iterator[Tuple[str, List[Dict]]]:
+        """按发表月份分组读取（与分片存储相同，供 update_venue 逐组处理）
+
+        每组一次查询并完整读出，调用方在遍历中写回（save_shard）时没有未结束的查询。
+        """
+        if not self.exists():
+            return
+        dates = [row[0] for row in self._connect().execute(
+            "SELECT DISTINCT published FROM papers ORDER BY published DESC")]
+        for key, group in itertools.groupby(dates, key=lambda date: shard_key({'published': date})):
+            group = list(group)
+            condition = f"published IN ({','.join('?' * len(group))})"
+            if None in group:
+                condition += " OR published IS NULL"
+            yield key, self._records(f"SELECT record FROM papers WHERE {condition} {_ORDER}", tuple(group))
+
+    def save_shard(self, key: str, papers: List[Dict]) -> bool:
+        """写回一组论文中内容变化的记录；返回是否实际写入"""
+        inserted, updated = self.upsert(papers)
+        return bool(inserted or updated)
+
+    def _existing_ids(self, ids: List[str]) -> set:
+        conn = self._connect()
+        existing = set()
+        for start in range(0, len(ids), _BATCH):
+            batch = ids[start:start + _BATCH]
+            placeholders = ','.join('?' * len(batch))
+            existing.update(row[0] for row in conn.execute(
+                f"SELECT id FROM papers WHERE id IN ({placeholders})", batch))
+        return existing
+
+    def merge(self, papers: Iterable[Dict]) -> Tuple[List[Dict], int]:
+        """合并新论文（按 ID 去重，已有论文保持不变）；返回 (实际新增的论文, 合并后总数)"""
+        incoming, seen = [], set()
+        for paper in papers:
+            if paper['id'] not in seen:
+                seen.add(paper['id'])
+                incoming.append(paper)
+        if not self.exists():
+            self.save_all(incoming)
+            return incoming, len(incoming)
+        existing = self._existing_ids(list(seen))
+        new_papers = [p for p in incoming if p['id'] not in existing]
+        conn = self._connect()
+        with conn:
+            self._insert(conn, [_record(p) for p in new_papers])
+        return new_papers, self.count()
+
+    def upsert(self, papers: Iterable[Dict]) -> Tuple[int, int]:
+        """批量插入或更新（例如重新提取会议、重新分类之后）；返回 (新增数, 更新数)
+
+        已有论文保持原来的位置，只有记录内容变化时才更新。
+        """
+        records = {}
+        for paper in papers:
+            record = _record(paper)
+            records[record['id']] = record
+        conn = self._connect()
+        current = {}
+        ids = list(records)
+        for start in range(0, len(ids), _BATCH):
+            batch = ids[start:start + _BATCH]
+            placeholders = ','.join('?' * len(batch))
+            current.update(conn.execute(f"SELECT id, record FROM papers WHERE id IN ({placeholders})", batch))
+        new_records = [r for i, r in records.items() if i not in current]
+        changed = [r for i, r in records.items()
+                   if i in current and json.dumps(r, ensure_ascii=False) != current[i]]
+        with conn:
+            self._insert(conn, new_records)
+            conn.executemany(
+                "UPDATE papers SET published = ?, conference = ?, primary_category = ?, title = ?, "
+                "abstract = ?, record = ? WHERE id = ?",
+                (_row(r)[1:] + (r['id'],) for r in changed))
+            conn.executemany("DELETE FROM paper_tags WHERE seq = (SELECT seq FROM papers WHERE id = ?)",
+                             ((r['id'],) for r in changed))
+            conn.executemany(
+                "INSERT OR IGNORE INTO paper_tags (tag, seq) SELECT ?, seq FROM papers WHERE id = ?",
+                ((tag, r['id']) for r in changed for tag in r.get('tags') or ()))
+        return len(new_records), len(changed)
+
+    # ---- 索引查询（结果从新到旧） ----
+    # papers_by_* 返回完整记录，耗时主要在 JSON 解码（每篇约 40µs）；
+    # 只需要 ID 或计数时用 ids_by_* 和 count_by_*，只读索引，不解码记录，需要详情时再用 get 取一页
+
+    def ids_by_date(self, date: str) -> List[str]:
+        return self._ids(f"SELECT id FROM papers WHERE published = ? {_ORDER}", (date,))
+
+    def ids_by_tag(self, tag: str) -> List[str]:
+        return self._ids(
+            f"SELECT id FROM papers WHERE seq IN (SELECT seq FROM paper_tags WHERE tag = ?) {_ORDER}", (tag,))
+
+    def ids_by_conference(self, conference: str) -> List[str]:
+        return self._ids(f"SELECT id FROM papers WHERE conference = ? {_ORDER}", (conference,))
+
+    def ids_by_primary_category(self, category: str) -> List[str]:
+        return self._ids(f"SELECT id FROM papers WHERE primary_category = ? {_ORDER}", (category,))
+
+    def get(self, ids: List[str]) -> List[Dict]:
+        """按 ID 取完整记录，顺序与 ids 相同（不存在的 ID 跳过）"""
+        if not self.exists():
+            return []
+        conn = self._connect()
+        found = {}
+        for start in range(0, len(ids), _BATCH):
+            batch = ids[start:start + _BATCH]
+            placeholders = ','.join('?' * len(batch))
+            found.update(conn.execute(f"SELECT id, record FROM papers WHERE id IN ({placeholders})", batch))
+        return [json.loads(found[i]) for i in ids if i in found]
+
+    def papers_by_date(self, date: str) -> List[Dict]:
+        return self._records(f"SELECT record FROM papers WHERE published = ? {_ORDER}", (date,))
+
+    def papers_by_tag(self, tag: str) -> List[Dict]:
+        return self._records(
+            f"SELECT record FROM papers WHERE seq IN (SELECT seq FROM paper_tags WHERE tag = ?) {_ORDER}", (tag,))
+
+    def papers_by_conference(self, conference: str) -> List[Dict]:
+        return self._records(f"SELECT record FROM papers WHERE conference = ? {_ORDER}", (conference,))
+
+    def papers_by_primary_category(self, category: str) -> List[Dict]:
+        return self._records(f"SELECT record FROM papers WHERE primary_category = ? {_ORDER}", (category,))
+
+    def count_by_tag(self) -> Dict[str, int]:
+        if not self.exists():
+            return {}
+        return dict(self._connect().execute("SELECT tag, COUNT(*) FROM paper_tags GROUP BY tag"))
+
+    def search(self, text: str, limit: int = 50) -> List[Dict]:
+        """全文检索标题和摘要（所有词都出现），按相关度排序"""
+        query = _fts_query(text)
+        if not query:
+            return []
+        return self._records(
+            "SELECT papers.record FROM papers_fts JOIN papers ON papers.seq = papers_fts.rowid "
+            "WHERE papers_fts MATCH ? ORDER BY rank LIMIT ?", (query, limit))
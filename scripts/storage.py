@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+论文存储层
+按发表月份分片保存论文，每次只重写被新论文涉及的分片
+
+分片使用 JSON Lines 格式（每行一篇论文），可以逐条读取和写入，
+遍历全部论文时内存占用与语料规模无关。
+"""
+
+import argparse
+import hashlib
+import heapq
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+# 1: 分片为 JSON 数组（YYYY-MM.json）；2: 分片为 JSON Lines（YYYY-MM.jsonl）
+MANIFEST_VERSION = 2
+# 单文件存储在 iter_shards 中只有一组，使用这个名称
+SINGLE_FILE_SHARD = "all"
+
+
+def shard_key(paper: Dict) -> str:
+    """论文所属的分片：发表月份（YYYY-MM）"""
+    published = paper.get('published') or ''
+    return published[:7] if len(published) >= 7 else 'unknown'
+
+
+def sort_papers(papers: List[Dict]) -> List[Dict]:
+    """按发表日期从新到旧排序（稳定排序，同一天内保持原有顺序）"""
+    papers.sort(key=lambda x: x.get('published', ''), reverse=True)
+    return papers
+
+
+def _write_atomic(path: Path, data: bytes):
+    """先写临时文件再替换，避免中途失败留下损坏的文件"""
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def write_text_if_changed(path, text: str) -> bool:
+    """内容与现有文件相同时不写入（不改变修改时间，部署时也不会重新上传）；返回是否写入"""
+    path = Path(path)
+    data = text.encode('utf-8')
+    if path.exists() and path.read_bytes() == data:
+        return False
+    _write_atomic(path, data)
+    return True
+
+
+def _dump(papers: List[Dict]) -> bytes:
+    return json.dumps(papers, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def iter_jsonl(path) -> Iterator[Dict]:
+    """逐行读取 JSON Lines 文件，每次只解析一条记录"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def write_jsonl(path, records: Iterable[Dict], skip_digest: Optional[str] = None) -> Tuple[int, str, bool]:
+    """流式写入 JSON Lines 文件（先写临时文件再替换）
+
+    边写边计算 SHA-256；与 skip_digest 相同时丢弃临时文件、保留原文件。
+    返回 (记录数, sha256, 是否实际写入)。
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    digest = hashlib.sha256()
+    count = 0
+    with open(tmp_path, 'wb') as f:
+        for record in records:
+            line = json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n'
+            digest.update(line)
+            f.write(line)
+            count += 1
+    sha256 = digest.hexdigest()
+    if sha256 == skip_digest and path.exists():
+        tmp_path.unlink()
+        return count, sha256, False
+    os.replace(tmp_path, path)
+    return count, sha256, True
+
+
+class JsonFileStore:
+    """旧的单文件存储（整个语料保存在一个 JSON 数组中）"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def load_all(self) -> List[Dict]:
+        if not self.path.exists():
+            return []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def iter_papers(self) -> Iterator[Dict]:
+        # JSON 数组只能整体解析
+        yield from self.load_all()
+
+    def iter_shards(self) -> Iterator[Tuple[str, List[Dict]]]:
+        """整个文件作为一组（与分片存储的接口一致，供 update_venue 使用）"""
+        if self.path.exists():
+            yield SINGLE_FILE_SHARD, self.load_all()
+
+    def save_shard(self, key: str, papers: List[Dict]) -> bool:
+        """写回 iter_shards 读出的那一组（即全部论文）；返回是否实际写入"""
+        return bool(self.save_all(papers))
+
+    def save_all(self, papers: List[Dict]) -> int:
+        """整体重写，返回写入的文件数"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = _dump(sort_papers(list(papers)))
+        if self.path.exists() and self.path.read_bytes() == data:
+            return 0
+        _write_atomic(self.path, data)
+        return 1
+
+    def merge(self, papers: Iterable[Dict]) -> Tuple[List[Dict], int]:
+        """合并新论文（按 ID 去重），返回 (实际新增的论文, 合并后总数)"""
+        existing = self.load_all()
+        seen = {p['id'] for p in existing}
+        new_papers = []
+        for paper in papers:
+            if paper['id'] not in seen:
+                seen.add(paper['id'])
+                new_papers.append(paper)
+        all_papers = new_papers + existing
+        self.save_all(all_papers)
+        return new_papers, len(all_papers)
+
+
+class JsonlFileStore:
+    """单文件 JSON Lines 存储（每行一篇论文，从新到旧）
+
+    读取和合并都是流式的：合并时只在内存中保留已有论文的 ID。
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def iter_papers(self) -> Iterator[Dict]:
+        if self.path.exists():
+            yield from iter_jsonl(self.path)
+
+    def load_all(self) -> List[Dict]:
+        return list(self.iter_papers())
+
+    def iter_shards(self) -> Iterator[Tuple[str, List[Dict]]]:
+        """整个文件作为一组（与分片存储的接口一致，供 update_venue 使用）"""
+        if self.path.exists():
+            yield SINGLE_FILE_SHARD, self.load_all()
+
+    def save_shard(self, key: str, papers: List[Dict]) -> bool:
+        """写回 iter_shards 读出的那一组（即全部论文）；返回是否实际写入"""
+        return bool(self.save_all(papers))
+
+    def save_all(self, papers: Iterable[Dict]) -> int:
+        """整体重写（需要排序，因此会读入全部论文），返回写入的文件数"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        return int(write_jsonl(self.path, sort_papers(list(papers)))[2])
+
+    def merge(self, papers: Iterable[Dict]) -> Tuple[List[Dict], int]:
+        """合并新论文（按 ID 去重），返回 (实际新增的论文, 合并后总数)
+
+        已有文件按 save_all 的顺序排列，排好序的新论文与它做一次归并，结果与 save_all(新论文 + 已有论文) 相同
+        （同一天内新论文在前），但已有论文仍然是逐条流式读写的。
+        """
+        seen = {p['id'] for p in self.iter_papers()}
+        new_papers = []
+        for paper in papers:
+            if paper['id'] not in seen:
+                seen.add(paper['id'])
+                new_papers.append(paper)
+        if not new_papers and self.path.exists():
+            return new_papers, len(seen)
+
+        records = heapq.merge(sort_papers(list(new_papers)), self.iter_papers(),
+                              key=lambda x: x.get('published', ''), reverse=True)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_jsonl(self.path, records)
+        return new_papers, len(seen)
+
+
+class ShardedStore:
+    """按发表月份分片的论文存储
+
+    目录结构：
+        <root>/2025-01.jsonl  该月发表的论文（JSON Lines，从新到旧）
+        <root>/manifest.json  每个分片的论文数和内容哈希
+
+    同一篇论文的发表日期不变，因此按 ID 去重只需要查看它所在的分片，
+    合并新论文时也只重写被涉及的分片和 manifest。
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self.manifest_path = self.root / MANIFEST_NAME
+        # 迁移来源：与分片目录同名的旧单文件（data/papers -> data/papers.json）
+        self.legacy_path = self.root.with_suffix('.json')
+        self._manifest = None
+
+    def exists(self) -> bool:
+        return self.manifest_path.exists() or self.legacy_path.exists()
+
+    @property
+    def manifest(self) -> Dict:
+        if self._manifest is None:
+            if self.manifest_path.exists():
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    self._manifest = json.load(f)
+            else:
+                self._manifest = {'version': MANIFEST_VERSION, 'total': 0, 'shards': {}}
+        return self._manifest
+
+    def count(self) -> int:
+        return self.manifest['total']
+
+    def _shard_path(self, key: str) -> Path:
+        return self.root / f"{key}.jsonl"
+
+    def _iter_shard(self, key: str) -> Iterator[Dict]:
+        path = self._shard_path(key)
+        if path.exists():
+            yield from iter_jsonl(path)
+
+    def _load_shard(self, key: str) -> List[Dict]:
+        return list(self._iter_shard(key))
+
+    def _write_shard(self, key: str, papers: Iterable[Dict]) -> bool:
+        """写入分片；内容哈希与 manifest 一致时跳过，返回是否实际写入"""
+        shards = self.manifest['shards']
+        count, digest, written = write_jsonl(self._shard_path(key), papers,
+                                             skip_digest=shards.get(key, {}).get('sha256'))
+        shards[key] = {'count': count, 'sha256': digest}
+        return written
+
+    def _save_manifest(self):
+        manifest = self.manifest
+        manifest['version'] = MANIFEST_VERSION
+        manifest['shards'] = dict(sorted(manifest['shards'].items(), reverse=True))
+        manifest['total'] = sum(s['count'] for s in manifest['shards'].values())
+        data = json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8')
+        _write_atomic(self.manifest_path, data)
+
+    def shard_keys(self) -> List[str]:
+        """所有分片，从新到旧"""
+        return sorted(self.manifest['shards'], reverse=True)
+
+    def iter_shards(self) -> Iterator[Tuple[str, List[Dict]]]:
+        """逐个分片读取，内存中只保留一个分片"""
+        self.migrate()
+        for key in self.shard_keys():
+            yield key, self._load_shard(key)
+
+    def iter_papers(self) -> Iterator[Dict]:
+        """逐篇读取全部论文，从新到旧；内存中只保留当前这一篇"""
+        self.migrate()
+        for key in self.shard_keys():
+            yield from self._iter_shard(key)
+
+    def load_all(self) -> List[Dict]:
+        """读取全部论文，从新到旧"""
+        return list(self.iter_papers())
+
+    def migrate(self) -> bool:
+        """迁移旧格式；返回是否执行了迁移
+
+        - 只有旧的单文件（data/papers.json）时，把它拆分成分片
+        - 分片仍是 JSON 数组（manifest version 1）时，逐个转换为 JSON Lines
+        """
+        if not self.manifest_path.exists():
+            if not self.legacy_path.exists():
+                return False
+            logger.info(f"将 {self.legacy_path} 迁移为分片存储: {self.root}")
+            self.save_all(JsonFileStore(self.legacy_path).load_all())
+            logger.info(f"迁移完成，旧文件 {self.legacy_path} 已不再使用，可以删除")
+            return True
+
+        if self.manifest.get('version', 1) >= MANIFEST_VERSION:
+            return False
+        logger.info(f"将 {self.root} 中的分片转换为 JSON Lines")
+        for key in self.shard_keys():
+            old_path = self.root / f"{key}.json"
+            if old_path.exists():
+                self._write_shard(key, JsonFileStore(old_path).load_all())
+                old_path.unlink()
+        self._save_manifest()
+        return True
+
+    def save_shard(self, key: str, papers: List[Dict]) -> bool:
+        """重写单个分片并更新 manifest（论文的发表月份不能改变）；返回是否实际写入"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        written = self._write_shard(key, sort_papers(papers))
+        if written:
+            self._save_manifest()
+        return written
+
+    def save_all(self, papers: Iterable[Dict]) -> int:
+        """按分片重写全部论文，只写入内容发生变化的分片；返回写入的分片数"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        groups: Dict[str, List[Dict]] = {}
+        for paper in papers:
+            groups.setdefault(shard_key(paper), []).append(paper)
+
+        written = 0
+        for key, shard in groups.items():
+            written += self._write_shard(key, sort_papers(shard))
+        for key in set(self.manifest['shards']) - set(groups):
+            self._shard_path(key).unlink(missing_ok=True)
+            del self.manifest['shards'][key]
+            written += 1
+        self._save_manifest()
+        return written
+
+    def merge(self, papers: Iterable[Dict]) -> Tuple[List[Dict], int]:
+        """合并新论文（按 ID 去重），只重写涉及的分片；返回 (实际新增的论文, 合并后总数)"""
+        self.migrate()
+        self.root.mkdir(parents=True, exist_ok=True)
+        groups: Dict[str, List[Dict]] = {}
+        for paper in papers:
+            groups.setdefault(shard_key(paper), []).append(paper)
+
+        new_papers = []
+        for key, incoming in groups.items():
+            existing = self._load_shard(key)
+            seen = {p['id'] for p in existing}
+            added = []
+            for paper in incoming:
+                if paper['id'] not in seen:
+                    seen.add(paper['id'])
+                    added.append(paper)
+            if added:
+                self._write_shard(key, sort_papers(added + existing))
+                new_papers.extend(added)
+
+        if new_papers or not self.manifest_path.exists():
+            self._save_manifest()
+        return new_papers, self.count()
+
+
+# 使用 SQLite 存储的路径后缀
+SQLITE_SUFFIXES = ('.sqlite', '.db')
+
+
+def open_store(path: str):
+    """按路径打开存储：*.json 为旧的单文件存储，*.jsonl 为单文件 JSON Lines，
+    *.sqlite / *.db 为 SQLite 存储，否则为分片目录"""
+    if str(path).endswith(SQLITE_SUFFIXES):
+        try:
+            from .sqlite_store import SqliteStore
+        except ImportError:
+            from sqlite_store import SqliteStore
+        return SqliteStore(path)
+    if str(path).endswith('.json'):
+        return JsonFileStore(path)
+    if str(path).endswith('.jsonl'):
+        return JsonlFileStore(path)
+    return ShardedStore(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="在存储格式之间转换论文数据")
+    parser.add_argument('source', help="源路径（papers.json / papers.jsonl / papers.sqlite / 分片目录）")
+    parser.add_argument('target', help="目标路径（格式由路径决定，同 open_store）")
+    args = parser.parse_args(argv)
+
+    source = open_store(args.source)
+    if not source.exists():
+        print(f"❌ 数据不存在: {args.source}")
+        return 1
+    target = open_store(args.target)
+    written = target.save_all(source.iter_papers())
+    print(f"✅ 已转换 {args.source} -> {args.target}（写入 {written} 个文件）")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -1,93 +1,197 @@
 #!/usr/bin/env python3
 """
 更新论文数据 - 添加会议/期刊信息
-从现有论文数据中提取并更新会议信息
+从现有论文数据中提取并更新会议信息（--reclassify 时同时按当前关键词配置重新分类）
+
+逐个分片读取论文，把需要重新计算的论文按块分发到进程池，
+只有会议（或标签）实际发生变化的分片才会被重写。
 """
 
-import json
-from pathlib import Path
-import re
+import argparse
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import yaml
+
+try:
+    from .storage import open_store
+    from .venues import VenueMatcher
+    from .keywords import KeywordMatcher
+    from .enrichment import EnrichmentCache
+except ImportError:
+    from storage import open_store
+    from venues import VenueMatcher
+    from keywords import KeywordMatcher
+    from enrichment import EnrichmentCache
+
+
+_config = None
+_venue_matcher = None
+_keyword_matcher = None
+
+
+def load_config() -> dict:
+    global _config
+    if _config is None:
+        with open("config.yaml", 'r', encoding='utf-8') as f:
+            _config = yaml.safe_load(f)
+    return _config
 
 
 def extract_venue_from_comment(comment: str) -> str:
-    """从 comment 字段提取会议/期刊信息"""
-    if not comment:
-        return None
-    
-    comment = comment.strip()
-    
-    # 如果是 preprint，返回 None
-    if 'preprint' in comment.lower():
-        return None
-    
-    # 常见会议列表
-    conferences = [
-        'CVPR', 'ICCV', 'ECCV', 'NeurIPS', 'ICML', 'ICLR', 
-        'ACL', 'EMNLP', 'NAACL', 'AAAI', 'IJCAI', 'KDD',
-        'ICRA', 'IROS', 'CoRL', 'RSS',
-        'SIGIR', 'WWW', 'WSDM', 'RecSys',
-        'SIGMOD', 'VLDB', 'ICDE',
-        'SIGGRAPH', 'ICASSP', 'INTERSPEECH'
-    ]
-    
-    # 匹配模式：会议名 + 年份
-    for conf in conferences:
-        # 匹配 "CVPR 2025" 或 "Accepted to CVPR 2025" 等模式
-        pattern = rf'\b{conf}\s*[:\']?\s*(\d{{4}})\b'
-        match = re.search(pattern, comment, re.IGNORECASE)
-        if match:
-            year = match.group(1)
-            return f"{conf} {year}"
-        
-        # 匹配只有会议名的情况
-        pattern = rf'\b{conf}\b'
-        if re.search(pattern, comment, re.IGNORECASE):
-            return conf
-    
-    return None
-
-
-def update_papers_with_venue():
-    """更新论文数据，添加会议信息"""
-    data_file = Path("data/papers.json")
-    
-    if not data_file.exists():
-        print("❌ papers.json 不存在")
+    """从 comment 字段提取会议/期刊信息（与 PaperFetcher 共用 config.yaml 中的 venues 配置）"""
+    global _venue_matcher
+    if _venue_matcher is None:
+        _venue_matcher = VenueMatcher.from_config(load_config())
+    return _venue_matcher.match(comment)
+
+
+def _init_worker(config: dict, reclassify: bool):
+    """进程池初始化：每个进程只编译一次匹配器"""
+    global _config, _venue_matcher, _keyword_matcher
+    _config = config
+    _venue_matcher = VenueMatcher.from_config(config)
+    _keyword_matcher = KeywordMatcher.from_config(config) if reclassify else None
+
+
+def _enrich_chunk(items: List[Tuple[Optional[str], Optional[str]]]) -> List[Tuple[Optional[str], Optional[List[str]]]]:
+    """计算一块论文的 (会议, 标签)；items 为 (comment, 标题+摘要)，不需要分类时后者为 None"""
+    results = []
+    for comment, text in items:
+        venue = _venue_matcher.match(comment)
+        tags = _keyword_matcher.classify(text) if text is not None else None
+        results.append((venue, tags))
+    return results
+
+
+def _paper_text(paper: Dict) -> str:
+    return f"{paper.get('title', '')} {paper.get('abstract', '')}"
+
+
+class _ShardJob:
+    """一个分片的处理状态：缓存命中的结果立即应用，其余论文等待进程池的结果"""
+
+    def __init__(self, key: str, papers: List[Dict]):
+        self.key = key
+        self.papers = papers
+        # (论文下标, 结果或 future, 是否来自缓存)
+        self.pending: List[Tuple[List[int], object, bool]] = []
+
+
+def update_papers_with_venue(reclassify: bool = False, data_path: str = "data/papers",
+                             workers: Optional[int] = None, chunk_size: int = 1000):
+    """更新论文数据，添加会议信息
+
+    workers 为进程数（默认 CPU 核数，1 表示在当前进程中串行处理）；
+    内容和配置都没变的论文直接使用富化缓存，不分发给子进程。
+    """
+    store = open_store(data_path)
+
+    if not store.exists():
+        print("❌ 论文数据不存在")
         return
-    
-    # 读取论文数据
-    with open(data_file, 'r', encoding='utf-8') as f:
-        papers = json.load(f)
-    
-    print(f"📚 加载了 {len(papers)} 篇论文")
-    
+
+    config = load_config()
+    cache = EnrichmentCache.from_config(config)
+    workers = workers or os.cpu_count() or 1
+    executor = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                       initargs=(config, reclassify))
+    else:
+        _init_worker(config, reclassify)
+
     # 统计
+    total = 0
     updated_count = 0
+    changed_count = 0
+    written_shards = 0
     venue_count = {}
-    
-    # 更新会议信息
-    for paper in papers:
-        comment = paper.get('comment')
-        if comment:
-            venue = extract_venue_from_comment(comment)
+
+    def submit(job: _ShardJob):
+        """查缓存，把未命中的论文按块提交"""
+        indices = []
+        hit_indices, hits = [], []
+        for i, paper in enumerate(job.papers):
+            if not reclassify and not paper.get('comment'):
+                continue
+            cached = cache.lookup(paper, tags=reclassify) if cache is not None else None
+            if cached is not None:
+                hit_indices.append(i)
+                hits.append(cached)
+            else:
+                indices.append(i)
+        if hits:
+            job.pending.append((hit_indices, hits, True))
+        for start in range(0, len(indices), chunk_size):
+            chunk = indices[start:start + chunk_size]
+            items = [(job.papers[i].get('comment'), _paper_text(job.papers[i]) if reclassify else None)
+                     for i in chunk]
+            if executor is not None:
+                results = executor.submit(_enrich_chunk, items)
+            else:
+                results = _enrich_chunk(items)
+            job.pending.append((chunk, results, False))
+
+    def finish(job: _ShardJob):
+        """应用结果并统计；只有论文实际变化时才重写分片"""
+        nonlocal total, updated_count, changed_count, written_shards
+        changed = 0
+        for indices, results, from_cache in job.pending:
+            if executor is not None and not from_cache:
+                results = results.result()
+            for i, (venue, tags) in zip(indices, results):
+                paper = job.papers[i]
+                if cache is not None and not from_cache:
+                    cache.store(paper, venue, tags)
+                if reclassify:
+                    if paper.get('conference') != venue or paper.get('tags') != tags:
+                        paper['conference'] = venue
+                        paper['tags'] = tags
+                        changed += 1
+                elif venue and paper.get('conference') != venue:
+                    paper['conference'] = venue
+                    changed += 1
+
+        for paper in job.papers:
+            venue = paper.get('conference')
             if venue:
-                paper['conference'] = venue
                 updated_count += 1
-                
-                # 统计
                 venue_name = venue.split()[0]  # 只取会议名
                 venue_count[venue_name] = venue_count.get(venue_name, 0) + 1
-    
-    # 保存更新后的数据
-    with open(data_file, 'w', encoding='utf-8') as f:
-        json.dump(papers, f, ensure_ascii=False, indent=2)
-    
+
+        total += len(job.papers)
+        changed_count += changed
+        if changed:
+            written_shards += store.save_shard(job.key, job.papers)
+
+    # 最多同时保留 2×进程数 个分片在内存中
+    in_flight = deque()
+    try:
+        for key, papers in store.iter_shards():
+            job = _ShardJob(key, papers)
+            submit(job)
+            in_flight.append(job)
+            if len(in_flight) > workers * 2:
+                finish(in_flight.popleft())
+        while in_flight:
+            finish(in_flight.popleft())
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if cache is not None:
+        cache.save()
+
     print(f"\n✅ 更新完成！")
     print(f"📊 统计：")
-    print(f"  - 总论文数：{len(papers)}")
+    print(f"  - 总论文数：{total}")
     print(f"  - 有会议信息：{updated_count} 篇")
-    print(f"  - 预印本：{len(papers) - updated_count} 篇")
-    
+    print(f"  - 预印本：{total - updated_count} 篇")
+    print(f"  - 本次更新：{changed_count} 篇（重写 {written_shards} 个分片）")
+
     if venue_count:
         print(f"\n📍 会议分布：")
         for venue, count in sorted(venue_count.items(), key=lambda x: x[1], reverse=True)[:10]:
@@ -95,4 +199,12 @@ def update_papers_with_venue():
 
 
 if __name__ == "__main__":
-    update_papers_with_venue()
+    parser = argparse.ArgumentParser(description="更新论文的会议/期刊信息")
+    parser.add_argument('--reclassify', action='store_true', help="同时按当前关键词配置重新分类")
+    parser.add_argument('--data', default=None, help="论文数据路径（默认使用 config.yaml 的 output.papers_path）")
+    parser.add_argument('--workers', type=int, default=None, help="进程数（默认 CPU 核数，1 表示串行）")
+    parser.add_argument('--chunk-size', type=int, default=1000, help="每个任务包含的论文数")
+    args = parser.parse_args()
+    data_path = args.data or load_config().get('output', {}).get('papers_path', 'data/papers')
+    update_papers_with_venue(reclassify=args.reclassify, data_path=data_path,
+                             workers=args.workers, chunk_size=args.chunk_size)
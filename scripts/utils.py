@@ -5,9 +5,20 @@
 
 import json
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Iterable, Iterator
 from datetime import datetime
 
+try:
+    from .storage import open_store, iter_jsonl, write_jsonl
+    from .paper import Paper, from_records, to_records
+    from .sqlite_store import SqliteStore
+    from .paper_index import PaperIndex
+except ImportError:
+    from storage import open_store, iter_jsonl, write_jsonl
+    from paper import Paper, from_records, to_records
+    from sqlite_store import SqliteStore
+    from paper_index import PaperIndex
+
 
 def load_json(file_path: str) -> List[Dict]:
     """加载 JSON 文件"""
@@ -19,16 +30,46 @@ def load_json(file_path: str) -> List[Dict]:
         return json.load(f)
 
 
+def load_jsonl(file_path: str) -> Iterator[Dict]:
+    """逐条读取 JSON Lines 文件（生成器，内存中只保留当前记录）"""
+    path = Path(file_path)
+    if not path.exists():
+        return iter(())
+    return iter_jsonl(path)
+
+
+def load_papers(data_path: str = "data/papers") -> List[Paper]:
+    """通过存储层加载全部论文（分片目录或旧的单文件 JSON）"""
+    return list(iter_papers(data_path))
+
+
+def iter_papers(data_path: str = "data/papers") -> Iterator[Paper]:
+    """通过存储层逐篇读取论文，从新到旧；统计等只需遍历一次的场景应优先使用"""
+    return from_records(open_store(data_path).iter_papers())
+
+
+def load_paper_index(data_path: str = "data/papers") -> PaperIndex:
+    """加载全部论文并建立内存索引（按日期、标签、会议等多次查询时使用）"""
+    return PaperIndex(iter_papers(data_path))
+
+
 def save_json(data: List[Dict], file_path: str):
     """保存为 JSON 文件"""
     path = Path(file_path)
     path.parent.mkdir(parents=True, exist_ok=True)
     
     with open(path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+        json.dump(list(to_records(data)), f, ensure_ascii=False, indent=2)
+
+
+def save_jsonl(data: Iterable[Dict], file_path: str) -> int:
+    """流式保存为 JSON Lines 文件，返回写入的记录数"""
+    path = Path(file_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return write_jsonl(path, to_records(data))[0]
 
 
-def deduplicate_papers(papers: List[Dict], key: str = 'id') -> List[Dict]:
+def deduplicate_papers(papers: Iterable[Dict], key: str = 'id') -> List[Dict]:
     """去除重复论文 - 优化版本"""
     seen = set()
     unique_papers = []
@@ -65,20 +106,47 @@ def parse_date(date_str: str) -> datetime:
         return datetime.now()
 
 
-def get_papers_by_date(papers: List[Dict], date: str) -> List[Dict]:
-    """获取指定日期的论文"""
+def get_papers_by_date(papers: Iterable[Dict], date: str) -> List[Dict]:
+    """获取指定日期的论文；papers 为 PaperIndex 或 SqliteStore 时使用索引查询"""
+    if isinstance(papers, PaperIndex):
+        return papers.papers_by_date(date)
+    if isinstance(papers, SqliteStore):
+        return list(from_records(papers.papers_by_date(date)))
     return [p for p in papers if p.get('published') == date]
 
 
-def get_papers_by_category(papers: List[Dict], category: str) -> List[Dict]:
-    """获取指定类别的论文"""
+def get_papers_by_category(papers: Iterable[Dict], category: str) -> List[Dict]:
+    """获取指定类别的论文；papers 为 PaperIndex 或 SqliteStore 时使用索引查询"""
+    if isinstance(papers, PaperIndex):
+        return papers.papers_by_tag(category)
+    if isinstance(papers, SqliteStore):
+        return list(from_records(papers.papers_by_tag(category)))
     return [p for p in papers if category in p.get('tags', [])]
 
 
-def count_papers_by_category(papers: List[Dict]) -> Dict[str, int]:
-    """统计各类别论文数量"""
+def get_paper_ids_by_date(papers: Iterable[Dict], date: str) -> List[str]:
+    """指定日期的论文 ID（从新到旧）；papers 为 SqliteStore 时只读索引，不解码记录"""
+    if isinstance(papers, SqliteStore):
+        return papers.ids_by_date(date)
+    return [p['id'] for p in get_papers_by_date(papers, date)]
+
+
+def get_paper_ids_by_category(papers: Iterable[Dict], category: str) -> List[str]:
+    """指定类别的论文 ID（从新到旧）；papers 为 SqliteStore 时只读索引，不解码记录"""
+    if isinstance(papers, SqliteStore):
+        return papers.ids_by_tag(category)
+    return [p['id'] for p in get_papers_by_category(papers, category)]
+
+
+def count_papers_by_category(papers: Iterable[Dict]) -> Dict[str, int]:
+    """统计各类别论文数量；papers 为 PaperIndex 或 SqliteStore 时使用预先统计的结果
+
+    三种输入的结果相同：一篇论文的标签重复出现时只计一次。
+    """
+    if isinstance(papers, (PaperIndex, SqliteStore)):
+        return papers.count_by_tag()
     counts = {}
     for paper in papers:
-        for tag in paper.get('tags', []):
+        for tag in dict.fromkeys(paper.get('tags') or ()):
             counts[tag] = counts.get(tag, 0) + 1
     return counts
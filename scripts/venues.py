@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+会议/期刊匹配
+根据 config.yaml 中的 venues 配置，从论文 comment 字段中提取会议或期刊信息
+"""
+
+import re
+from typing import Dict, Iterable, Optional
+
+# config.yaml 中没有 venues 配置时使用的默认列表（列表顺序即匹配优先级）
+DEFAULT_CONFERENCES = [
+    'CVPR', 'ICCV', 'ECCV', 'NeurIPS', 'ICML', 'ICLR',
+    'ACL', 'EMNLP', 'NAACL', 'AAAI', 'IJCAI', 'KDD',
+    'ICRA', 'IROS', 'CoRL', 'RSS',
+    'SIGIR', 'WWW', 'WSDM', 'RecSys',
+    'SIGMOD', 'VLDB', 'ICDE',
+    'SIGGRAPH', 'ICASSP', 'INTERSPEECH'
+]
+
+DEFAULT_JOURNALS = [
+    'Nature', 'Science', 'PAMI', 'TPAMI', 'JMLR', 'IJCV',
+    'IEEE', 'ACM', 'Transactions', 'Journal'
+]
+
+
+def _alternation(names: Iterable[str]) -> str:
+    # 长名称在前，避免某个名称是另一个名称的前缀时提前匹配
+    return '|'.join(re.escape(n) for n in sorted(set(names), key=len, reverse=True))
+
+
+class VenueMatcher:
+    """会议/期刊匹配器
+
+    所有会议和期刊名称编译成一个正则表达式，每条 comment 只扫描一次，
+    再按配置中的顺序挑选优先级最高的会议，结果与逐个名称依次匹配相同：
+    - 会议名后跟四位年份（如 "CVPR 2025"、"CVPR'2025"）时返回 "会议名 年份"
+    - 只有会议名时返回会议名
+    - 没有会议但出现期刊名时返回 comment 的前 50 个字符
+    """
+
+    def __init__(self, conferences: Iterable[str], journals: Iterable[str]):
+        self.conferences = list(conferences)
+        self.journals = list(journals)
+        # 名称（小写）-> (优先级, 规范名称)；重复出现的名称以第一次为准
+        self._conference_rank: Dict[str, tuple] = {}
+        for rank, name in enumerate(self.conferences):
+            self._conference_rank.setdefault(name.lower(), (rank, name))
+
+        alternatives = []
+        if self.conferences:
+            alternatives.append(
+                rf"(?P<conf>{_alternation(self.conferences)})(?:\s*[:']?\s*(?P<year>\d{{4}})\b|\b)"
+            )
+        if self.journals:
+            alternatives.append(rf"(?P<journal>{_alternation(self.journals)})\b")
+        self._pattern = re.compile(rf"\b(?:{'|'.join(alternatives)})", re.IGNORECASE) if alternatives else None
+
+    @classmethod
+    def from_config(cls, config: dict) -> 'VenueMatcher':
+        """从 config.yaml 的 venues 配置构建"""
+        venues = config.get('venues') or {}
+        return cls(venues.get('conferences') or DEFAULT_CONFERENCES,
+                   venues.get('journals') or DEFAULT_JOURNALS)
+
+    def match(self, comment: Optional[str]) -> Optional[str]:
+        """从 comment 字段提取会议/期刊信息"""
+        if not comment:
+            return None
+
+        comment = comment.strip()
+
+        # 如果是 preprint，返回 None
+        if 'preprint' in comment.lower() or self._pattern is None:
+            return None
+
+        best = None
+        best_year = None
+        has_journal = False
+        for m in self._pattern.finditer(comment):
+            conf = m.group('conf') if self.conferences else None
+            if conf is None:
+                has_journal = True
+                continue
+            rank = self._conference_rank[conf.lower()]
+            if best is None or rank < best:
+                best, best_year = rank, m.group('year')
+            elif rank == best and best_year is None:
+                best_year = m.group('year')
+
+        if best is not None:
+            name = best[1]
+            return f"{name} {best_year}" if best_year else name
+
+        if has_journal:
+            # 尝试提取完整的期刊名称（取前50个字符）
+            return comment[:50] if len(comment) > 50 else comment
+
+        return None
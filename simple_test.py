@@ -49,7 +49,7 @@ def simple_test():
             # 保存数据
             print("💾 保存数据...")
             fetcher.save_papers(papers)
-            print("✅ 数据已保存到 data/papers.json")
+            print("✅ 数据已保存到 data/papers/")
             print()
             
             # 生成网页
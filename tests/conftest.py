@@ -0,0 +1,94 @@
+"""共用的测试夹具：最小配置和本地 ArXiv 替身服务器"""
+
+import copy
+from datetime import datetime, timezone
+
+import pytest
+import yaml
+
+from scripts.arxiv_stub_server import create_server
+
+# 抓取测试用的最小配置：不读取仓库中的 config.yaml，不写运行指标和富化缓存
+MINIMAL_CONFIG = {
+    'sources': {
+        'arxiv': {
+            'enabled': True,
+            'categories': ['cs.AI'],
+            'max_results': 100,
+            'days_back': 1,
+            'incremental': False,
+            'overlap_hours': 12,
+            'concurrency': 1,
+            'rate_limit': 0,
+            'page_size': 50,
+            'min_page_size': 10,
+            'num_retries': 0,
+        },
+    },
+    'categories': {
+        'Computer Vision': {'keywords': ['object detection', 'image segmentation']},
+        'Natural Language Processing': {'keywords': ['language model', 'machine translation']},
+        'Machine Learning': {'keywords': ['deep learning', 'neural network']},
+    },
+    'venues': {'conferences': ['CVPR', 'ICML', 'NeurIPS'], 'journals': ['Journal']},
+    'enrichment_cache': {'enabled': False},
+    'metrics': {'enabled': False},
+    'output': {'papers_path': 'data/papers'},
+}
+
+
+@pytest.fixture
+def make_config(tmp_path):
+    """写出一份最小配置，返回路径；arxiv 覆盖 sources.arxiv 中的选项，其余关键字覆盖顶层配置"""
+    def make(arxiv=None, **overrides):
+        config = copy.deepcopy(MINIMAL_CONFIG)
+        config['sources']['arxiv'].update(arxiv or {})
+        config['output']['data_dir'] = str(tmp_path / "data")
+        config.update(overrides)
+        path = tmp_path / "config.yaml"
+        path.write_text(yaml.safe_dump(config, allow_unicode=True), encoding='utf-8')
+        return str(path)
+    return make
+
+
+@pytest.fixture
+def stub_server():
+    """在临时端口上启动替身服务器：stub_server(source, latency=..., error_rate=...)，测试结束后关闭"""
+    servers = []
+
+    def start(source, **options):
+        server = create_server(source, port=0, **options)
+        server.start_background()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def make_fetcher(make_config):
+    """指向替身服务器的 PaperFetcher：make_fetcher(server, **arxiv 选项)"""
+    from scripts.fetch_papers import PaperFetcher
+
+    def make(server, **arxiv):
+        return PaperFetcher(make_config({'api_url': server.url, **arxiv}))
+    return make
+
+
+@pytest.fixture
+def freeze_now(monkeypatch):
+    """固定 fetch_papers 中的当前时间：freeze_now(dt)，与合成语料的 now 对齐，时间窗口边界不随运行时刻漂移"""
+    from scripts import fetch_papers
+
+    def freeze(now: datetime):
+        class FrozenDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return now if tz else now.replace(tzinfo=None)
+        monkeypatch.setattr(fetch_papers, 'datetime', FrozenDatetime)
+        return now
+    return freeze
+
@@ -0,0 +1,95 @@
+"""ArXiv 替身服务器：合成 / 录制 / 回放三种模式，以及延迟和错误注入，都通过 PaperFetcher 实际抓取"""
+
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from scripts.arxiv_stub_server import FixtureSource, SyntheticSource
+from scripts.synthetic import SyntheticCorpus
+
+NOW = datetime(2025, 6, 2, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def corpus():
+    return SyntheticCorpus(600, papers_per_day=100, now=NOW)
+
+
+def window_ids(corpus, category, start, field):
+    """属于该类别、field（published / updated）不早于 start 的论文"""
+    return {entry['id'] for entry in (corpus.entry(i) for i in range(len(corpus)))
+            if category in entry['categories'] and entry[field] >= start}
+
+
+def ids(papers):
+    return [p['id'] for p in papers]
+
+
+def test_synthetic_mode_serves_the_corpus(stub_server, make_fetcher, freeze_now, corpus):
+    freeze_now(NOW)
+    server = stub_server(SyntheticSource(corpus))
+    papers = make_fetcher(server, categories=['cs.CV']).fetch_arxiv_papers()
+    start = NOW - timedelta(days=1)
+    # 窗口内发表的论文全部抓到；更早发表、在窗口内修订的论文只在提前结束分页之前的页中出现
+    assert window_ids(corpus, 'cs.CV', start, 'published') <= set(ids(papers))
+    assert set(ids(papers)) <= window_ids(corpus, 'cs.CV', start, 'updated')
+    # 记录完整：富化后的字段和原始字段都在
+    first = corpus.entry(next(i for i in range(len(corpus)) if 'cs.CV' in corpus.categories_for(i)))
+    paper = papers[0]
+    assert (paper['id'], paper['title'], list(paper['authors'])) == (first['id'], first['title'], first['authors'])
+    assert 'tags' in paper and 'conference' in paper
+    assert server.stats['requests'] == len(server.requests) >= 1
+
+
+def test_record_then_replay_gives_identical_results(stub_server, make_fetcher, freeze_now, corpus, tmp_path):
+    freeze_now(NOW)
+    upstream = stub_server(SyntheticSource(corpus))
+    fixtures = tmp_path / "fixtures"
+    recorder = stub_server(FixtureSource(str(fixtures), upstream=upstream.url))
+    recorded = make_fetcher(recorder, categories=['cs.AI', 'cs.LG']).fetch_arxiv_papers()
+    assert upstream.stats['requests'] == recorder.stats['requests']
+    assert (fixtures / "index.json").exists()
+
+    replayer = stub_server(FixtureSource(str(fixtures)))
+    replayed = make_fetcher(replayer, categories=['cs.AI', 'cs.LG']).fetch_arxiv_papers()
+    assert [p.to_dict() for p in replayed] == [p.to_dict() for p in recorded]
+    # 回放模式不访问上游
+    assert upstream.stats['requests'] == recorder.stats['requests']
+
+
+def test_replay_without_recording_returns_404(stub_server, tmp_path):
+    server = stub_server(FixtureSource(str(tmp_path)))
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        urllib.request.urlopen(server.url + "?search_query=cat:cs.AI&start=0&max_results=5", timeout=10)
+    assert excinfo.value.code == 404
+
+
+def test_latency_is_applied_per_request(stub_server, corpus):
+    server = stub_server(SyntheticSource(corpus), latency=0.2)
+    start = time.perf_counter()
+    with urllib.request.urlopen(server.url + "?search_query=cat:cs.AI&start=0&max_results=5", timeout=10) as resp:
+        body = resp.read()
+    assert time.perf_counter() - start >= 0.2
+    assert body.count(b'<entry>') == 5
+
+
+def test_injected_errors_are_retried(stub_server, make_fetcher, freeze_now, corpus):
+    freeze_now(NOW)
+    clean = make_fetcher(stub_server(SyntheticSource(corpus)), categories=['cs.AI']).fetch_arxiv_papers()
+
+    flaky = stub_server(SyntheticSource(corpus), error_rate=0.4, seed=3)
+    papers = make_fetcher(flaky, categories=['cs.AI'], num_retries=10).fetch_arxiv_papers()
+    assert flaky.stats['errors_injected'] > 0
+    assert ids(papers) == ids(clean)
+
+
+def test_every_request_failing_yields_no_papers(stub_server, make_fetcher, freeze_now, corpus):
+    freeze_now(NOW)
+    server = stub_server(SyntheticSource(corpus), error_rate=1.0)
+    fetcher = make_fetcher(server, categories=['cs.AI'], num_retries=2)
+    assert fetcher.fetch_arxiv_papers() == []
+    # 首次请求加两次重试
+    assert server.stats['errors_injected'] == server.stats['requests'] == 3
@@ -0,0 +1,91 @@
+"""资源压缩不改变字符串/正则表达式字面量；过期的压缩/带哈希资源只保留上一版本"""
+
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from scripts.assets import minify_css, minify_js, write_asset
+
+TRICKY_JS = r'''
+// 整行注释
+const url = "http://example.com/a";   // 行尾注释
+const single = 'it\'s // still a string';
+const pattern = /\/\/+|[/*]/g;  /* 块注释 */ const half = 4 / 2 / 1;
+const tpl = `line one  // kept
+    indented ${ {a: "}"}.a } /* kept */ ${url}`;
+function f(text) {
+    return /^a+b/.test(text) ? text.replace(/\s+/g, ' ') : typeof /x/;
+}
+'''
+
+VALUES = "[url, single, '' + pattern, half, tpl, f('aab  c'), f('c')]"
+
+
+def test_minify_js_keeps_literals():
+    minified = minify_js(TRICKY_JS)
+    assert '整行注释' not in minified and '行尾注释' not in minified and '块注释' not in minified
+    for literal in ['"http://example.com/a"', r"'it\'s // still a string'", r'/\/\/+|[/*]/g',
+                    '`line one  // kept\n    indented ${ {a: "}"}.a } /* kept */ ${url}`', r'/\s+/g']:
+        assert literal in minified
+    assert '4 / 2 / 1' in minified
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="需要 node")
+def test_minify_js_evaluates_the_same():
+    def evaluate(js):
+        script = js + f"\nconsole.log(JSON.stringify({VALUES}));\n"
+        return subprocess.run(['node', '-e', script], capture_output=True, text=True, check=True).stdout
+    assert evaluate(minify_js(TRICKY_JS)) == evaluate(TRICKY_JS)
+
+
+def test_minify_css_keeps_strings():
+    css = '/* 注释 */\na::before {\n  content: "a  ;  b /* x */";\n}\nb > c { color : red ; }\n'
+    assert minify_css(css) == 'a::before{content:"a  ;  b /* x */"}b>c{color:red}'
+
+
+@pytest.mark.parametrize("css, expected", [
+    ('p { color : red ; margin :0 }', 'p{color:red;margin:0}'),
+    ('p { --gap : 4px; }', 'p{--gap:4px}'),
+    # 选择器中冒号前的空格有含义（后代元素的 :hover），保持不变
+    ('a :hover { color : red }', 'a :hover{color:red}'),
+    ('@media (max-width: 600px) { .card :first-child { margin : 0 } }',
+     '@media (max-width:600px){.card :first-child{margin:0}}'),
+])
+def test_minify_css_strips_spaces_around_declaration_colons(css, expected):
+    assert minify_css(css) == expected
+
+
+def test_write_asset_keeps_previous_generation(tmp_path):
+    path = tmp_path / "main.js"
+    names = []
+    for i, content in enumerate(["a", "b", "c"]):
+        names.append(write_asset(path, content))
+        # 保证修改时间有先后
+        os.utime(tmp_path / names[-1], ns=(i * 10**9, i * 10**9))
+    remaining = sorted(p.name for p in tmp_path.iterdir())
+    assert remaining == sorted(names[1:])
+    # 内容不变时不重写，上一版本仍然保留
+    assert write_asset(path, "c") == names[2]
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(names[1:])
+
+
+def test_switching_modes_prunes_all_but_the_previous_generation(tmp_path):
+    path = tmp_path / "main.js"
+    written = []
+    for i, (content, fingerprint) in enumerate([("a", True), ("b", True), ("c", False), ("d", True)]):
+        written.append(write_asset(path, content, fingerprint=fingerprint))
+        os.utime(tmp_path / written[-1], ns=(i * 10**9, i * 10**9))
+        # 当前引用的文件和最近的一个旧版本
+        assert sorted(p.name for p in tmp_path.iterdir()) == sorted(written[-2:])
+    assert written[2] == "main.min.js"
+
+
+def test_unrelated_files_are_not_pruned(tmp_path):
+    for name in ["main.js", "main.js.gz", "mainx.0123456789.js", "other.0123456789.js", "main.0123456789.css"]:
+        (tmp_path / name).write_text("x", encoding='utf-8')
+    for content in ["a", "b", "c"]:
+        write_asset(tmp_path / "main.js", content)
+    assert {"main.js", "main.js.gz", "mainx.0123456789.js", "other.0123456789.js",
+            "main.0123456789.css"} <= {p.name for p in tmp_path.iterdir()}
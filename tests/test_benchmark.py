@@ -0,0 +1,29 @@
+"""基准测试的回归判断"""
+
+from benchmark import compare
+
+
+def result(median, stdev=0.0):
+    return {'median': median, 'stdev': stdev}
+
+
+def run(base, current, **options):
+    options = {'threshold': 0.25, 'min_delta': 0.02, 'noise_sigma': 3.0, **options}
+    return compare({'results': {'x/1k': current}}, {'results': {'x/1k': base}}, **options)
+
+
+def test_small_absolute_change_is_not_a_regression():
+    # 16ms -> 21.7ms：+35%，但只有几毫秒
+    assert run(result(0.016), result(0.0217)) == []
+
+
+def test_change_within_noise_is_not_a_regression():
+    assert run(result(0.5, 0.05), result(0.7, 0.05)) == []
+
+
+def test_clear_regression_is_reported():
+    assert run(result(0.5, 0.01), result(0.8, 0.01)) == ['x/1k']
+
+
+def test_unknown_items_are_skipped():
+    assert compare({'results': {'y/1k': result(1.0)}}, {'results': {}}, 0.25, 0.02, 3.0) == []
@@ -0,0 +1,201 @@
+"""EnrichmentCache：命中跳过计算、按配置分别失效、LRU 淘汰，以及快照 + 追加日志的持久化"""
+
+import json
+
+import pytest
+
+from scripts import enrichment
+from scripts.enrichment import EnrichmentCache, config_fingerprint
+
+
+def make_paper(i, comment=None):
+    return {'id': f'2501.{i:05d}', 'title': f'Paper {i}', 'abstract': f'Abstract {i}', 'comment': comment}
+
+
+class Recorder:
+    """记录调用次数的会议提取和分类函数"""
+
+    def __init__(self):
+        self.venue_calls = 0
+        self.classify_calls = 0
+
+    def extract_venue(self, comment):
+        self.venue_calls += 1
+        return 'CVPR 2025' if comment and 'CVPR' in comment else None
+
+    def classify(self, paper):
+        self.classify_calls += 1
+        return ['Computer Vision']
+
+
+def open_cache(path, venues='v1', tags='t1', max_entries=100):
+    return EnrichmentCache(str(path), venue_fingerprint=config_fingerprint(venues),
+                           tags_fingerprint=config_fingerprint(tags), max_entries=max_entries)
+
+
+def test_from_config_returns_none_when_disabled():
+    assert EnrichmentCache.from_config({'enrichment_cache': {'enabled': False}}) is None
+    assert EnrichmentCache.from_config({}) is None
+
+
+def test_hit_skips_matching(tmp_path):
+    cache = open_cache(tmp_path / "cache.json")
+    recorder = Recorder()
+    first = make_paper(1, 'Accepted to CVPR 2025')
+    assert cache.enrich(first, recorder.extract_venue, recorder.classify)
+
+    # 内容相同的另一份记录（如重叠窗口中再次抓到）直接使用缓存
+    again = make_paper(1, 'Accepted to CVPR 2025')
+    assert not cache.enrich(again, recorder.extract_venue, recorder.classify)
+    assert (recorder.venue_calls, recorder.classify_calls) == (1, 1)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert again['conference'] == 'CVPR 2025' and again['tags'] == ['Computer Vision']
+
+
+def test_content_change_is_a_miss(tmp_path):
+    cache = open_cache(tmp_path / "cache.json")
+    recorder = Recorder()
+    cache.enrich(make_paper(1), recorder.extract_venue, recorder.classify)
+    revised = dict(make_paper(1), comment='Accepted to CVPR 2025')
+    assert cache.enrich(revised, recorder.extract_venue, recorder.classify)
+    assert revised['conference'] == 'CVPR 2025'
+
+
+@pytest.mark.parametrize("changed, calls", [
+    ({'venues': 'v2'}, (1, 0)),
+    ({'tags': 't2'}, (0, 1)),
+])
+def test_config_change_invalidates_only_its_half(tmp_path, changed, calls):
+    path = tmp_path / "cache.json"
+    cache = open_cache(path)
+    cache.enrich(make_paper(1), Recorder().extract_venue, Recorder().classify)
+    cache.save()
+
+    recorder = Recorder()
+    cache = open_cache(path, **changed)
+    assert cache.enrich(make_paper(1), recorder.extract_venue, recorder.classify)
+    assert (recorder.venue_calls, recorder.classify_calls) == calls
+
+
+def test_lru_eviction_at_cap(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = open_cache(path, max_entries=2)
+    recorder = Recorder()
+    for i in (1, 2):
+        cache.enrich(make_paper(i), recorder.extract_venue, recorder.classify)
+    # 访问 1 之后，最久未使用的是 2
+    assert cache.lookup(make_paper(1)) is not None
+    cache.enrich(make_paper(3), recorder.extract_venue, recorder.classify)
+
+    assert len(cache) == 2
+    assert cache.lookup(make_paper(2)) is None
+    cache.save()
+    reloaded = open_cache(path, max_entries=2)
+    assert [reloaded.lookup(make_paper(i)) is not None for i in (1, 2, 3)] == [True, False, True]
+
+
+def test_lowering_the_cap_shrinks_the_snapshot(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = open_cache(path)
+    for i in range(5):
+        cache.enrich(make_paper(i), Recorder().extract_venue, Recorder().classify)
+    cache.save()
+
+    cache = open_cache(path, max_entries=3)
+    cache.save()
+    assert len(json.loads(path.read_text())['entries']) == 3
+    assert [open_cache(path).lookup(make_paper(i)) is not None for i in range(5)] == [False, False, True, True, True]
+
+
+def test_save_appends_only_touched_entries(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = open_cache(path)
+    for i in range(50):
+        cache.enrich(make_paper(i), Recorder().extract_venue, Recorder().classify)
+    cache.save()
+    snapshot = path.read_bytes()
+    journal = path.with_name("cache.json.log")
+    assert not journal.exists()
+
+    # 第二次运行：一篇命中、一篇新论文，只追加这两条，快照不重写
+    cache = open_cache(path)
+    cache.enrich(make_paper(10), Recorder().extract_venue, Recorder().classify)
+    cache.enrich(make_paper(99), Recorder().extract_venue, Recorder().classify)
+    cache.save()
+    assert path.read_bytes() == snapshot
+    assert [json.loads(line)[0] for line in journal.read_text().splitlines()] == [
+        enrichment.content_hash(make_paper(10)), enrichment.content_hash(make_paper(99))]
+
+    # 重放日志后与内存中的状态（含 LRU 顺序）一致
+    assert list(open_cache(path)._entries.items()) == list(cache._entries.items())
+
+
+def test_clean_run_writes_nothing(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = open_cache(path)
+    cache.enrich(make_paper(1), Recorder().extract_venue, Recorder().classify)
+    cache.save()
+
+    cache = open_cache(path)
+    cache.enrich(make_paper(1), Recorder().extract_venue, Recorder().classify)
+    cache.save()
+    assert not path.with_name("cache.json.log").exists()
+
+
+def test_journal_is_compacted_once_longer_than_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(enrichment, 'MIN_COMPACT_LINES', 0)
+    path = tmp_path / "cache.json"
+    journal = path.with_name("cache.json.log")
+    cache = open_cache(path)
+    for i in range(4):
+        cache.enrich(make_paper(i), Recorder().extract_venue, Recorder().classify)
+    cache.save()
+
+    for i in range(4, 8):
+        cache = open_cache(path)
+        cache.enrich(make_paper(i), Recorder().extract_venue, Recorder().classify)
+        cache.save()
+    # 4 条快照 + 4 行日志：还不超过快照条目数
+    assert len(journal.read_text().splitlines()) == 4
+
+    # 再访问全部 8 篇并新增 1 篇：日志将超过快照，改为重写快照
+    cache = open_cache(path)
+    for i in range(9):
+        cache.enrich(make_paper(i), Recorder().extract_venue, Recorder().classify)
+    cache.save()
+    assert not journal.exists()
+    assert len(json.loads(path.read_text())['entries']) == 9
+
+
+def test_truncated_journal_line_is_skipped(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = open_cache(path)
+    cache.enrich(make_paper(1), Recorder().extract_venue, Recorder().classify)
+    cache.save()
+    cache = open_cache(path)
+    cache.enrich(make_paper(2), Recorder().extract_venue, Recorder().classify)
+    cache.save()
+    journal = path.with_name("cache.json.log")
+    journal.write_text(journal.read_text() + '["abc", nul')
+
+    reloaded = open_cache(path)
+    assert len(reloaded) == 2
+    assert reloaded.lookup(make_paper(2)) is not None
+
+
+def test_version_change_discards_snapshot_and_journal(tmp_path, monkeypatch):
+    path = tmp_path / "cache.json"
+    cache = open_cache(path)
+    cache.enrich(make_paper(1), Recorder().extract_venue, Recorder().classify)
+    cache.save()
+    cache = open_cache(path)
+    cache.enrich(make_paper(2), Recorder().extract_venue, Recorder().classify)
+    cache.save()
+
+    monkeypatch.setattr(enrichment, 'ENRICHMENT_VERSION', enrichment.ENRICHMENT_VERSION + 1)
+    cache = open_cache(path)
+    assert len(cache) == 0
+    cache.enrich(make_paper(3), Recorder().extract_venue, Recorder().classify)
+    cache.save()
+    assert not path.with_name("cache.json.log").exists()
+    assert len(open_cache(path)) == 1
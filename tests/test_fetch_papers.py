@@ -0,0 +1,298 @@
+"""PaperFetcher 针对本地替身服务器的抓取行为"""
+
+import json
+import statistics
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from scripts.arxiv_stub_server import SyntheticSource
+from scripts.fetch_papers import PaperCollector, PaperFetcher
+from scripts.paper import Paper
+from scripts.storage import open_store
+from scripts.synthetic import SyntheticCorpus
+
+NOW = datetime(2025, 6, 2, tzinfo=timezone.utc)
+CATEGORIES = ['cs.AI', 'cs.CV', 'cs.LG']
+
+
+@pytest.fixture
+def corpus():
+    return SyntheticCorpus(600, papers_per_day=100, now=NOW)
+
+
+def ids(papers):
+    return [p['id'] for p in papers]
+
+
+class FailingCategorySource(SyntheticSource):
+    """指定类别的请求总是返回 500"""
+
+    def __init__(self, corpus, failing):
+        super().__init__(corpus)
+        self.failing = failing
+
+    def respond(self, params):
+        if f"cat:{self.failing}" in params.get('search_query', ''):
+            return 500, b'upstream failure'
+        return super().respond(params)
+
+
+# ---- 跨类别合并 ----
+
+def hit(paper_id, category):
+    """模拟 _result_to_paper：记录的 venue 为命中类别，并统计构建次数"""
+    def make():
+        hit.built += 1
+        return Paper(id=paper_id, title=paper_id, categories=['cs.CV', 'cs.AI'], venue=category)
+    return make
+
+
+@pytest.mark.parametrize("arrival", [["cs.AI", "cs.CV"], ["cs.CV", "cs.AI"]])
+def test_collector_merges_hits_regardless_of_arrival_order(arrival):
+    hit.built = 0
+    collector = PaperCollector(['cs.AI', 'cs.CV', 'cs.LG'])
+    ranks = {'cs.AI': 5, 'cs.CV': 0}
+    collector.add('2506.00002v1', 'cs.CV', 1, hit('2506.00002v1', 'cs.CV'))
+    for category in arrival:
+        collector.add('2506.00001v1', category, ranks[category], hit('2506.00001v1', category))
+    # 交叉发布的论文在 API 的类别列表之外被命中，也补进 categories
+    collector.add('2506.00001v1', 'cs.LG', 0, hit('2506.00001v1', 'cs.LG'))
+
+    papers = collector.papers()
+    assert hit.built == 2
+    assert collector.duplicates == 2
+    assert [p['id'] for p in papers] == ['2506.00001v1', '2506.00002v1']
+    assert papers[0]['venue'] == 'cs.AI'
+    assert list(papers[0]['categories']) == ['cs.CV', 'cs.AI', 'cs.LG']
+
+
+# ---- 并发抓取与全局限速 ----
+
+def test_concurrent_requests_are_spaced_by_the_limiter(stub_server, make_fetcher, freeze_now, corpus):
+    freeze_now(NOW)
+    server = stub_server(SyntheticSource(corpus))
+    interval = 0.15
+    fetcher = make_fetcher(server, categories=CATEGORIES, concurrency=3, rate_limit=interval,
+                           page_size=10, min_page_size=5)
+    fetcher.fetch_arxiv_papers()
+    times = sorted(r['time'] for r in server.requests)
+    assert len(times) >= 6
+    gaps = [b - a for a, b in zip(times, times[1:])]
+    # 到达时间有少量网络抖动
+    assert min(gaps) >= interval - 0.03
+
+
+def test_client_does_not_add_its_own_delay(stub_server, make_fetcher, freeze_now, corpus):
+    """请求间隔只由共享限速器决定，arxiv.Client 自身不再等待
+
+    Client 从上一次响应结束时开始计算 delay_seconds，若也设为限速间隔，
+    每页的间隔会变成 响应延迟 + 限速间隔，而不是限速间隔。
+    """
+    freeze_now(NOW)
+    interval, latency = 0.2, 0.15
+    server = stub_server(SyntheticSource(corpus), latency=latency)
+    make_fetcher(server, categories=['cs.AI'], rate_limit=interval, page_size=5, min_page_size=5).fetch_arxiv_papers()
+    times = [r['time'] for r in server.requests]
+    assert len(times) >= 4
+    assert statistics.median(b - a for a, b in zip(times, times[1:])) < interval + latency / 2
+
+
+def test_output_is_identical_for_one_and_many_workers(stub_server, make_fetcher, freeze_now, corpus):
+    freeze_now(NOW)
+    server = stub_server(SyntheticSource(corpus))
+    serial = make_fetcher(server, categories=CATEGORIES, concurrency=1, page_size=10).fetch_arxiv_papers()
+    parallel = make_fetcher(server, categories=CATEGORIES, concurrency=3, page_size=10).fetch_arxiv_papers()
+    assert serial and [p.to_dict() for p in parallel] == [p.to_dict() for p in serial]
+
+
+def test_failed_category_does_not_abort_the_others(stub_server, make_fetcher, freeze_now, corpus):
+    freeze_now(NOW)
+    healthy = stub_server(SyntheticSource(corpus))
+    expected = make_fetcher(healthy, categories=['cs.AI', 'cs.LG'], page_size=10).fetch_arxiv_papers()
+
+    broken = stub_server(FailingCategorySource(corpus, 'cs.CV'))
+    fetcher = make_fetcher(broken, categories=CATEGORIES, concurrency=3, num_retries=2, incremental=True,
+                           page_size=10)
+    papers = fetcher.fetch_arxiv_papers()
+    # cs.CV 的三次请求（首次加两次重试）全部失败，其余类别照常返回
+    assert sum('cat:cs.CV' in r['search_query'] for r in broken.requests) == 3
+    assert ids(papers) == ids(expected)
+    # 失败的类别不推进游标，下次运行仍会覆盖它的时间窗口
+    categories_state = fetcher.fetch_state['categories']
+    assert 'cursor' not in categories_state.get('cs.CV', {})
+    assert 'cursor' in categories_state['cs.AI'] and 'cursor' in categories_state['cs.LG']
+
+
+# ---- 提前结束分页与自适应页大小 ----
+
+@pytest.fixture
+def unrevised():
+    """没有修订版本的语料：按更新时间与按提交时间的顺序相同，窗口内的论文恰好是结果的前 K 条"""
+    return SyntheticCorpus(600, papers_per_day=100, now=NOW, revision_rate=0)
+
+
+def in_window(corpus, category, days=1):
+    start = NOW.timestamp() - days * 86400
+    return [corpus.entry(i)['id'] for i in range(len(corpus))
+            if category in corpus.categories_for(i) and corpus.entry(i)['updated'].timestamp() >= start]
+
+
+def expected_page_sizes(in_window_count, first, max_size, min_size):
+    """整页在窗口内时页大小翻倍，越过边界后用最小页探测，第一个整页都在窗口外的页之后停止"""
+    sizes, size, offset = [], first, 0
+    while True:
+        sizes.append(size)
+        hits = max(0, min(in_window_count - offset, size))
+        offset += size
+        if hits == 0:
+            return sizes
+        size = min(size * 2, max_size) if hits == size else min_size
+
+
+@pytest.mark.parametrize("boundary", ["exact", "one_short", "one_over", "third"])
+def test_paging_stops_after_the_first_page_outside_the_window(stub_server, make_fetcher, freeze_now,
+                                                              unrevised, boundary):
+    freeze_now(NOW)
+    expected = in_window(unrevised, 'cs.AI')
+    k = len(expected)
+    page_size = {'exact': k, 'one_short': k - 1, 'one_over': k + 1, 'third': k // 3}[boundary]
+    server = stub_server(SyntheticSource(unrevised))
+    fetcher = make_fetcher(server, categories=['cs.AI'], page_size=page_size, min_page_size=3, max_results=1000)
+    papers = fetcher.fetch_arxiv_papers()
+
+    # 窗口跨越页边界时也不丢论文
+    assert ids(papers) == expected
+    sizes = [int(r['max_results']) for r in server.requests]
+    assert sizes == expected_page_sizes(k, page_size, page_size, 3)
+    # 比窗口内的论文多请求的只有一页（越过边界后的探测页或第一个整页在窗口外的页）
+    assert sum(sizes[:-1]) >= k and len(sizes) <= -(-k // page_size) + 2
+
+
+def test_page_size_grows_while_pages_are_full(stub_server, make_fetcher, freeze_now, unrevised):
+    freeze_now(NOW)
+    k = len(in_window(unrevised, 'cs.AI'))
+    server = stub_server(SyntheticSource(unrevised))
+    fetcher = make_fetcher(server, categories=['cs.AI'], page_size=64, min_page_size=2, max_results=1000)
+    # 近期每天约 1 篇：首页只取最小页，随后整页命中时逐页翻倍
+    fetcher.fetch_state['categories']['cs.AI'] = {'daily_rate': 1.0}
+    papers = fetcher.fetch_arxiv_papers()
+    assert len(papers) == k
+    sizes = [int(r['max_results']) for r in server.requests]
+    assert sizes[:3] == [2, 4, 8]
+    assert sizes == expected_page_sizes(k, 2, 64, 2)
+
+
+def test_daily_rate_is_an_ema_and_sizes_the_next_first_page(stub_server, make_fetcher, freeze_now, unrevised):
+    freeze_now(NOW)
+    k = len(in_window(unrevised, 'cs.AI'))
+    server = stub_server(SyntheticSource(unrevised))
+    fetcher = make_fetcher(server, categories=['cs.AI'], page_size=100, min_page_size=5, max_results=1000)
+    fetcher.fetch_state['categories']['cs.AI'] = {'daily_rate': 10.0}
+    # 首页按上次的估计：10 篇/天 * 1 天 * 1.25 + 1
+    fetcher.fetch_arxiv_papers()
+    assert int(server.requests[0]['max_results']) == 13
+    # 窗口为 1 天：本次观测到 k 篇/天，与上次的估计各占一半
+    assert fetcher.fetch_state['categories']['cs.AI']['daily_rate'] == round(0.5 * k + 0.5 * 10.0, 2)
+
+    server.requests.clear()
+    fetcher.fetch_arxiv_papers()
+    rate = 0.5 * k + 0.5 * 10.0
+    assert int(server.requests[0]['max_results']) == min(int(rate * 1.25) + 1, 100)
+
+
+# ---- 增量抓取：游标与重叠窗口 ----
+
+class DelayedSource(SyntheticSource):
+    """最新的 hidden 篇论文尚未出现在 API 中，模拟两次运行之间新提交的论文"""
+
+    def __init__(self, corpus, hidden):
+        super().__init__(corpus)
+        self.hidden = hidden
+
+    def _indices_for_query(self, query):
+        return [i for i in super()._indices_for_query(query) if i >= self.hidden]
+
+
+@pytest.fixture
+def incremental(tmp_path, make_config, stub_server, unrevised):
+    """两次运行共用的配置：3 天窗口、12 小时重叠，数据和状态都写在 tmp_path 下"""
+    source = DelayedSource(unrevised, hidden=25)  # 每天 100 篇：最新 6 小时
+    server = stub_server(source)
+    config = make_config(
+        {'api_url': server.url, 'incremental': True, 'days_back': 3, 'overlap_hours': 12,
+         'page_size': 20, 'min_page_size': 5, 'max_results': 1000},
+        output={'data_dir': str(tmp_path / "data"), 'papers_path': str(tmp_path / "data" / "papers")},
+    )
+    return source, server, config
+
+
+def updated_since(corpus, category, start, hidden=0):
+    return {corpus.entry(i)['id'] for i in range(hidden, len(corpus))
+            if category in corpus.categories_for(i) and corpus.entry(i)['updated'] >= start}
+
+
+def test_second_run_fetches_only_the_overlap_and_new_papers(freeze_now, unrevised, incremental, tmp_path):
+    source, server, config = incremental
+    first_now = freeze_now(NOW - timedelta(hours=6))
+    PaperFetcher(config).run()
+    first_requests = len(server.requests)
+    first_ids = {p['id'] for p in open_store(str(tmp_path / "data" / "papers")).load_all()}
+    assert first_ids == updated_since(unrevised, 'cs.AI', first_now - timedelta(days=3), hidden=25)
+
+    state = json.loads((tmp_path / "data" / "fetch_state.json").read_text(encoding='utf-8'))
+    cursor = datetime.fromisoformat(state['categories']['cs.AI']['cursor']['updated'])
+    newest_visible = max(unrevised.entry(i)['updated'] for i in range(25, len(unrevised))
+                         if 'cs.AI' in unrevised.categories_for(i))
+    assert cursor == newest_visible
+
+    # 6 小时后：新论文出现，窗口从 游标 - 重叠 开始，而不是 days_back
+    source.hidden = 0
+    server.requests.clear()
+    freeze_now(NOW)
+    fetcher = PaperFetcher(config)
+    second = {p['id'] for p in fetcher.fetch_arxiv_papers()}
+    window_start = cursor - timedelta(hours=12)
+    assert second == updated_since(unrevised, 'cs.AI', window_start)
+    assert second - first_ids == updated_since(unrevised, 'cs.AI', cursor) - first_ids
+    assert second & first_ids == updated_since(unrevised, 'cs.AI', window_start, hidden=25)
+    assert 0 < len(server.requests) < first_requests
+
+
+def test_stale_cursor_is_clamped_to_days_back(incremental, freeze_now):
+    _, _, config = incremental
+    freeze_now(NOW)
+    fetcher = PaperFetcher(config)
+    default_start = NOW - timedelta(days=3)
+    fetcher.fetch_state['categories']['cs.AI'] = {
+        'cursor': {'updated': (NOW - timedelta(days=10)).isoformat(), 'id': '2505.00001v1'}}
+    assert fetcher._window_start('cs.AI', default_start) == default_start
+    fetcher.fetch_state['categories']['cs.AI']['cursor']['updated'] = (NOW - timedelta(hours=1)).isoformat()
+    assert fetcher._window_start('cs.AI', default_start) == NOW - timedelta(hours=13)
+
+
+def test_cursor_is_kept_when_results_are_truncated(incremental, freeze_now, make_config):
+    _, server, config = incremental
+    freeze_now(NOW)
+    old_cursor = {'updated': (NOW - timedelta(days=2)).isoformat(), 'id': '2505.00001v1'}
+    fetcher = PaperFetcher(make_config({'api_url': server.url, 'incremental': True, 'days_back': 3,
+                                        'page_size': 20, 'min_page_size': 5, 'max_results': 10}))
+    fetcher.fetch_state['categories']['cs.AI'] = {'cursor': dict(old_cursor)}
+    assert len(fetcher.fetch_arxiv_papers()) == 10
+    assert fetcher.fetch_state['categories']['cs.AI']['cursor'] == old_cursor
+    # 每天论文数仍然更新
+    assert 'daily_rate' in fetcher.fetch_state['categories']['cs.AI']
+
+
+def test_state_is_not_saved_when_saving_papers_fails(incremental, freeze_now, tmp_path, monkeypatch):
+    _, _, config = incremental
+    freeze_now(NOW)
+    fetcher = PaperFetcher(config)
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+    monkeypatch.setattr(fetcher, 'save_papers', fail)
+    with pytest.raises(OSError):
+        fetcher.run()
+    # 游标没有写出，下次运行会重新抓取这段时间
+    assert not (tmp_path / "data" / "fetch_state.json").exists()
@@ -0,0 +1,297 @@
+"""HTMLGenerator：分页、增量构建的输出与完整生成一致"""
+
+import io
+import json
+import random
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from scripts.assets import MinifyingWriter, minify_html
+from scripts.build_manifest import LEGACY_MANIFEST_NAME, source_hash
+from scripts import generate_html
+from scripts.generate_html import HTMLGenerator
+from scripts.paper import StoredPapers, from_records, to_records
+from scripts.storage import open_store
+from scripts.synthetic import SyntheticCorpus
+
+# 统计数字和更新时间每次运行都会变化，内容未变的页面不会重写（以 site.json 为准）
+_STATS_RE = re.compile(r'(<span data-stat="\w+">)[^<]*(</span>)')
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    corpus = SyntheticCorpus(600, now=datetime(2025, 6, 1, tzinfo=timezone.utc))
+    return list(from_records(dict(p) for p in corpus.papers()))
+
+
+def build(output_dir: Path, papers, **options):
+    options = {'papers_per_page': 20, 'workers': 1, **options}
+    generator = HTMLGenerator(data_path=str(output_dir / "none"), output_dir=str(output_dir), **options)
+    generator.load_papers = lambda: setattr(generator, 'papers', list(papers))
+    generator.run()
+    return generator
+
+
+def snapshot(output_dir: Path):
+    files = {}
+    for path in sorted(output_dir.rglob('*')):
+        if path.is_file() and path.name != 'site.json':
+            text = path.read_text(encoding='utf-8')
+            files[str(path.relative_to(output_dir))] = _STATS_RE.sub(r'\1\2', text)
+    return files
+
+
+@pytest.mark.parametrize("options", [{}, {'render_mode': 'virtual'}, {'minify': True, 'fingerprint_assets': True}])
+def test_incremental_build_matches_full_build(tmp_path, corpus, options):
+    incremental = tmp_path / "incremental" / "docs"
+    build(incremental, corpus[150:], **options)
+    # 新增论文，并修改一篇已有论文
+    papers = corpus[:]
+    papers[400] = from_records([dict(papers[400].to_dict(), title="Edited title")]).__next__()
+    generator = build(incremental, papers, **options)
+    assert generator.manifest.skipped > 0
+
+    full = tmp_path / "full" / "docs"
+    build(full, papers, incremental=False, **options)
+    assert snapshot(incremental) == snapshot(full)
+
+
+@pytest.mark.parametrize("options", [{}, {'render_mode': 'virtual'}, {'workers': 3, 'parallel_min_papers': 50}])
+def test_build_from_the_store_matches_the_loaded_list(tmp_path, corpus, options):
+    """load_papers 只保留记录哈希，页面、列表数据和搜索索引从存储流式读取，输出与整个列表在内存中时相同"""
+    open_store(str(tmp_path / "papers")).save_all(list(to_records(corpus)))
+    streamed = tmp_path / "streamed" / "docs"
+    options = dict(options)
+    workers = options.pop('workers', 1)
+    generator = HTMLGenerator(data_path=str(tmp_path / "papers"), output_dir=str(streamed),
+                              papers_per_page=20, workers=workers, **options)
+    generator.run()
+    assert isinstance(generator.papers, StoredPapers)
+
+    in_memory = tmp_path / "in_memory" / "docs"
+    build(in_memory, corpus, **options)
+    assert snapshot(streamed) == snapshot(in_memory)
+
+
+def test_unchanged_rebuild_skips_everything(tmp_path, corpus):
+    output = tmp_path / "docs"
+    build(output, corpus)
+    generator = build(output, corpus)
+    assert generator.manifest.rebuilt == 0
+
+
+def test_generator_code_change_rebuilds_everything(tmp_path, corpus, monkeypatch):
+    output = tmp_path / "docs"
+    build(output, corpus)
+    # 模板（生成代码）改动后，即使论文不变也不能沿用旧页面
+    monkeypatch.setattr(HTMLGenerator, 'TEMPLATE_HASH', HTMLGenerator.TEMPLATE_HASH[::-1])
+    generator = build(output, corpus)
+    assert generator.manifest.skipped == 0
+    assert generator.manifest.rebuilt > 0
+
+
+def test_template_hash_follows_the_generator_source(tmp_path):
+    source = tmp_path / "generate_html.py"
+    source.write_text("CARD = '<article>'\n", encoding='utf-8')
+    before = source_hash(source)
+    source.write_text("CARD = '<article class=\"paper\">'\n", encoding='utf-8')
+    assert source_hash(source) != before
+
+
+def test_manifest_is_kept_out_of_the_published_tree(tmp_path, corpus):
+    output = tmp_path / "docs"
+    output.mkdir()
+    (output / LEGACY_MANIFEST_NAME).write_text('{"version":1,"outputs":{}}', encoding='utf-8')
+    build(output, corpus)
+    assert not (output / LEGACY_MANIFEST_NAME).exists()
+    assert (tmp_path / ".cache" / "build-manifest-docs.json").exists()
+
+
+@pytest.mark.parametrize("damage", ["delete_meta", "delete_shard"])
+def test_search_index_rebuilds_when_existing_index_is_inconsistent(tmp_path, corpus, damage):
+    output = tmp_path / "docs"
+    build(output, corpus[100:])
+    search = output / "search"
+    if damage == "delete_meta":
+        (search / "meta.json").unlink()
+    else:
+        next(p for p in search.glob("*.json") if p.name not in ("meta.json", "facets.json")).unlink()
+    build(output, corpus)
+
+    full = tmp_path / "full" / "docs"
+    build(full, corpus, incremental=False)
+    assert snapshot(output / "search") == snapshot(full / "search")
+
+
+def make_generator(tmp_path, papers, **options):
+    options = {'papers_per_page': 20, 'workers': 1, **options}
+    generator = HTMLGenerator(data_path=str(tmp_path / "none"), output_dir=str(tmp_path / "docs"), **options)
+    generator.papers = list(papers)
+    return generator
+
+
+def card_ordinals(path: Path):
+    return [int(n) for n in re.findall(r'data-ordinal="(\d+)"', path.read_text(encoding='utf-8'))]
+
+
+@pytest.mark.parametrize("total", [0, 1, 19, 20, 39, 40, 41, 599])
+def test_page_ranges_cover_every_paper_once(tmp_path, corpus, total):
+    generator = make_generator(tmp_path, corpus[:total])
+    ranges = generator.page_ranges()
+    assert len(ranges) == generator.page_count()
+    # 从新到旧首尾相接；归档页每页正好 papers_per_page 篇，主页放剩下的（不足两页时全部放在主页）
+    assert [page for page, _, _ in ranges] == [0, *range(len(ranges) - 1, 0, -1)]
+    assert ranges[0][1] == 0 and ranges[-1][2] == total
+    assert all(prev[2] == cur[1] for prev, cur in zip(ranges, ranges[1:]))
+    assert all(end - start == 20 for _, start, end in ranges[1:])
+    if len(ranges) > 1:
+        assert 20 <= ranges[0][2] - ranges[0][1] < 40
+
+
+def test_archive_pages_keep_their_numbers_as_papers_arrive(tmp_path, corpus):
+    """新论文只进入主页：已有归档页的页号和内容（按序号）不变，主页满两页时分出新的一页"""
+    before = make_generator(tmp_path, corpus[100:])
+    after = make_generator(tmp_path, corpus)
+
+    def archive(generator):
+        total = len(generator.papers)
+        return {page: [total - 1 - i for i in range(start, end)] for page, start, end in generator.page_ranges() if page}
+
+    old, new = archive(before), archive(after)
+    assert len(new) > len(old)
+    assert {page: new[page] for page in old} == old
+
+
+def test_built_pages_follow_the_page_ranges(tmp_path, corpus):
+    output = tmp_path / "docs"
+    generator = build(output, corpus)
+    total = len(corpus)
+    for page, start, end in generator.page_ranges():
+        path = output / generator.page_filename(page)
+        assert card_ordinals(path) == [total - 1 - i for i in range(start, end)]
+    # 页数减少时删除多余的归档页
+    generator = build(output, corpus[:100])
+    assert sorted(p.name for p in output.glob("page-*.html")) == [f"page-{n}.html" for n in range(1, 5)]
+    assert generator.page_count() == 5
+
+
+def test_pagination_links_walk_every_page_newest_first(tmp_path, corpus):
+    output = tmp_path / "docs"
+    generator = build(output, corpus)
+    visited, name = [], "index.html"
+    while name:
+        visited.append(name)
+        match = re.search(r'<a class="page-link page-next" href="([^"]+)"', (output / name).read_text(encoding='utf-8'))
+        name = match.group(1) if match else None
+    assert visited == [generator.page_filename(page) for page, _, _ in generator.page_ranges()]
+
+
+def test_list_data_rows_follow_the_documented_shape(tmp_path, corpus):
+    papers = corpus[:]
+    # 链接无法由 id 推导的论文在行末附带 pdf/arxiv 链接（row[7]/row[8]）
+    mirrored = dict(papers[5].to_dict(), pdf_url="https://example.org/a.pdf", arxiv_url="https://example.org/a")
+    papers[5] = next(from_records([mirrored]))
+    output = tmp_path / "docs"
+    build(output, papers, render_mode='virtual')
+
+    data = json.loads((output / "list" / "papers.json").read_text(encoding='utf-8'))
+    assert data['count'] == len(papers) == len(data['papers'])
+    total = len(papers)
+    for ordinal, row in enumerate(data['papers']):
+        paper = papers[total - 1 - ordinal]
+        assert row[0] == paper['id'] and row[1] == paper['title'] and row[3] == paper['published']
+        assert row[4] == (paper.get('conference') or '')
+        assert data['categories'][row[5]] == HTMLGenerator.CATEGORY_NAMES.get(
+            paper.get('primary_category', paper['venue']), paper.get('primary_category', paper['venue']))
+        assert [data['tags'][i] for i in row[6]] == list(paper.get('tags', []))
+        if paper is papers[5]:
+            assert row[7:] == ["https://example.org/a.pdf", "https://example.org/a"]
+        else:
+            assert len(row) == 7
+
+
+def test_abstract_chunks_are_indexed_by_ordinal(tmp_path, corpus, monkeypatch):
+    monkeypatch.setattr(HTMLGenerator, 'ABSTRACT_CHUNK_SIZE', 64)
+    output = tmp_path / "docs"
+    build(output, corpus[100:], render_mode='virtual')
+    before = {p.name: p.read_bytes() for p in (output / "list").glob("abstracts-*.json")}
+
+    build(output, corpus, render_mode='virtual')
+    list_dir = output / "list"
+    total = len(corpus)
+    chunks = sorted(list_dir.glob("abstracts-*.json"), key=lambda p: int(p.stem.split('-')[1]))
+    assert len(chunks) == -(-total // 64)
+    abstracts = [text for path in chunks for text in json.loads(path.read_text(encoding='utf-8'))]
+    assert abstracts == [paper['abstract'] for paper in reversed(corpus)]
+    assert json.loads((list_dir / "papers.json").read_text(encoding='utf-8'))['abstract_chunk'] == 64
+
+    # 新增论文不会改写已经写满的摘要文件
+    full_chunks = (total - 100) // 64
+    for k in range(full_chunks):
+        assert (list_dir / f"abstracts-{k}.json").read_bytes() == before[f"abstracts-{k}.json"]
+
+
+@pytest.mark.parametrize("minify", [False, True])
+@pytest.mark.parametrize("count", [0, 1, 45])
+def test_streamed_page_is_byte_identical_to_the_rendered_string(tmp_path, corpus, minify, count):
+    generator = make_generator(tmp_path, corpus, minify=minify)
+    generator.output_dir.mkdir(parents=True)
+    papers = corpus[:count]
+    expected = generator.render_page(papers, 3, 7)
+    if minify:
+        expected = minify_html(expected)
+    path = generator.write_page(papers, 3, 7)
+    assert path.read_bytes() == expected.encode('utf-8')
+
+
+def test_minifying_writer_output_does_not_depend_on_chunk_boundaries(tmp_path, corpus):
+    generator = make_generator(tmp_path, corpus)
+    html = generator.render_page(corpus[:30])
+    rng = random.Random(0)
+    for _ in range(20):
+        cuts = sorted(rng.sample(range(1, len(html)), 200))
+        buffer = io.StringIO()
+        writer = MinifyingWriter(buffer)
+        writer.writelines(html[a:b] for a, b in zip([0, *cuts], [*cuts, len(html)]))
+        writer.close()
+        assert buffer.getvalue() == minify_html(html)
+
+
+@pytest.mark.parametrize("papers_per_page", [0, 20])
+def test_process_pool_output_equals_serial(tmp_path, corpus, monkeypatch, papers_per_page):
+    """单页（按卡片分块）和分页（按页分批）两种并行方式，输出都与串行渲染逐字节相同"""
+    monkeypatch.setattr(HTMLGenerator, 'CARD_CHUNK_SIZE', 50)
+    pools = []
+
+    class CountingPool(generate_html.ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            pools.append(self._max_workers)
+
+    monkeypatch.setattr(generate_html, 'ProcessPoolExecutor', CountingPool)
+    serial = tmp_path / "serial" / "docs"
+    build(serial, corpus, papers_per_page=papers_per_page)
+    assert pools == []
+
+    # 实例属性会随页面任务传给子进程，这里不替换 load_papers（数据文件不存在时保留已赋值的论文）
+    parallel = tmp_path / "parallel" / "docs"
+    generator = HTMLGenerator(data_path=str(tmp_path / "none"), output_dir=str(parallel),
+                              papers_per_page=papers_per_page, workers=3, parallel_min_papers=100)
+    generator.papers = list(corpus)
+    generator.run()
+    assert pools == [3]
+    assert snapshot(parallel) == snapshot(serial)
+
+
+def test_small_corpora_fall_back_to_serial(tmp_path, corpus):
+    generator = make_generator(tmp_path, corpus, workers=8, parallel_min_papers=2000)
+    assert generator._parallel_workers(len(corpus)) == 1
+    generator.parallel_min_papers = 100
+    # 进程数不超过卡片块数
+    assert generator._parallel_workers(len(corpus)) == 1
+    generator.CARD_CHUNK_SIZE = 100
+    assert generator._parallel_workers(len(corpus)) == 6
+    assert generator._parallel_workers(250) == 3
@@ -0,0 +1,76 @@
+"""KeywordMatcher：子串模式与原实现结果一致；按词模式的边界规则"""
+
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+import yaml
+
+from scripts.keywords import KeywordMatcher, tokenize
+from scripts.synthetic import SyntheticCorpus
+
+
+CONFIG_PATH = Path(__file__).resolve().parent.parent / "config.yaml"
+
+
+def config_categories():
+    """仓库配置中的真实关键词表（按路径读取，不依赖当前目录）"""
+    with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    return {name: info.get('keywords', []) for name, info in config['categories'].items()}
+
+
+def reference_classify(categories, text):
+    """原 PaperFetcher.classify_paper 的实现（子串匹配）"""
+    text = text.lower()
+    tags = set()
+    for name, keywords in categories.items():
+        for keyword in keywords:
+            if keyword.lower() in text:
+                tags.add(name)
+                break
+    return tags
+
+
+@pytest.fixture(scope="module")
+def categories():
+    return config_categories()
+
+
+def test_substring_mode_matches_reference_on_synthetic_corpus(categories):
+    matcher = KeywordMatcher(categories, word_boundary=False)
+    corpus = SyntheticCorpus(2000, now=datetime(2025, 6, 1, tzinfo=timezone.utc))
+    for paper in corpus.papers():
+        text = f"{paper['title']} {paper['abstract']}"
+        assert set(matcher.classify(text)) == reference_classify(categories, text)
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "A Vision-Language Model for Robotic Manipulation",
+    "Reinforcement learning for autonomous driving with LLMs",
+    "Eclipse detection with CLIP features",
+    "A controller for legged robots",
+    "LARGE LANGUAGE MODELS ARE FEW-SHOT LEARNERS",
+    "overlapping keywords: image segmentation and semantic segmentation",
+])
+def test_substring_mode_matches_reference(categories, text):
+    matcher = KeywordMatcher(categories, word_boundary=False)
+    assert set(matcher.classify(text)) == reference_classify(categories, text)
+
+
+def test_results_follow_configured_order():
+    matcher = KeywordMatcher({'B': ['beta'], 'A': ['alpha']})
+    assert matcher.classify("alpha and beta") == ['B', 'A']
+
+
+def test_word_boundary_mode():
+    matcher = KeywordMatcher({'Robotics': ['control'], 'CV': ['clip'], 'NLP': ['language model']})
+    assert matcher.classify("A controller for eclipse detection") == []
+    assert matcher.classify("Optimal control with CLIP") == ['Robotics', 'CV']
+    assert matcher.classify("Large language models") == ['NLP']
+
+
+def test_tokenize_strips_simple_plurals_only():
+    assert tokenize("Models, loss and GPUs") == ['model', ',', 'loss', 'and', 'gpu']
+    assert tokenize("gas bus") == ['gas', 'bus']
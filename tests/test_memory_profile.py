@@ -0,0 +1,32 @@
+"""内存预算检查和阶段计量"""
+
+import pytest
+
+from memory_profile import MB, MemoryProfiler, check_budgets
+
+
+def stage(name, peak_mb, stage_peak_mb):
+    return {'stage': name, 'peak_bytes': peak_mb * MB, 'stage_peak_bytes': stage_peak_mb * MB}
+
+
+def test_stage_peak_budget_catches_growth_within_stage():
+    budgets = {'1k': {'load_papers': {'peak': 10, 'stage_peak': 2}}}
+    assert check_budgets(1000, [stage('load_papers', 5, 1)], budgets) == []
+    assert check_budgets(1000, [stage('load_papers', 5, 3)], budgets) == ['load_papers/1k:stage_peak']
+
+
+def test_plain_number_budget_checks_total_peak():
+    budgets = {'1k': {'save_papers': 4}}
+    assert check_budgets(1000, [stage('save_papers', 5, 0.1)], budgets) == ['save_papers/1k:peak']
+    assert check_budgets(10000, [stage('save_papers', 5, 0.1)], budgets) == []
+
+
+def test_failed_stage_is_recorded(tmp_path):
+    with MemoryProfiler(tmp_path, top=1) as profiler:
+        with pytest.raises(ValueError):
+            with profiler.stage('broken'):
+                data = [bytes(1000) for _ in range(100)]
+                raise ValueError(len(data))
+    assert [s['stage'] for s in profiler.stages] == ['broken']
+    assert profiler.stages[0]['stage_peak_bytes'] > 100_000
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,34 @@
+"""运行指标的导出格式；失败的运行同样写出报告"""
+
+import json
+
+import pytest
+
+from scripts.generate_html import HTMLGenerator
+from scripts.metrics import RunMetrics
+
+
+def test_counters_are_exported_as_gauges():
+    metrics = RunMetrics('fetch')
+    metrics.increment('papers_saved', 3)
+    metrics.increment('api_errors', category='cs.AI')
+    text = metrics.prometheus_text()
+    assert '# TYPE dailypaper_papers_saved gauge' in text
+    assert 'dailypaper_papers_saved{run="fetch"} 3' in text
+    assert 'dailypaper_api_errors{run="fetch",category="cs.AI"} 1' in text
+    assert '_total' not in text and ' counter' not in text
+
+
+def test_failed_generate_run_still_saves_report(tmp_path):
+    metrics = RunMetrics('generate', report_dir=str(tmp_path / "metrics"))
+    generator = HTMLGenerator(data_path=str(tmp_path / "none"), output_dir=str(tmp_path / "docs"),
+                              workers=1, metrics=metrics)
+
+    def fail():
+        raise RuntimeError("磁盘已满")
+
+    generator.generate_index_html = fail
+    with pytest.raises(RuntimeError):
+        generator.run()
+    report = json.loads((tmp_path / "metrics" / "generate.json").read_text(encoding='utf-8'))
+    assert {s['name'] for s in report['stages']} >= {'load', 'assets', 'render'}
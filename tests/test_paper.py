@@ -0,0 +1,90 @@
+"""Paper 与 JSON 记录互转无损"""
+
+import json
+import pickle
+from datetime import datetime, timezone
+
+from scripts.paper import Paper, StoredPapers, from_records, iter_slices, to_records
+from scripts.storage import open_store
+from scripts.synthetic import SyntheticCorpus
+
+RECORD = {
+    'id': '2501.01234',
+    'title': 'A Title',
+    'authors': ['Ada Lovelace', 'Alan Turing'],
+    'abstract': 'Abstract text.',
+    'published': '2025-01-05',
+    'updated': '2025-01-06',
+    'categories': ['cs.LG', 'cs.AI'],
+    'primary_category': 'cs.LG',
+    'pdf_url': 'http://arxiv.org/pdf/2501.01234',
+    'arxiv_url': 'http://arxiv.org/abs/2501.01234v2',
+    'source': 'arXiv',
+    'venue': 'cs.LG',
+    'comment': None,
+    'conference': 'ICML 2025',
+    'tags': ['Machine Learning'],
+}
+
+
+def test_round_trip_preserves_record_and_key_order():
+    paper = Paper.from_dict(RECORD)
+    assert paper.to_dict() == RECORD
+    assert list(paper.to_dict()) == list(RECORD)
+    assert json.dumps(paper.to_dict()) == json.dumps(RECORD)
+
+
+def test_missing_and_unknown_fields_round_trip():
+    record = {'id': '2501.00001', 'title': 'T', 'citations': 3, 'extra': {'a': [1, 2]}}
+    paper = Paper.from_dict(record)
+    assert paper.to_dict() == record
+    assert 'conference' not in paper
+    assert paper.get('conference') is None
+    assert paper['citations'] == 3
+
+
+def test_dict_style_access_and_assignment():
+    paper = Paper.from_dict(RECORD)
+    assert paper['title'] == 'A Title'
+    assert paper.get('tags', []) == ('Machine Learning',)
+    paper['tags'] = ['Robotics', 'Machine Learning']
+    paper['conference'] = None
+    record = paper.to_dict()
+    assert record['tags'] == ['Robotics', 'Machine Learning']
+    assert record['conference'] is None
+    assert paper == record
+
+
+def test_derived_urls_follow_the_id():
+    paper = Paper.from_dict(RECORD)
+    assert paper['pdf_url'] == 'http://arxiv.org/pdf/2501.01234'
+    # 与 id 推导结果不同的链接原样保留
+    assert paper['arxiv_url'] == 'http://arxiv.org/abs/2501.01234v2'
+
+
+def test_pickle_round_trip():
+    paper = Paper.from_dict(RECORD)
+    assert pickle.loads(pickle.dumps(paper)).to_dict() == RECORD
+
+
+def test_synthetic_corpus_round_trips():
+    records = [dict(p) for p in SyntheticCorpus(500, now=datetime(2025, 6, 1, tzinfo=timezone.utc)).papers()]
+    assert list(to_records(from_records(records))) == records
+
+
+def test_stored_papers_match_the_loaded_list(tmp_path):
+    records = [dict(p) for p in SyntheticCorpus(120, now=datetime(2025, 6, 1, tzinfo=timezone.utc)).papers()]
+    store = open_store(str(tmp_path / "papers"))
+    store.save_all(records)
+    loaded = list(from_records(store.iter_papers()))
+    stored = StoredPapers(store, len(loaded))
+
+    def ids(papers):
+        return [p['id'] for p in papers]
+    assert len(stored) == len(loaded)
+    assert ids(stored) == ids(loaded)
+    for key in (slice(10, 30), slice(None, None, -1), slice(100, 5, -7), slice(200, 300)):
+        assert ids(stored[key]) == ids(loaded[key])
+    assert stored[-1].to_dict() == loaded[-1].to_dict()
+    ranges = [(0, 7), (7, 20), (50, 51), (110, 120)]
+    assert [ids(chunk) for chunk in iter_slices(stored, ranges)] == [ids(loaded[a:b]) for a, b in ranges]
@@ -0,0 +1,62 @@
+"""PaperIndex 与逐篇扫描的结果一致；生成器在论文列表变化时重建统计"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from scripts import utils
+from scripts.generate_html import HTMLGenerator
+from scripts.paper_index import PaperIndex
+from scripts.synthetic import SyntheticCorpus
+
+
+@pytest.fixture(scope="module")
+def papers():
+    corpus = list(SyntheticCorpus(500, now=datetime(2025, 6, 1, tzinfo=timezone.utc)).papers())
+    for i, paper in enumerate(corpus):
+        paper['tags'] = [['CV'], ['NLP', 'ML'], ['ML', 'ML'], []][i % 4]
+        paper['conference'] = 'ICML 2025' if i % 5 == 0 else ''
+    return corpus
+
+
+def test_queries_match_list_scan(papers):
+    index = PaperIndex(papers)
+    date = papers[0]['published']
+    assert utils.get_papers_by_date(index, date) == utils.get_papers_by_date(papers, date)
+    assert utils.get_papers_by_category(index, 'ML') == utils.get_papers_by_category(papers, 'ML')
+    author = papers[3]['authors'][0]
+    assert index.papers_by_author(author) == [p for p in papers if author in p['authors']]
+    assert index.published == sum(1 for p in papers if p['conference'])
+
+
+def test_repeated_tags_are_counted_once_everywhere(papers):
+    expected = {'CV': 125, 'NLP': 125, 'ML': 250}
+    assert utils.count_papers_by_category(papers) == expected
+    assert utils.count_papers_by_category(PaperIndex(papers)) == expected
+
+
+def test_incremental_add_matches_bulk_build(papers):
+    index = PaperIndex(papers[:200])
+    index.extend(papers[200:])
+    bulk = PaperIndex(papers)
+    assert index.by_tag == bulk.by_tag and index.by_author == bulk.by_author
+
+
+def test_fields_limit_the_postings(papers):
+    index = PaperIndex(papers, fields=('tag',))
+    assert index.by_author is None and index.by_date is None
+    assert index.count_by_tag() == PaperIndex(papers).count_by_tag()
+    assert index.published == PaperIndex(papers).published
+    with pytest.raises(ValueError):
+        index.papers_by_date(papers[0]['published'])
+    with pytest.raises(ValueError):
+        PaperIndex(papers, fields=('venue',))
+
+
+def test_generator_rebuilds_stats_when_papers_are_replaced(tmp_path, papers):
+    generator = HTMLGenerator(data_path=str(tmp_path / "none"), output_dir=str(tmp_path / "docs"), workers=1)
+    generator.papers = papers
+    assert generator.paper_stats()['published'] == 100
+    # 论文数相同但内容不同（例如重新加载了另一份数据）
+    generator.papers = [dict(p, conference='') for p in papers]
+    assert generator.paper_stats() == {'total': len(papers), 'published': 0, 'preprint': len(papers)}
@@ -0,0 +1,91 @@
+"""搜索索引倒排表的编码（每位 5 bit 的变长整数，使用 base64url 字母表）和追加写入"""
+
+import json
+import random
+import shutil
+import subprocess
+
+import pytest
+
+from scripts.generate_html import HTMLGenerator
+from scripts.search_index import SearchIndexBuilder, _append_postings, decode_postings, encode_postings
+
+CASES = [
+    [],
+    [0],
+    [31],
+    [32],
+    [0, 1, 2, 3],
+    [5, 37, 38, 1000, 1 << 20, (1 << 31) + 7],
+]
+
+
+def random_postings(seed, count=500, max_gap=5000):
+    rng = random.Random(seed)
+    ordinals, current = [], -1
+    for _ in range(count):
+        current += rng.randint(1, max_gap)
+        ordinals.append(current)
+    return ordinals
+
+
+@pytest.mark.parametrize("ordinals", CASES + [random_postings(seed) for seed in range(5)])
+def test_round_trip(ordinals):
+    assert decode_postings(encode_postings(ordinals)) == ordinals
+
+
+def test_encoding_is_compact_and_url_safe():
+    # 间隔小于 32 时每个序号只占一个字符
+    assert len(encode_postings(range(100))) == 100
+    encoded = encode_postings(random_postings(0))
+    assert set(encoded) <= set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_")
+
+
+def test_append_equals_encoding_everything_at_once():
+    ordinals = random_postings(1)
+    head, tail = ordinals[:200], ordinals[200:]
+    assert _append_postings(encode_postings(head), tail) == encode_postings(ordinals)
+    assert _append_postings('', tail) == encode_postings(tail)
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="需要 node")
+def test_main_js_decoder_matches(tmp_path):
+    generator = HTMLGenerator(data_path=str(tmp_path / "none"), output_dir=str(tmp_path))
+    generator.generate_js()
+    js = generator._js_content
+    start = js.index("const ALPHABET")
+    decoder = js[start:js.index("function postingsAt")]
+    cases = CASES + [random_postings(seed) for seed in range(3)]
+    script = decoder + (
+        f"const cases = {json.dumps([encode_postings(c) for c in cases])};\n"
+        "console.log(JSON.stringify(cases.map(decodePostings)));\n"
+    )
+    output = subprocess.run(['node', '-e', script], capture_output=True, text=True, check=True).stdout
+    assert json.loads(output) == cases
+
+
+def paper(i, tags=(), conference=None):
+    return {'id': f'p{i}', 'title': f'Paper number {i} about graphs', 'authors': [f'Author {i % 3}'],
+            'abstract': 'transformers' if i % 2 else 'diffusion', 'conference': conference, 'tags': list(tags)}
+
+
+def test_appending_to_an_index_matches_a_full_build(tmp_path):
+    papers = [paper(i, tags=['Robotics'] if i % 3 else [], conference='ICML 2024' if i % 4 == 0 else None)
+              for i in range(40)]
+
+    full = SearchIndexBuilder()
+    for p in papers:
+        full.add(p)
+    full.write(tmp_path / "full", per_page=10)
+
+    first = SearchIndexBuilder()
+    for p in papers[:25]:
+        first.add(p)
+    first.write(tmp_path / "appended", per_page=10)
+    rest = SearchIndexBuilder(25)
+    for p in papers[25:]:
+        rest.add(p)
+    rest.write(tmp_path / "appended", per_page=10, append=True)
+
+    for path in sorted((tmp_path / "full" / "search").iterdir()):
+        assert (tmp_path / "appended" / "search" / path.name).read_text() == path.read_text(), path.name
@@ -0,0 +1,91 @@
+"""SQLite 存储：只取 ID 的查询与完整记录一致；抓取时与其他存储的合并语义相同"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from scripts import utils
+from scripts.fetch_papers import PaperFetcher
+from scripts.sqlite_store import SqliteStore
+from scripts.storage import open_store
+from scripts.synthetic import SyntheticCorpus
+
+NOW = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture(scope="module")
+def papers():
+    corpus = list(SyntheticCorpus(800, now=NOW).papers())
+    for paper in corpus:
+        paper['tags'] = ['CV', 'ML'] if len(paper['title']) % 2 else ['NLP']
+        paper['conference'] = 'CVPR 2025' if len(paper['abstract']) % 3 == 0 else ''
+    return corpus
+
+
+@pytest.fixture()
+def store(tmp_path, papers):
+    store = SqliteStore(str(tmp_path / "papers.sqlite"))
+    store.save_all(papers)
+    yield store
+    store.close()
+
+
+def ids(records):
+    return [r['id'] for r in records]
+
+
+def test_id_queries_match_record_queries(store, papers):
+    date = papers[0]['published']
+    assert store.ids_by_date(date) == ids(store.papers_by_date(date))
+    assert store.ids_by_tag('CV') == ids(store.papers_by_tag('CV'))
+    assert store.ids_by_conference('CVPR 2025') == ids(store.papers_by_conference('CVPR 2025'))
+    category = papers[0]['primary_category']
+    assert store.ids_by_primary_category(category) == ids(store.papers_by_primary_category(category))
+
+
+def test_utils_id_queries_read_only_the_indexes(store, papers):
+    date = papers[0]['published']
+    assert utils.get_paper_ids_by_date(store, date) == utils.get_paper_ids_by_date(papers, date)
+    assert utils.get_paper_ids_by_category(store, 'NLP') == utils.get_paper_ids_by_category(papers, 'NLP')
+
+
+def test_get_keeps_requested_order(store, papers):
+    wanted = [papers[5]['id'], 'missing', papers[1]['id']]
+    assert store.get(wanted) == [papers[5], papers[1]]
+
+
+@pytest.mark.parametrize("name", ["papers", "papers.sqlite"])
+def test_save_papers_keeps_existing_papers(tmp_path, papers, name, make_config):
+    """重复抓取到的已有论文不覆盖，无论使用哪种存储"""
+    path = str(tmp_path / name)
+    open_store(path).save_all(papers[100:])
+    fetcher = PaperFetcher(make_config())
+    changed = dict(papers[100], title="Revised title")
+    fetcher.save_papers([changed] + papers[:100], path)
+    loaded = {p['id']: p for p in open_store(path).iter_papers()}
+    assert len(loaded) == len(papers)
+    assert loaded[changed['id']]['title'] == papers[100]['title']
+
+
+def test_update_existing_upserts_into_sqlite(tmp_path, papers, make_config):
+    path = str(tmp_path / "papers.sqlite")
+    open_store(path).save_all(papers[100:])
+    fetcher = PaperFetcher(make_config(output={'data_dir': str(tmp_path / "data"), 'update_existing': True},
+                                       metrics={'enabled': True, 'report_dir': str(tmp_path / "metrics")}))
+    changed = dict(papers[100], title="Revised title", conference='ICML 2025')
+    fetcher.save_papers([changed] + papers[:100], path)
+    store = open_store(path)
+    loaded = {p['id']: p for p in store.iter_papers()}
+    assert len(loaded) == len(papers)
+    assert loaded[changed['id']]['title'] == "Revised title"
+    assert changed['id'] in store.ids_by_conference('ICML 2025')
+    counters = {c['name']: c['value'] for c in fetcher.metrics.report()['counters']}
+    assert counters == {'papers_saved': 100, 'papers_updated': 1}
+
+
+def test_update_existing_is_ignored_by_other_stores(tmp_path, papers, make_config):
+    path = str(tmp_path / "papers")
+    open_store(path).save_all(papers[100:])
+    fetcher = PaperFetcher(make_config(output={'data_dir': str(tmp_path / "data"), 'update_existing': True}))
+    fetcher.save_papers([dict(papers[100], title="Revised title")], path)
+    assert next(p for p in open_store(path).iter_papers() if p['id'] == papers[100]['id']) == papers[100]
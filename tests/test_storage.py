@@ -0,0 +1,131 @@
+"""分片存储：旧单文件的迁移、manifest 中的计数和内容哈希、合并去重"""
+
+import hashlib
+import json
+
+from scripts.storage import JsonFileStore, ShardedStore, open_store
+
+
+def make_paper(paper_id, published, **fields):
+    return {'id': paper_id, 'title': f"Title {paper_id}", 'published': published, **fields}
+
+
+PAPERS = [
+    make_paper('2502.00002', '2025-02-03'),
+    make_paper('2502.00001', '2025-02-01'),
+    make_paper('2501.00003', '2025-01-20'),
+    make_paper('2501.00002', '2025-01-20'),
+    make_paper('2501.00001', '2025-01-05'),
+]
+
+
+def shard_sha256(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def test_open_store_dispatches_on_suffix(tmp_path):
+    assert isinstance(open_store(str(tmp_path / "papers.json")), JsonFileStore)
+    assert isinstance(open_store(str(tmp_path / "papers")), ShardedStore)
+
+
+def test_legacy_single_file_is_split_into_month_shards(tmp_path):
+    legacy = tmp_path / "papers.json"
+    legacy.write_text(json.dumps(PAPERS), encoding='utf-8')
+
+    store = ShardedStore(str(tmp_path / "papers"))
+    assert store.exists()
+    assert [p['id'] for p in store.load_all()] == [p['id'] for p in PAPERS]
+
+    manifest = json.loads((tmp_path / "papers" / "manifest.json").read_text(encoding='utf-8'))
+    assert list(manifest['shards']) == ['2025-02', '2025-01']
+    assert manifest['total'] == len(PAPERS)
+    assert manifest['shards']['2025-02']['count'] == 2
+    assert manifest['shards']['2025-01']['count'] == 3
+    # 迁移只读取旧文件，不修改它
+    assert json.loads(legacy.read_text(encoding='utf-8')) == PAPERS
+
+
+def test_manifest_hash_matches_shard_contents(tmp_path):
+    store = ShardedStore(str(tmp_path / "papers"))
+    store.save_all(PAPERS)
+
+    manifest = json.loads(store.manifest_path.read_text(encoding='utf-8'))
+    for key, entry in manifest['shards'].items():
+        assert entry['sha256'] == shard_sha256(tmp_path / "papers" / f"{key}.jsonl")
+
+
+def test_save_all_skips_unchanged_shards(tmp_path):
+    store = ShardedStore(str(tmp_path / "papers"))
+    assert store.save_all(PAPERS) == 2
+    assert ShardedStore(str(tmp_path / "papers")).save_all(PAPERS) == 0
+
+
+def test_merge_deduplicates_and_rewrites_only_touched_shards(tmp_path):
+    root = tmp_path / "papers"
+    ShardedStore(str(root)).save_all(PAPERS[2:])
+    january = (root / "2025-01.jsonl").stat().st_mtime_ns
+
+    incoming = [make_paper('2502.00009', '2025-02-10'), PAPERS[0], PAPERS[2]]
+    new_papers, total = ShardedStore(str(root)).merge(incoming + [PAPERS[0]])
+
+    assert [p['id'] for p in new_papers] == ['2502.00009', '2502.00002']
+    assert total == len(PAPERS[2:]) + 2
+    assert (root / "2025-01.jsonl").stat().st_mtime_ns == january
+    ids = [p['id'] for p in ShardedStore(str(root)).load_all()]
+    assert ids == ['2502.00009', '2502.00002'] + [p['id'] for p in PAPERS[2:]]
+
+
+def test_merge_keeps_existing_record_unchanged(tmp_path):
+    store = ShardedStore(str(tmp_path / "papers"))
+    store.save_all(PAPERS)
+    store.merge([dict(PAPERS[1], title="Changed")])
+    assert ShardedStore(str(tmp_path / "papers")).load_all()[1]['title'] == PAPERS[1]['title']
+
+
+def test_v1_json_array_shards_are_converted_to_json_lines(tmp_path):
+    root = tmp_path / "papers"
+    root.mkdir()
+    january = [p for p in PAPERS if p['published'].startswith('2025-01')]
+    february = [p for p in PAPERS if p['published'].startswith('2025-02')]
+    (root / "2025-01.json").write_text(json.dumps(january, indent=2), encoding='utf-8')
+    (root / "2025-02.json").write_text(json.dumps(february, indent=2), encoding='utf-8')
+    (root / "manifest.json").write_text(json.dumps({
+        'version': 1, 'total': len(PAPERS),
+        'shards': {'2025-02': {'count': 2, 'sha256': 'old'}, '2025-01': {'count': 3, 'sha256': 'old'}},
+    }), encoding='utf-8')
+
+    store = ShardedStore(str(root))
+    assert [p['id'] for p in store.iter_papers()] == [p['id'] for p in PAPERS]
+
+    assert sorted(path.name for path in root.iterdir()) == ['2025-01.jsonl', '2025-02.jsonl', 'manifest.json']
+    manifest = json.loads((root / "manifest.json").read_text(encoding='utf-8'))
+    assert manifest['version'] == 2
+    assert manifest['total'] == len(PAPERS)
+    for key, entry in manifest['shards'].items():
+        assert entry['sha256'] == shard_sha256(root / f"{key}.jsonl")
+    # 迁移只执行一次
+    assert not ShardedStore(str(root)).migrate()
+
+
+def test_jsonl_store_merge_streams_new_papers_first(tmp_path):
+    path = tmp_path / "papers.jsonl"
+    store = open_store(str(path))
+    store.save_all(PAPERS[1:])
+    new_papers, total = store.merge([PAPERS[0], PAPERS[1]])
+    assert [p['id'] for p in new_papers] == [PAPERS[0]['id']]
+    assert total == len(PAPERS)
+    assert [p['id'] for p in open_store(str(path)).iter_papers()] == [p['id'] for p in PAPERS]
+
+
+def test_jsonl_store_merge_keeps_the_save_all_order(tmp_path):
+    merged = open_store(str(tmp_path / "merged.jsonl"))
+    merged.save_all([PAPERS[0], PAPERS[2], PAPERS[4]])
+    # 新论文中有比已有论文更早发表的（例如延迟出现在 API 中的论文），也有与已有论文同一天的
+    late = [PAPERS[3], PAPERS[1], make_paper('2501.00004', '2025-01-01')]
+    merged.merge(late)
+
+    rewritten = open_store(str(tmp_path / "rewritten.jsonl"))
+    rewritten.save_all(late + [PAPERS[0], PAPERS[2], PAPERS[4]])
+    assert (tmp_path / "merged.jsonl").read_bytes() == (tmp_path / "rewritten.jsonl").read_bytes()
+    assert [p['published'] for p in merged.iter_papers()] == sorted(
+        (p['published'] for p in merged.iter_papers()), reverse=True)
@@ -0,0 +1,32 @@
+"""update_venue 在各种存储上逐组回填会议信息"""
+
+import pytest
+import yaml
+
+from scripts import update_venue
+from scripts.storage import open_store
+
+PAPERS = [
+    {'id': '2502.00002', 'title': 'A', 'abstract': '', 'published': '2025-02-03', 'comment': 'Accepted to CVPR 2025'},
+    {'id': '2502.00001', 'title': 'B', 'abstract': '', 'published': '2025-02-01', 'comment': '10 pages'},
+    {'id': '2501.00001', 'title': 'C', 'abstract': '', 'published': '2025-01-05', 'comment': 'ICML 2024 oral'},
+]
+
+
+@pytest.fixture(autouse=True)
+def minimal_config(monkeypatch, make_config):
+    """使用最小配置（不启用富化缓存），不依赖当前目录和仓库中的 config.yaml"""
+    with open(make_config(), 'r', encoding='utf-8') as f:
+        monkeypatch.setattr(update_venue, '_config', yaml.safe_load(f))
+    monkeypatch.setattr(update_venue, '_venue_matcher', None)
+
+
+@pytest.mark.parametrize("name", ["papers.json", "papers.jsonl", "papers", "papers.sqlite"])
+def test_backfills_every_store_format(tmp_path, name):
+    path = str(tmp_path / name)
+    open_store(path).save_all([dict(p) for p in PAPERS])
+
+    update_venue.update_papers_with_venue(data_path=path, workers=1)
+
+    venues = {p['id']: p.get('conference') for p in open_store(path).iter_papers()}
+    assert venues == {'2502.00002': 'CVPR 2025', '2502.00001': None, '2501.00001': 'ICML 2024'}
@@ -0,0 +1,92 @@
+"""VenueMatcher 与原来逐个名称依次匹配的实现结果一致"""
+
+import re
+from datetime import datetime, timezone
+
+import pytest
+
+from scripts.synthetic import SyntheticCorpus
+from scripts.venues import DEFAULT_CONFERENCES, DEFAULT_JOURNALS, VenueMatcher
+
+
+def reference_match(comment, conferences=DEFAULT_CONFERENCES, journals=DEFAULT_JOURNALS):
+    """原 PaperFetcher.extract_venue_from_comment 的实现"""
+    if not comment:
+        return None
+    comment = comment.strip()
+    if 'preprint' in comment.lower():
+        return None
+    for conf in conferences:
+        match = re.search(rf'\b{conf}\s*[:\']?\s*(\d{{4}})\b', comment, re.IGNORECASE)
+        if match:
+            return f"{conf} {match.group(1)}"
+        if re.search(rf'\b{conf}\b', comment, re.IGNORECASE):
+            return conf
+    for journal in journals:
+        if re.search(rf'\b{journal}\b', comment, re.IGNORECASE):
+            return comment[:50] if len(comment) > 50 else comment
+    return None
+
+
+COMMENTS = [
+    None,
+    "",
+    "   ",
+    "Accepted to CVPR 2025",
+    "accepted at cvpr'2024, code released",
+    "CVPR: 2023",
+    "Camera-ready version for ICCV",
+    "Accepted by ECCV 2024 and NeurIPS 2024",
+    "NeurIPS 2024 workshop; extended version submitted to ICML",
+    "ICML 2025 (spotlight). Also presented at ICLR workshop",
+    "Under review at ICLR 2026",
+    "ACL 2024 Findings",
+    "EMNLP2024",
+    "Accepted to NAACL 2025 main conference",
+    "Published in IEEE Transactions on Pattern Analysis and Machine Intelligence (TPAMI), vol. 47",
+    "Nature Machine Intelligence",
+    "Journal of Machine Learning Research 25",
+    "12 pages, 5 figures, preprint",
+    "Preprint. Accepted to CVPR 2025",
+    "ACMMM 2024",
+    "Submitted to ACM Computing Surveys",
+    "RSS 2025; also see CoRL 2024",
+    "IROS 2024 and ICRA 2025",
+    "SIGGRAPH Asia 2024",
+    "Accepted at WWW '25",
+    "INTERSPEECH 2024, ICASSP 2025",
+    "KDD 2025 Research Track",
+    "15 pages, 7 figures",
+    "CVPRW 2024",
+    "Our code is at https://github.com/x/icml-2024",
+]
+
+
+@pytest.mark.parametrize("comment", COMMENTS)
+def test_matches_reference_on_handwritten_comments(comment):
+    assert VenueMatcher(DEFAULT_CONFERENCES, DEFAULT_JOURNALS).match(comment) == reference_match(comment)
+
+
+def test_matches_reference_on_synthetic_corpus():
+    matcher = VenueMatcher(DEFAULT_CONFERENCES, DEFAULT_JOURNALS)
+    corpus = SyntheticCorpus(2000, now=datetime(2025, 6, 1, tzinfo=timezone.utc))
+    for paper in corpus.papers():
+        assert matcher.match(paper['comment']) == reference_match(paper['comment']), paper['comment']
+
+
+def test_priority_follows_configured_order():
+    assert VenueMatcher(['ICML', 'NeurIPS'], []).match("NeurIPS 2024; ICML 2025") == "ICML 2025"
+    assert VenueMatcher(['NeurIPS', 'ICML'], []).match("NeurIPS 2024; ICML 2025") == "NeurIPS 2024"
+
+
+def test_custom_lists_match_reference():
+    conferences, journals = ['CoLM', 'MLSys', 'ML'], ['Proceedings']
+    matcher = VenueMatcher(conferences, journals)
+    for comment in ["CoLM 2024", "MLSys'24", "ML 2023 and MLSys 2024", "Proceedings of the VLDB Endowment"]:
+        assert matcher.match(comment) == reference_match(comment, conferences, journals)
+
+
+def test_from_config_falls_back_to_defaults():
+    matcher = VenueMatcher.from_config({})
+    assert matcher.conferences == DEFAULT_CONFERENCES
+    assert matcher.journals == DEFAULT_JOURNALS